@@ -1,4 +1,8 @@
-from flask import Flask, render_template
+import json
+from collections import deque
+from functools import lru_cache
+from threading import Lock
+from flask import Flask, Response, jsonify, render_template, request
 from game_logic.game_engine import GameEngine
 from game_phases.deployment import get_deployment_zones, formation_offsets
 import math
@@ -22,67 +26,241 @@ def _circle_offsets(num, orientation, base_width=1.0, base_height=1.0):
 app = Flask(__name__)
 
 
-def build_display_grid(game_state, board):
-    """Return a mapping of board coordinates to color/label for display."""
-    grid_data = game_state.to_grid_dict()
-    display_grid = {}
-    defender_zone, attacker_zone = get_deployment_zones(board, game_state.map_layout or "straight")
-
-    for y in range(board.height):
-        for x in range(board.width):
-            tile = grid_data[(x, y)]
-            color = "white"
-            label = ""
-
-            if defender_zone(x, y):
-                color = "#d0e6ff"
-            if attacker_zone(x, y):
-                color = "#ffd0d0"
-            for obj in board.objectives:
-                if math.hypot(x - obj.x, y - obj.y) <= 6:
-                    if obj.control_team == 1:
-                        color = "#a0c4ff"
-                        label = "O"
-                    elif obj.control_team == 2:
-                        color = "#ffb3b3"
-                        label = "O"
-                    else:
-                        color = "#d9d9d9"
-                        label = "O"
-            if tile["terrain"]:
-                color = "black"
-                label = "T"
-            if tile["leader1"]:
-                color = "#0044cc"
-                label = "L" if tile["center"] else "l"
-            elif tile["team1"]:
-                color = "#3399ff"
-                label = "U" if tile["center"] else "u"
-            elif tile["leader2"]:
-                color = "#cc0000"
-                label = "L" if tile["center"] else "l"
-            elif tile["team2"]:
-                color = "#ff6666"
-                label = "U" if tile["center"] else "u"
-
-            display_grid[(x, y)] = {"color": color, "label": label}
-
-    return display_grid
+@lru_cache(maxsize=None)
+def _zone_colors(defender_zone, attacker_zone):
+    """Background colour of every tile in the deployment zones."""
+    colors = dict.fromkeys(defender_zone.tiles, "#d0e6ff")
+    colors.update(dict.fromkeys(attacker_zone.tiles, "#ffd0d0"))
+    return colors
+
+
+def _base_cell(x, y, board, zone_colors):
+    """Colour and label from the deployment zones and objective circles."""
+    color = zone_colors.get((x, y), "white")
+    label = ""
+    for obj in board.objectives:
+        if math.hypot(x - obj.x, y - obj.y) <= 6:
+            if obj.control_team == 1:
+                color = "#a0c4ff"
+                label = "O"
+            elif obj.control_team == 2:
+                color = "#ffb3b3"
+                label = "O"
+            else:
+                color = "#d9d9d9"
+                label = "O"
+    return color, label
+
+
+def _unit_flags(board, tiles):
+    """Return display flags for model bases covering ``tiles``."""
+    unit_ids = {int(board.unit_plane[y, x]) for x, y in tiles} - {0}
+    flags = {}
+    for unit in board.units:
+        if board.unit_id(unit) not in unit_ids:
+            continue
+        for i, model in enumerate(unit.models):
+            center = model.get_central_square()
+            for sq in model.get_display_squares():
+                if sq not in tiles:
+                    continue
+                tile = flags.setdefault(sq, {"team1": 0, "team2": 0, "leader1": 0,
+                                             "leader2": 0, "center": 0})
+                team = 1 if unit.team == 1 else 2
+                tile[f"team{team}"] = 1
+                if i == 0:
+                    tile[f"leader{team}"] = 1
+                if sq == center:
+                    tile["center"] = 1
+    return flags
+
+
+def _display_cell(x, y, board, zone_colors, flags):
+    color, label = _base_cell(x, y, board, zone_colors)
+    if board.terrain_plane[y, x]:
+        color = "black"
+        label = "T"
+    tile = flags.get((x, y))
+    if tile:
+        if tile["leader1"]:
+            color = "#0044cc"
+            label = "L" if tile["center"] else "l"
+        elif tile["team1"]:
+            color = "#3399ff"
+            label = "U" if tile["center"] else "u"
+        elif tile["leader2"]:
+            color = "#cc0000"
+            label = "L" if tile["center"] else "l"
+        elif tile["team2"]:
+            color = "#ff6666"
+            label = "U" if tile["center"] else "u"
+    return {"color": color, "label": label}
+
+
+def build_display_grid(game_state, board, tiles=None):
+    """Return a mapping of board coordinates to color/label for display.
+
+    Only ``tiles`` are computed when given, otherwise the whole board.
+    """
+    if tiles is None:
+        tiles = {(x, y) for y in range(board.height) for x in range(board.width)}
+    zone_colors = _zone_colors(*get_deployment_zones(board, game_state.map_layout or "straight"))
+    flags = _unit_flags(board, tiles)
+    return {(x, y): _display_cell(x, y, board, zone_colors, flags) for x, y in tiles}
+
+
+class DisplayGridCache:
+    """Display grid cached against the board's occupancy version.
+
+    Only tiles the board reports as changed are recomputed. Every refresh
+    that changes something gets a new display version, so clients can ask
+    for the tiles changed since the version they last saw.
+    """
+
+    HISTORY = 256
+
+    def __init__(self):
+        self.lock = Lock()
+        self.grid = None
+        self.version = 0
+        self._board_version = None
+        self._key = None
+        # (display version, changed tiles or None for a full rebuild)
+        self._history = deque(maxlen=self.HISTORY)
+
+    @staticmethod
+    def _layout_key(game_state, board):
+        return (
+            game_state.map_layout,
+            tuple((id(o), o.x, o.y, o.control_team) for o in board.objectives),
+            board.width,
+            board.height,
+        )
+
+    def refresh(self, game_state, board):
+        """Bring the cached grid up to date and return it."""
+        with self.lock:
+            key = self._layout_key(game_state, board)
+            if self.grid is None or key != self._key:
+                changed = None
+            elif board.version == self._board_version:
+                return self.grid
+            else:
+                changed = board.changed_tiles(self._board_version)
+
+            if changed is None:
+                self.grid = build_display_grid(game_state, board)
+            elif changed:
+                self.grid.update(build_display_grid(game_state, board, changed))
+            self._key = key
+            self._board_version = board.version
+            if changed is None or changed:
+                self.version += 1
+                self._history.append((self.version, changed))
+            return self.grid
+
+    def diff(self, game_state, board, since):
+        """Return ``(version, tiles)`` changed after display version ``since``.
+
+        ``tiles`` is None when the client must reload the whole grid.
+        """
+        grid = self.refresh(game_state, board)
+        with self.lock:
+            if since >= self.version:
+                return self.version, {}
+            if not self._history or since < self._history[0][0] - 1:
+                return self.version, None
+            changed = set()
+            for version, tiles in self._history:
+                if version <= since:
+                    continue
+                if tiles is None:
+                    return self.version, None
+                changed |= tiles
+            return self.version, {tile: grid[tile] for tile in changed}
+
+
+display_cache = DisplayGridCache()
+_page_cache = {"key": None, "html": None}
 
 
 @app.route("/")
 def show_board():
     """Render the board in its current state."""
-    grid = build_display_grid(engine.game_state, engine.board)
-    return render_template(
-        "grid.html",
-        grid=grid,
-        width=engine.board.width,
-        height=engine.board.height,
-        messages=engine.game_state.messages,
+    grid = display_cache.refresh(engine.game_state, engine.board)
+    messages = engine.game_state.messages
+    key = (display_cache.version, len(messages))
+    if _page_cache["key"] != key:
+        _page_cache["html"] = render_template(
+            "grid.html",
+            grid=grid,
+            width=engine.board.width,
+            height=engine.board.height,
+            messages=messages,
+            version=display_cache.version,
+        )
+        _page_cache["key"] = key
+    return _page_cache["html"]
+
+
+@app.route("/board/diff")
+def board_diff():
+    """Return the tiles changed since the display version ``since``."""
+    since = request.args.get("since", default=-1, type=int)
+    version, tiles = display_cache.diff(engine.game_state, engine.board, since)
+    if tiles is None:
+        return jsonify(version=version, full=True, tiles=[])
+    return jsonify(
+        version=version,
+        full=False,
+        tiles=[[x, y, cell["color"], cell["label"]] for (x, y), cell in sorted(tiles.items())],
+    )
+
+
+@app.route("/units/<int:unit_id>/reach")
+def unit_reach(unit_id):
+    """Return the leader squares a unit can move to, and the path to
+    ``?x=&y=`` when given."""
+    unit = engine.board.unit_by_id(unit_id)
+    if unit is None:
+        return jsonify(error="unknown unit"), 404
+    reach = engine.board.reachable_tiles(unit)
+    x = request.args.get("x", type=int)
+    y = request.args.get("y", type=int)
+    path = reach.path_to(x, y) if x is not None and y is not None else None
+    return jsonify(
+        unit=unit.name,
+        origin=list(reach.origin),
+        move_range=reach.move_range,
+        tiles=[list(t) for t in reach.tiles()],
+        path=[list(t) for t in path] if path else None,
     )
 
 
+@app.route("/events")
+def event_stream():
+    """Push game events to the browser as server-sent events."""
+    subscription = engine.events.subscribe()
+
+    def _generate():
+        try:
+            yield "retry: 2000\n\n"
+            while True:
+                events = subscription.get(timeout=15)
+                if not events:
+                    yield ": keep-alive\n\n"
+                    continue
+                if subscription.dropped:
+                    yield f"event: dropped\ndata: {subscription.dropped}\n\n"
+                    subscription.dropped = 0
+                for event in events:
+                    yield f"id: {event.seq}\nevent: {event.kind}\ndata: {json.dumps(event.to_dict())}\n\n"
+        finally:
+            engine.events.unsubscribe(subscription)
+
+    return Response(_generate(), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 
 if __name__ == "__main__":
     app.run(debug=True)
@@ -0,0 +1,282 @@
+"""Benchmark the board, phase and full-game hot paths.
+
+Every benchmark runs on a fixed-seed scenario: the full Skaven and
+Stormcast forces lined up facing each other in the middle of the board.
+Results are printed as JSON so runs from two commits can be compared::
+
+    python benchmark.py --out before.json
+    python benchmark.py --compare before.json
+
+``--compare`` exits with status 1 when a benchmark got slower by more than
+``--threshold`` (50% by default; timings on shared machines vary by
+about that much between runs).
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from game_logic.dice import DiceEngine
+from game_logic.game_engine import GameEngine
+from game_logic.simulation import AIPolicy
+from game_logic.units import is_in_combat
+from game_logic.utils import center_model_on_square, center_unit_on_leader_square
+from game_phases.combat_phase import resolve_melee_attacks
+from game_phases.deployment import formation_offsets, get_objectives_for_battlefield, load_faction_force
+
+SEED = 1234
+FACTIONS = ("skaven", "stormcast")
+
+
+def _line_up(board, units, y, orientation):
+    """Place ``units`` left to right along row ``y`` in box formation."""
+    x = 4
+    for unit in units:
+        offsets = formation_offsets("box", len(unit.models), orientation, unit.base_width, unit.base_height)
+        while x < board.width:
+            for model, (dx, dy) in zip(unit.models, offsets):
+                center_model_on_square(model, x + dx, y + dy)
+            center_unit_on_leader_square(unit, x, y)
+            if board.place_unit(unit):
+                break
+            x += 1
+        x += 8
+
+
+def midboard_engine(seed=SEED):
+    """Return an engine with both forces deployed three squares apart
+    across the middle of the board, both sides driven by :class:`AIPolicy`."""
+    engine = GameEngine(headless=True, seed=seed, policies={"player": AIPolicy(), "ai": AIPolicy()})
+    board, state = engine.board, engine.game_state
+    board.objectives = get_objectives_for_battlefield("aqshy")
+    state.objectives = board.objectives
+    state.realm, state.map_layout = "aqshy", "straight"
+    state.units["player"] = load_faction_force(FACTIONS[0], team_number=1)
+    state.units["ai"] = load_faction_force(FACTIONS[1], team_number=2)
+    _line_up(board, state.units["player"], 20, 1)
+    _line_up(board, state.units["ai"], 23, -1)
+    state.current_priority = "player"
+    state.phase = "hero"
+    return engine
+
+
+def _timeit(fn, repeat, number, reset=None):
+    """Return per-call seconds for ``repeat`` runs of ``number`` calls,
+    after one untimed warm-up call.
+
+    ``reset`` runs untimed after every call.
+    """
+    fn()
+    if reset is not None:
+        reset()
+    samples = []
+    for _ in range(repeat):
+        if reset is None:
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            samples.append((time.perf_counter() - start) / number)
+            continue
+        elapsed = 0.0
+        for _ in range(number):
+            start = time.perf_counter()
+            fn()
+            elapsed += time.perf_counter() - start
+            reset()
+        samples.append(elapsed / number)
+    return samples
+
+
+# -- benchmarks -------------------------------------------------------------
+# Each returns (fn, number, reset) for a fresh mid-board engine.
+
+def bench_move_unit(engine):
+    board = engine.board
+    unit = engine.game_state.units["ai"][1]
+    home, away = (unit.x, unit.y), (unit.x, unit.y + 4)
+    spots = [away, home]
+
+    def fn():
+        board.move_unit(unit, *spots[0])
+        spots.reverse()
+    return fn, 200, None
+
+
+def bench_is_path_clear(engine):
+    board = engine.board
+    rng = np.random.default_rng(SEED)
+    pairs = rng.integers(0, [board.width, board.height, board.width, board.height], size=(500, 4)).tolist()
+
+    def fn():
+        for sx, sy, ex, ey in pairs:
+            board.is_path_clear(sx, sy, ex, ey)
+    return fn, 5, None
+
+
+def bench_is_in_combat(engine):
+    board = engine.board
+    models = [(m.x, m.y, u.team) for u in board.units for m in u.models]
+
+    def fn():
+        for x, y, team in models:
+            is_in_combat(x, y, board, team)
+    return fn, 20, None
+
+
+def bench_update_objective_control(engine):
+    board = engine.board
+
+    def fn():
+        board.dirty_objectives.update(range(len(board.objectives)))
+        board.update_objective_control()
+    return fn, 200, None
+
+
+def bench_to_grid_dict(engine):
+    return engine.game_state.to_grid_dict, 20, None
+
+
+def bench_to_tensor(engine):
+    state = engine.game_state
+    return state.to_tensor, 200, None
+
+
+def bench_resolve_melee_attacks(engine):
+    board = engine.board
+    attacker = engine.game_state.units["player"][0]
+    enemies = engine.game_state.units["ai"]
+    target = enemies[0]
+    dice = DiceEngine(SEED)
+    snap = board.snapshot()
+
+    def fn():
+        resolve_melee_attacks(attacker, enemies, None, target=target, dice=dice)
+    return fn, 50, lambda: board.restore(snap)
+
+
+def bench_headless_round(engine):
+    state = {"engine": engine}
+
+    def fn():
+        state["engine"].run_round(state["engine"].policies["player"].get_input)
+    return fn, 1, lambda: state.update(engine=midboard_engine())
+
+
+def bench_render_full(engine):
+    from app import build_display_grid
+
+    return lambda: build_display_grid(engine.game_state, engine.board), 5, None
+
+
+def bench_render_after_move(engine):
+    from app import DisplayGridCache
+
+    cache = DisplayGridCache()
+    cache.refresh(engine.game_state, engine.board)
+    move, _, _ = bench_move_unit(engine)
+
+    def fn():
+        move()
+        cache.refresh(engine.game_state, engine.board)
+    return fn, 50, None
+
+
+BENCHMARKS = {
+    "board.move_unit": bench_move_unit,
+    "board.is_path_clear": bench_is_path_clear,
+    "is_in_combat": bench_is_in_combat,
+    "board.update_objective_control": bench_update_objective_control,
+    "game_state.to_grid_dict": bench_to_grid_dict,
+    "game_state.to_tensor": bench_to_tensor,
+    "resolve_melee_attacks": bench_resolve_melee_attacks,
+    "headless_round": bench_headless_round,
+    "viewer.render_full": bench_render_full,
+    "viewer.render_after_move": bench_render_after_move,
+}
+
+
+def _commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def run_benchmarks(names=None, repeat=5):
+    """Run the benchmarks in ``names`` (all by default); return a JSON-ready dict.
+
+    Times are per call, in milliseconds.
+    """
+    results = {}
+    for name in names or BENCHMARKS:
+        try:
+            fn, number, reset = BENCHMARKS[name](midboard_engine())
+        except ImportError as e:  # the viewer needs Flask
+            results[name] = {"skipped": str(e)}
+            continue
+        samples = [s * 1000 for s in _timeit(fn, repeat, number, reset)]
+        results[name] = {
+            "mean_ms": statistics.fmean(samples),
+            "min_ms": min(samples),
+            "stdev_ms": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+            "calls": number,
+            "repeat": repeat,
+        }
+    return {
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "seed": SEED,
+        "benchmarks": results,
+    }
+
+
+def compare(current, baseline, threshold=1.5):
+    """Return ``[(name, ratio)]`` for benchmarks slower than ``threshold``
+    times their ``baseline`` minimum."""
+    slower = []
+    for name, result in current["benchmarks"].items():
+        before = baseline["benchmarks"].get(name, {})
+        if "min_ms" in result and before.get("min_ms"):
+            ratio = result["min_ms"] / before["min_ms"]
+            if ratio > threshold:
+                slower.append((name, ratio))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("names", nargs="*", help="benchmarks to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", help="also write the results to this file")
+    parser.add_argument("--compare", help="results file from an earlier run")
+    parser.add_argument("--threshold", type=float, default=1.5)
+    args = parser.parse_args(argv)
+
+    unknown = set(args.names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+    results = run_benchmarks(args.names, args.repeat)
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w") as fh:
+            fh.write(text + "\n")
+    if args.compare:
+        with open(args.compare) as fh:
+            slower = compare(results, json.load(fh), args.threshold)
+        for name, ratio in slower:
+            print(f"{name}: {ratio:.2f}x slower", file=sys.stderr)
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
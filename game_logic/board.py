@@ -1,7 +1,18 @@
-import random
 import math
+from collections import deque
+import numpy as np
 from game_logic.units import Unit, Model
-from game_logic.objective import Objective
+from game_logic.objective import Objective, CONTROL_RANGE
+from game_logic.spatial_index import ModelIndex
+from game_logic.line_of_sight import LineOfSightCache
+from game_logic.footprints import FreeAnchorCache, footprint_size
+from game_logic.engagement import EngagementCache
+from game_logic.distance_fields import TerrainDistanceCache
+from game_logic.gamelog import INFO, WARNING
+from game_logic.reachability import ReachabilityCache
+from game_logic.rng import RandomStreams
+from game_logic.mcts import MCTSPlanner
+from game_logic.snapshot import take_snapshot, apply_snapshot
 
 BOARD_WIDTH = 60
 BOARD_HEIGHT = 44
@@ -13,92 +24,500 @@ TILE_OBJECTIVE = "O"
 TILE_PLAYER_1 = "1"
 TILE_PLAYER_2 = "2"
 
+# Number of occupancy changes remembered for ``Board.changed_tiles``.
+CHANGE_JOURNAL_SIZE = 4096
+
+
+class _GridRow:
+    """Single read-only row of :class:`GridView`."""
+
+    def __init__(self, board, y):
+        self._board = board
+        self._y = y
+
+    def __getitem__(self, x):
+        return self._board.tile_at(x, self._y)
+
+    def __len__(self):
+        return self._board.width
+
+    def __iter__(self):
+        for x in range(self._board.width):
+            yield self._board.tile_at(x, self._y)
+
+
+class GridView:
+    """Read-only ``grid[y][x]`` character view over the occupancy planes.
+
+    Kept for callers written against the old list-of-lists grid. Writes must
+    go through the :class:`Board` methods so every plane stays in sync.
+    """
+
+    def __init__(self, board):
+        self._board = board
+
+    def __getitem__(self, y):
+        return _GridRow(self._board, y)
+
+    def __len__(self):
+        return self._board.height
+
+    def __iter__(self):
+        for y in range(self._board.height):
+            yield _GridRow(self._board, y)
+
+
 class Board:
     def __init__(self, width=60, height=44):
         self.width = width
         self.height = height
-        self.grid = [[TILE_EMPTY for _ in range(self.width)] for _ in range(self.height)]
+
+        # Occupancy is stored as separate planes indexed ``[y, x]``.
+        # ``unit_plane`` holds the board id of the unit on each tile (0 = none)
+        # and ``team_plane`` the owning team of that unit.
+        self.terrain_plane = np.zeros((height, width), dtype=bool)
+        self.objective_plane = np.zeros((height, width), dtype=bool)
+        self.team_plane = np.zeros((height, width), dtype=np.uint8)
+        self.unit_plane = np.zeros((height, width), dtype=np.int32)
+        self.grid = GridView(self)
+        # Bumped on every occupancy change so caches can key on it.
+        self.version = 0
+
         self.units = []
-        self.objectives = []
         self.terrain = []
+        self.objectives = []
+        self._unit_ids = {}
+        self._units_by_id = {}
+        self._journal = deque(maxlen=CHANGE_JOURNAL_SIZE)
+        self._journal_floor = 0
+        self.model_index = ModelIndex()
+        self.dirty_objectives = set()
+        # Optional ``EventStream`` notified of moves, deaths and control changes.
+        self.events = None
+        # Optional ``GameLog`` receiving the board's messages.
+        self.log = None
+        # Random streams for the phases; a ``GameEngine`` shares its own.
+        self.rng = RandomStreams()
+        # Planner of the built-in AI phases; a ``GameEngine`` installs its own.
+        self.planner = MCTSPlanner(time_budget=0.2)
+        self.line_of_sight = LineOfSightCache(self)
+        self.reachability = ReachabilityCache(self)
+        self.anchors = FreeAnchorCache(self)
+        self.engagement = EngagementCache(self)
+        self.terrain_distance = TerrainDistanceCache(self)
+        # Inverse operations recorded since ``checkpoint`` (None = off).
+        self._undo = None
+
+    def __getstate__(self):
+        # Spectator streams and log sinks stay with the original board.
+        state = self.__dict__.copy()
+        state["events"] = None
+        state["log"] = None
+        return state
+
+    def __setstate__(self, state):
+        # Unit ids and the model index are keyed on object identity.
+        self.__dict__.update(state)
+        self._unit_ids = {id(unit): uid for uid, unit in self._units_by_id.items()}
+        self.rebuild_model_index()
+
+    def rebuild_model_index(self):
+        """Re-index every model in unit order.
+
+        Query ties are broken by insertion order, so a rebuilt index answers
+        the same way however the models got to their squares.
+        """
+        self.model_index.clear()
+        for unit in self.units:
+            for model in unit.models:
+                self.model_index.add(unit, model)
+
+    @property
+    def objectives(self):
+        return self._objectives
+
+    @objectives.setter
+    def objectives(self, objectives):
+        self._objectives = objectives
+        self._objective_reach = None
+
+    def _track_objectives(self):
+        """Rebuild the objective reach masks and control tallies if the
+        objective list changed since they were last built."""
+        if (self._objective_reach is not None
+                and self._tracked_objectives == [id(o) for o in self._objectives]):
+            return
+        ys, xs = np.mgrid[0:self.height, 0:self.width]
+        self._objective_reach = np.array(
+            [np.hypot(xs - o.x, ys - o.y) <= CONTROL_RANGE for o in self._objectives],
+            dtype=bool,
+        ).reshape(len(self._objectives), self.height, self.width)
+        self._tracked_objectives = [id(o) for o in self._objectives]
+        for obj in self._objectives:
+            obj.control_scores = {1: 0, 2: 0}
+        for unit in self.units:
+            for model in unit.models:
+                self._tally_model(unit, model.x, model.y, 1)
+        self.dirty_objectives = set(range(len(self._objectives)))
+
+    def _tally_model(self, unit, x, y, sign):
+        """Add (``sign`` = 1) or remove (-1) a model's control contribution."""
+        reach = self._objective_reach
+        if reach is None or not (0 <= x < self.width and 0 <= y < self.height):
+            return
+        if len(reach) != len(self._objectives):
+            self._objective_reach = None
+            return
+        for i in np.flatnonzero(reach[:, y, x]).tolist():
+            scores = self._objectives[i].control_scores
+            scores[unit.team] = scores.get(unit.team, 0) + sign * unit.control_score
+            self.dirty_objectives.add(i)
+
+    def _emit(self, kind, **data):
+        if self.events is not None:
+            self.events.publish(kind, **data)
+
+    def _say(self, kind, template, level=INFO, **fields):
+        if self.log is not None:
+            self.log.emit(kind, template, level, **fields)
+
+    def _model_added(self, unit, model):
+        self.model_index.add(unit, model)
+        self._tally_model(unit, model.x, model.y, 1)
+
+    def _model_moved(self, unit, model, old_x, old_y):
+        self.model_index.move(model)
+        x, y = model.x, model.y
+        if (old_x, old_y) != (x, y):
+            self._tally_model(unit, old_x, old_y, -1)
+            self._tally_model(unit, x, y, 1)
+
+    def _model_removed(self, unit, model):
+        self.model_index.remove(model)
+        self._tally_model(unit, model.x, model.y, -1)
+
+    def tile_at(self, x, y):
+        """Return the legacy tile character for ``(x, y)``."""
+        if self.unit_plane[y, x]:
+            return TILE_UNIT
+        if self.terrain_plane[y, x]:
+            return TILE_TERRAIN
+        if self.objective_plane[y, x]:
+            return TILE_OBJECTIVE
+        return TILE_EMPTY
+
+    def unit_id(self, unit: Unit) -> int:
+        """Return the board id used for ``unit`` in ``unit_plane``."""
+        uid = self._unit_ids.get(id(unit))
+        if uid is None:
+            uid = len(self._unit_ids) + 1
+            self._unit_ids[id(unit)] = uid
+            self._units_by_id[uid] = unit
+        return uid
+
+    def unit_by_id(self, uid):
+        """Return the unit stored as ``uid`` in ``unit_plane``."""
+        return self._units_by_id.get(int(uid))
+
+    def _record_change(self, x, y, w=1, h=1):
+        """Journal a changed block for the version about to be published."""
+        if len(self._journal) == self._journal.maxlen:
+            self._journal_floor = self._journal[0][0]
+        self._journal.append((self.version + 1, x, y, w, h))
+
+    def changed_tiles(self, since_version):
+        """Return the set of tiles changed after ``since_version``.
+
+        Returns None when the journal no longer reaches back that far and
+        callers must treat the whole board as changed.
+        """
+        if since_version < self._journal_floor:
+            return None
+        tiles = set()
+        for version, x, y, w, h in reversed(self._journal):
+            if version <= since_version:
+                break
+            for ty in range(max(y, 0), min(y + h, self.height)):
+                for tx in range(max(x, 0), min(x + w, self.width)):
+                    tiles.add((tx, ty))
+        return tiles
+
+    def in_bounds(self, x, y, w=1, h=1) -> bool:
+        return 0 <= x and 0 <= y and x + w <= self.width and y + h <= self.height
+
+    def is_area_free(self, x, y, w=1, h=1, ignore_unit: Unit | None = None) -> bool:
+        """Return True if the ``w`` x ``h`` block at ``(x, y)`` is on the board
+        and holds no terrain, objective or unit.
+
+        Tiles held by ``ignore_unit`` count as free.
+        """
+        if not self.in_bounds(x, y, w, h):
+            return False
+        area = (slice(y, y + h), slice(x, x + w))
+        if self.terrain_plane[area].any() or self.objective_plane[area].any():
+            return False
+        units = self.unit_plane[area]
+        if ignore_unit is None:
+            return not units.any()
+        uid = self._unit_ids.get(id(ignore_unit), 0)
+        return not ((units != 0) & (units != uid)).any()
+
+    def base_fits(self, model: Model, x, y, ignore_unit: Unit | None = None) -> bool:
+        """Return True if ``model``'s base fits with its anchor on ``(x, y)``.
+
+        Same as ``is_area_free`` over the base, read from the cached
+        free-anchor mask for its size.
+        """
+        w, h = footprint_size(model.base_width, model.base_height)
+        return self.anchors.fits(x, y, w, h, ignore_unit)
+
+    def model_fits(self, model: Model, x, y) -> bool:
+        """Return True if ``model``'s base fits with its anchor on ``(x, y)``.
+
+        Like ``base_fits``, but only the squares ``model`` stands on now
+        count as free, not those of the rest of its unit.
+        """
+        w, h = footprint_size(model.base_width, model.base_height)
+        if not self.in_bounds(x, y, w, h):
+            return False
+        area = (slice(y, y + h), slice(x, x + w))
+        if self.terrain_plane[area].any() or self.objective_plane[area].any():
+            return False
+        ys, xs = np.mgrid[y:y + h, x:x + w]
+        own = (xs >= model.x) & (xs < model.x + w) & (ys >= model.y) & (ys < model.y + h)
+        return not ((self.unit_plane[area] != 0) & ~own).any()
+
+    def planes(self):
+        """Return the occupancy planes that make up the board state."""
+        return self.terrain_plane, self.objective_plane, self.team_plane, self.unit_plane
+
+    def snapshot(self):
+        """Capture the board, unit and objective state for :meth:`restore`."""
+        return take_snapshot(self)
+
+    def restore(self, snap):
+        """Rewind to ``snap``. Recorded undo steps are discarded."""
+        apply_snapshot(self, snap)
+        if self._undo is not None:
+            self._undo.clear()
+        self.version += 1
+        self._journal.clear()
+        self._journal_floor = self.version
+
+    def checkpoint(self):
+        """Start recording undo steps and return a marker for :meth:`undo`."""
+        if self._undo is None:
+            self._undo = []
+        return len(self._undo)
+
+    def undo(self, marker=0):
+        """Revert moves, damage, removals and control changes made since
+        ``marker``."""
+        undo = self._undo or []
+        # Models of one unit may overlap their own earlier squares, so
+        # footprints are cleared as steps are reverted and the affected
+        # units stamped again once at the end.
+        restamp = {}
+        while len(undo) > marker:
+            kind, *args = undo.pop()
+            if kind == "move":
+                unit, model, x, y, unit_x, unit_y = args
+                old_x, old_y = model.x, model.y
+                self._clear_model(old_x, old_y, model)
+                model.x, model.y = x, y
+                self._model_moved(unit, model, old_x, old_y)
+                unit.x, unit.y = unit_x, unit_y
+                restamp[id(unit)] = unit
+            elif kind == "remove":
+                unit, model, index = args
+                unit.models.insert(index, model)
+                self._model_added(unit, model)
+                restamp[id(unit)] = unit
+            elif kind == "health":
+                model, health = args
+                model.current_health = health
+            elif kind == "control":
+                obj, team = args
+                obj.control_team = team
+        for unit in restamp.values():
+            for model in unit.models:
+                self._stamp_model(unit, model.x, model.y, model)
+        self.version += 1
+
+    def load_positions(self, placements):
+        """Set surviving models, positions and health of several units at
+        once, as when resuming a saved game.
+
+        ``placements`` holds ``(unit, models, unit_x, unit_y)`` where
+        ``models`` lists ``(model, x, y, health)`` for each surviving model.
+        No undo steps or events are recorded.
+        """
+        for unit, _, _, _ in placements:
+            for model in unit.models:
+                self._clear_model(model.x, model.y, model)
+                self._model_removed(unit, model)
+        for unit, models, unit_x, unit_y in placements:
+            unit.models[:] = [model for model, _, _, _ in models]
+            unit.x, unit.y = unit_x, unit_y
+            for model, x, y, health in models:
+                model.x, model.y, model.current_health = x, y, health
+                self._stamp_model(unit, x, y, model)
+                self._model_added(unit, model)
+        self.version += 1
+
+    def stop_recording(self):
+        """Stop recording undo steps and drop the ones recorded."""
+        self._undo = None
+
+    def _record_undo(self, *entry):
+        if self._undo is not None:
+            self._undo.append(entry)
+
+    def blocking_plane(self):
+        """Boolean plane of tiles that block movement and line of sight."""
+        return self.terrain_plane | (self.unit_plane != 0)
+
+    def _stamp_model(self, unit: Unit, x, y, model: Model):
+        w, h = footprint_size(model.base_width, model.base_height)
+        area = (slice(max(y, 0), max(y + h, 0)), slice(max(x, 0), max(x + w, 0)))
+        self.unit_plane[area] = self.unit_id(unit)
+        self.team_plane[area] = unit.team
+        self._record_change(x, y, w, h)
+
+    def _clear_model(self, x, y, model: Model):
+        w, h = footprint_size(model.base_width, model.base_height)
+        area = (slice(max(y, 0), max(y + h, 0)), slice(max(x, 0), max(x + w, 0)))
+        self.unit_plane[area] = 0
+        self.team_plane[area] = 0
+        self._record_change(x, y, w, h)
 
     def bases_touching(self, model_a: Model, model_b: Model) -> bool:
-        """Return True if the two models are in base-to-base contact."""
-        for ax, ay in model_a.get_occupied_squares():
-            for bx, by in model_b.get_occupied_squares():
-                if max(abs(ax - bx), abs(ay - by)) == 1 and (ax != bx or ay != by):
-                    return True
-        return False
+        """Return True if the two models are in base-to-base contact.
+
+        Bases touch when some square of one is (diagonally) adjacent to a
+        square of the other, i.e. no empty row or column separates them.
+        """
+        aw, ah = footprint_size(model_a.base_width, model_a.base_height)
+        bw, bh = footprint_size(model_b.base_width, model_b.base_height)
+        # empty columns/rows between the footprints (negative = overlap)
+        gap_x = max(model_b.x - (model_a.x + aw), model_a.x - (model_b.x + bw))
+        gap_y = max(model_b.y - (model_a.y + ah), model_a.y - (model_b.y + bh))
+        if max(gap_x, gap_y) > 0:
+            return False
+        # two single squares on the same tile have no adjacent pair
+        return aw * ah > 1 or bw * bh > 1 or model_a.position() != model_b.position()
 
     def units_base_to_base(self, unit_a: Unit, unit_b: Unit) -> bool:
         """Return True if any models from the two units are in base contact."""
+        uid_a, uid_b = self._unit_ids.get(id(unit_a)), self._unit_ids.get(id(unit_b))
+        if unit_a.team != unit_b.team and uid_a in self._units_by_id and uid_b in self._units_by_id:
+            return (min(uid_a, uid_b), max(uid_a, uid_b)) in self.engagement.contacts()
         for m_a in unit_a.models:
             for m_b in unit_b.models:
                 if self.bases_touching(m_a, m_b):
                     return True
         return False
 
+    def engaged_pairs(self):
+        """Return ``(unit_a, unit_b)`` for every pair of enemy units in base
+        contact, found in one pass over ``unit_plane``."""
+        return [(self._units_by_id[a], self._units_by_id[b])
+                for a, b in sorted(self.engagement.contacts())]
+
+    def engaged_with(self, unit: Unit):
+        """Return the enemy units in base contact with ``unit``."""
+        uid = self._unit_ids.get(id(unit))
+        if uid is None:
+            return []
+        return [self._units_by_id[other] for other in sorted(self.engagement.partners(uid))]
+
+    def units_in_combat(self, units, radius=6):
+        """Return the members of ``units`` with a model within ``radius``
+        tiles of an enemy model, as ``is_in_combat`` checks per model."""
+        engaged = self.engagement.in_combat(radius)
+        return [unit for unit in units if id(unit) in engaged]
+
+    def in_base_contact(self, unit: Unit, dx=0, dy=0) -> bool:
+        """Return True if any model of ``unit`` touches an enemy base.
+
+        Equivalent to ``units_base_to_base`` against every enemy unit, but
+        reads the squares around each base from ``team_plane``. ``dx`` and
+        ``dy`` check the unit as if shifted by that offset.
+        """
+        for m in unit.models:
+            w, h = footprint_size(m.base_width, m.base_height)
+            x, y = m.x + dx, m.y + dy
+            ring = self.team_plane[max(y - 1, 0):max(y + h + 1, 0), max(x - 1, 0):max(x + w + 1, 0)]
+            if ((ring != 0) & (ring != unit.team)).any():
+                return True
+        return False
+
     def models_overlap(self) -> bool:
         """Check if any models on the board occupy the same square."""
-        occupied = set()
+        # one slot of padding on each side keeps off-board bases countable
+        counts = np.zeros((self.height + 2, self.width + 2), dtype=np.int32)
         for unit in self.units:
             for model in unit.models:
-                for sq in model.get_occupied_squares():
-                    if sq in occupied:
-                        return True
-                    occupied.add(sq)
-        return False
+                w, h = footprint_size(model.base_width, model.base_height)
+                x = min(max(model.x, -1), self.width) + 1
+                y = min(max(model.y, -1), self.height) + 1
+                counts[y:y + h, x:x + w] += 1
+        return bool((counts > 1).any())
 
     def place_objective(self, x, y):
         obj = Objective(x, y)
         self.objectives.append(obj)
-        self.grid[y][x] = TILE_OBJECTIVE
+        self.objective_plane[y, x] = True
+        self._record_change(x, y)
+        self.version += 1
 
     def is_valid_terrain_location(self, tiles):
+        terrain = self.terrain_distance.terrain()
+        objectives = self.terrain_distance.objectives()
         for x, y in tiles:
             if not (6 <= x < self.width - 6 and 6 <= y < self.height - 6):
                 return False
-            for ox, oy in self.terrain:
-                if math.hypot(x - ox, y - oy) < 6:
-                    return False
-            for obj in self.objectives:
-                if math.hypot(x - obj.x, y - obj.y) < 12:
-                    return False
+            if terrain[y, x] < 6 * 6 or objectives[y, x] < 12 * 12:
+                return False
         return True
 
     def place_terrain_piece(self, x, y, rotated_shape):
         placed_tiles = [(x + dx, y + dy) for dx, dy in rotated_shape]
         for px, py in placed_tiles:
-            if not (0 <= px < self.width and 0 <= py < self.height):
-                return False
-            if self.grid[py][px] != "-":
+            if not self.is_area_free(px, py):
                 return False
         for px, py in placed_tiles:
             self.terrain.append((px, py))
-            self.grid[py][px] = "T"
+            self.terrain_plane[py, px] = True
+            self._record_change(px, py)
+        self.version += 1
         return True
 
     def place_unit(self, unit: Unit):
         """Place a unit on the board ensuring all models fit within bounds."""
 
         # Validate that all model squares are on the board and unoccupied
-        pending = []
         for model in unit.models:
-            for x, y in model.get_occupied_squares():
-                if not (0 <= x < self.width and 0 <= y < self.height):
-                    print("Placement out of bounds!")
-                    return False
-                if self.grid[y][x] != TILE_EMPTY:
-                    print("Placement occupied!")
-                    return False
-                pending.append((x, y))
+            w, h = footprint_size(model.base_width, model.base_height)
+            if not self.in_bounds(model.x, model.y, w, h):
+                self._say("placement_invalid", "Placement out of bounds!", WARNING)
+                return False
+            if not self.base_fits(model, model.x, model.y):
+                self._say("placement_invalid", "Placement occupied!", WARNING)
+                return False
 
         # All squares valid, perform placement
-        for x, y in pending:
-            self.grid[y][x] = TILE_UNIT
+        for model in unit.models:
+            self._stamp_model(unit, model.x, model.y, model)
+            self._model_added(unit, model)
 
+        # the unit's position is its leader's, as in ``move_model``
+        unit.x, unit.y = unit.models[0].x, unit.models[0].y
+        unit.board = self
         self.units.append(unit)
-        print(f"{unit.name} placed successfully.")
+        self.version += 1
+        self._emit("unit_placed", unit=unit.name, team=unit.team, x=unit.x, y=unit.y)
+        self._say("unit_placed", "{unit} placed successfully.", unit=unit.name)
         return True
 
     def get_path(self, start_x, start_y, end_x, end_y):
@@ -136,11 +555,12 @@ class Board:
 
     def is_path_clear(self, start_x, start_y, end_x, end_y):
         """Check if the straight line between two points is unobstructed."""
-        path = self.get_path(start_x, start_y, end_x, end_y)
-        for x, y in path[1:-1]:  # ignore start and destination tiles
-            if self.grid[y][x] not in (TILE_EMPTY, TILE_OBJECTIVE):
-                return False
-        return True
+        path = self.get_path(start_x, start_y, end_x, end_y)[1:-1]  # ignore start and destination tiles
+        if not path:
+            return True
+        xs, ys = zip(*path)
+        xs, ys = list(xs), list(ys)
+        return not (self.terrain_plane[ys, xs].any() or self.unit_plane[ys, xs].any())
 
     def is_path_blocked(self, path, start_pos, unit=None):
         """Return True if any tile along ``path`` is blocked by terrain or other
@@ -152,24 +572,24 @@ class Board:
         multiple board squares.
         """
 
-        ignore_squares = set()
-        if unit:
-            for m in unit.models:
-                ignore_squares.update(m.get_occupied_squares())
-
-        for x, y in path:
-            if (x, y) != start_pos:
-                if self.grid[y][x] not in (TILE_EMPTY, TILE_OBJECTIVE):
-                    if (x, y) in ignore_squares:
-                        continue
-                    return True, (x, y)
+        tiles = [(x, y) for x, y in path if (x, y) != start_pos]
+        if not tiles:
+            return False, None
+        xs, ys = zip(*tiles)
+        xs, ys = list(xs), list(ys)
+        units = self.unit_plane[ys, xs]
+        if unit is not None:
+            units = np.where(units == self._unit_ids.get(id(unit), 0), 0, units)
+        blocked = self.terrain_plane[ys, xs] | (units != 0)
+        if blocked.any():
+            return True, tiles[int(np.argmax(blocked))]
         return False, None
 
     def move_unit(self, unit: Unit, dest_x, dest_y):
         """Move the entire unit, keeping formation for all models."""
 
         if not (0 <= dest_x < BOARD_WIDTH and 0 <= dest_y < BOARD_HEIGHT):
-            print("Move out of bounds!")
+            self._say("move_invalid", "Move out of bounds!", WARNING)
             return False
 
         dx = dest_x - unit.x
@@ -177,59 +597,77 @@ class Board:
         distance = math.sqrt(dx**2 + dy**2)
 
         if distance > unit.move_range:
-            print(f"{unit.name} can't move that far (max {unit.move_range / 2:.1f} inches).")
+            self._say("move_invalid", "{unit} can't move that far (max {inches:.1f} inches).",
+                      WARNING, unit=unit.name, inches=unit.move_range / 2)
             return False
 
         path = self.get_path(unit.x, unit.y, dest_x, dest_y)
         blocked, blocked_tile = self.is_path_blocked(path, (unit.x, unit.y), unit)
         if blocked:
-            print(f"Path is blocked at {blocked_tile}.")
+            self._say("move_invalid", "Path is blocked at {tile}.", WARNING, tile=blocked_tile)
             return False
 
-        # compute new positions for all models
-        new_positions = []
-        unit_squares = set()
-        for m in unit.models:
-            unit_squares.update(m.get_occupied_squares())
-
-        for m in unit.models:
-            new_x = m.x + dx
-            new_y = m.y + dy
-            new_sq = []
-            w_tiles = int(round(m.base_width / 0.5))
-            h_tiles = int(round(m.base_height / 0.5))
-            for ddx in range(w_tiles):
-                for ddy in range(h_tiles):
-                    nx = new_x + ddx
-                    ny = new_y + ddy
-                    if not (0 <= nx < self.width and 0 <= ny < self.height):
-                        print("Move out of bounds!")
-                        return False
-                    if self.grid[ny][nx] != TILE_EMPTY and (nx, ny) not in unit_squares:
-                        print("Destination occupied!")
-                        return False
-                    new_sq.append((nx, ny))
-            new_positions.append((new_x, new_y, new_sq))
-
-        # clear current squares
+        # validate the new footprint of every model
         for m in unit.models:
-            for x, y in m.get_occupied_squares():
-                if 0 <= x < self.width and 0 <= y < self.height:
-                    self.grid[y][x] = TILE_EMPTY
+            w, h = footprint_size(m.base_width, m.base_height)
+            x, y = m.x + dx, m.y + dy
+            if not self.in_bounds(x, y, w, h):
+                self._say("move_invalid", "Move out of bounds!", WARNING)
+                return False
+            if not self.anchors.fits(x, y, w, h, unit):
+                self._say("move_invalid", "Destination occupied!", WARNING)
+                return False
 
-        # apply new positions
-        for idx, (new_x, new_y, new_sq) in enumerate(new_positions):
-            for x, y in new_sq:
-                if 0 <= x < self.width and 0 <= y < self.height:
-                    self.grid[y][x] = TILE_UNIT
-            unit.models[idx].x = new_x
-            unit.models[idx].y = new_y
+        self._translate_unit(unit, dx, dy)
+        return True
 
-        unit.x, unit.y = dest_x, dest_y
+    def reachable_tiles(self, unit: Unit, move_range=None):
+        """Return the :class:`~game_logic.reachability.Reach` of leader
+        squares ``unit`` can move to, cached until the board changes."""
+        return self.reachability.get(unit, move_range)
 
-        print(f"{unit.name} moved to ({dest_x}, {dest_y}).")
+    def move_unit_within_reach(self, unit: Unit, dest_x, dest_y, move_range=None):
+        """Move ``unit`` to any square of its :meth:`reachable_tiles`,
+        including ones only reachable by going around obstacles."""
+        if (dest_x, dest_y) not in self.reachable_tiles(unit, move_range):
+            return False
+        self._translate_unit(unit, dest_x - unit.x, dest_y - unit.y)
         return True
 
+    def _translate_unit(self, unit: Unit, dx, dy):
+        # clear current squares, then stamp the new ones
+        old = [(m, m.x, m.y) for m in unit.models]
+        for m, x, y in old:
+            self._record_undo("move", unit, m, x, y, unit.x, unit.y)
+            self._clear_model(x, y, m)
+        for m, x, y in old:
+            m.x, m.y = x + dx, y + dy
+            self._stamp_model(unit, x + dx, y + dy, m)
+            self._model_moved(unit, m, x, y)
+
+        unit.x += dx
+        unit.y += dy
+        self.version += 1
+        self._emit("unit_moved", unit=unit.name, team=unit.team, x=unit.x, y=unit.y)
+
+        self._say("unit_moved", "{unit} moved to ({x}, {y}).", unit=unit.name, x=unit.x, y=unit.y)
+
+    def reform_unit(self, unit: Unit, layout):
+        """Move every model of ``unit`` to the anchors ``layout`` at once,
+        as laid out by ``formations.fit_formation``. The layout is not
+        validated here."""
+        for m in unit.models:
+            self._record_undo("move", unit, m, m.x, m.y, unit.x, unit.y)
+            self._clear_model(m.x, m.y, m)
+        for m, (x, y) in zip(unit.models, layout):
+            old_x, old_y = m.x, m.y
+            m.x, m.y = x, y
+            self._stamp_model(unit, x, y, m)
+            self._model_moved(unit, m, old_x, old_y)
+        unit.x, unit.y = layout[0]
+        self.version += 1
+        self._emit("unit_moved", unit=unit.name, team=unit.team, x=unit.x, y=unit.y)
+
     def move_model(self, unit: Unit, model_idx: int, dest_x: int, dest_y: int,
                    enforce_coherency: bool = True):
         """Move an individual model if the destination is valid.
@@ -243,27 +681,8 @@ class Board:
             return False
 
         model = unit.models[model_idx]
-
-        def _squares(x, y, width, height):
-            occ = []
-            w_tiles = int(round(width / 0.5))
-            h_tiles = int(round(height / 0.5))
-            for dx in range(w_tiles):
-                for dy in range(h_tiles):
-                    occ.append((x + dx, y + dy))
-            return occ
-
-        new_squares = _squares(dest_x, dest_y, model.base_width, model.base_height)
-        current_squares = set(model.get_occupied_squares())
-        unit_squares = set()
-        for m in unit.models:
-            unit_squares.update(m.get_occupied_squares())
-
-        for x, y in new_squares:
-            if not (0 <= x < self.width and 0 <= y < self.height):
-                return False
-            if self.grid[y][x] != TILE_EMPTY and (x, y) not in unit_squares:
-                return False
+        if not self.base_fits(model, dest_x, dest_y, ignore_unit=unit):
+            return False
 
         if enforce_coherency:
             coherent = False
@@ -276,40 +695,118 @@ class Board:
             if not coherent and len(unit.models) > 1:
                 return False
 
-        for x, y in current_squares:
-            self.grid[y][x] = TILE_EMPTY
-        for x, y in new_squares:
-            self.grid[y][x] = TILE_UNIT
+        old_x, old_y = model.x, model.y
+        self._record_undo("move", unit, model, old_x, old_y, unit.x, unit.y)
+        self._clear_model(model.x, model.y, model)
+        self._stamp_model(unit, dest_x, dest_y, model)
+        self.version += 1
 
         model.x, model.y = dest_x, dest_y
+        self._model_moved(unit, model, old_x, old_y)
         if model_idx == 0:
             unit.x, unit.y = dest_x, dest_y
+        self._emit("model_moved", unit=unit.name, team=unit.team, model=model_idx, x=dest_x, y=dest_y)
+        return True
+
+    def charge_unit(self, unit: Unit, dest_x: int, dest_y: int):
+        """Shift every model of ``unit`` so the leader ends on
+        ``(dest_x, dest_y)``, keeping the move only if the unit ends in base
+        contact with an enemy. Charge distance is checked by the caller."""
+        dx = dest_x - unit.x
+        dy = dest_y - unit.y
+        if not all(self.base_fits(m, m.x + dx, m.y + dy, ignore_unit=unit) for m in unit.models):
+            return False
+        if not self.in_base_contact(unit, dx, dy):
+            return False
+        self._translate_unit(unit, dx, dy)
         return True
 
+    def relocate_model(self, unit: Unit, model: Model, dest_x: int, dest_y: int):
+        """Set a model's position without validation, keeping the occupancy
+        planes and model index in sync. Used for rules such as pile-in that
+        move models directly."""
+        old_x, old_y = model.x, model.y
+        self._record_undo("move", unit, model, old_x, old_y, unit.x, unit.y)
+        self._clear_model(model.x, model.y, model)
+        model.x, model.y = dest_x, dest_y
+        self._stamp_model(unit, dest_x, dest_y, model)
+        self._model_moved(unit, model, old_x, old_y)
+        self.version += 1
+        self._emit("model_moved", unit=unit.name, team=unit.team, x=dest_x, y=dest_y)
+
+    def remove_model(self, unit: Unit, model: Model):
+        """Remove a slain model from ``unit`` and free its squares."""
+        for i, m in enumerate(unit.models):
+            if m is model:
+                del unit.models[i]
+                self._record_undo("remove", unit, model, i)
+                if i == 0 and unit.models:
+                    # the next model becomes the leader and is drawn as one
+                    leader = unit.models[0]
+                    self._record_change(leader.x, leader.y,
+                                        *footprint_size(leader.base_width, leader.base_height))
+                break
+        self._clear_model(model.x, model.y, model)
+        self._model_removed(unit, model)
+        self.version += 1
+        self._emit("model_slain", unit=unit.name, team=unit.team, x=model.x, y=model.y,
+                   remaining=len(unit.models))
+
+    def damage_model(self, unit: Unit, model: Model, dmg):
+        """Apply ``dmg`` to ``model``, recording its health for undo."""
+        self._record_undo("health", model, model.current_health)
+        model.take_damage(dmg)
+
     def ai_move(self, unit: Unit):
-        print(f"AI's turn for {unit.name}")
-        attempts = 10
-        for _ in range(attempts):
-            dx = random.randint(-unit.move_range, unit.move_range)
-            dy = random.randint(-unit.move_range, unit.move_range)
-            dest_x = unit.x + dx
-            dest_y = unit.y + dy
-
-            if not (0 <= dest_x < BOARD_WIDTH and 0 <= dest_y < BOARD_HEIGHT):
-                continue
-
-            dist = math.sqrt(dx**2 + dy**2)
-            if dist <= unit.move_range:
-                if self.move_unit(unit, dest_x, dest_y):
-                    return
-        print(f"{unit.name} could not move after {attempts} attempts.")
+        self._say("ai_turn", "AI's turn for {unit}", unit=unit.name)
+        for _, dest in self.planner.plan_movement(self, [unit]):
+            if dest is not None and self.move_unit(unit, *dest):
+                return
+        self._say("unit_held", "{unit} holds its position.", unit=unit.name)
 
     def update_objective_control(self):
-        for obj in self.objectives:
-            obj.update_control(self.units)
+        """Re-resolve control for objectives whose tallies changed."""
+        self._track_objectives()
+        for i in sorted(self.dirty_objectives):
+            obj = self._objectives[i]
+            previous = obj.control_team
+            obj.update_control_from_scores()
+            if obj.control_team != previous:
+                self._record_undo("control", obj, previous)
+                self._emit("objective_control", objective=i, x=obj.x, y=obj.y, team=obj.control_team)
+        self.dirty_objectives.clear()
+
+    def preview_objective_control(self, moves):
+        """Return each objective's control team if ``moves`` were made.
+
+        ``moves`` is an iterable of ``(unit, model, x, y)``; a position of
+        ``None`` removes the model. Board state is left untouched.
+        """
+        self._track_objectives()
+        deltas = [dict() for _ in self._objectives]
+
+        def _shift(unit, x, y, sign):
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                return
+            for i in np.flatnonzero(self._objective_reach[:, y, x]).tolist():
+                deltas[i][unit.team] = deltas[i].get(unit.team, 0) + sign * unit.control_score
+
+        for unit, model, x, y in moves:
+            _shift(unit, model.x, model.y, -1)
+            if x is not None:
+                _shift(unit, x, y, 1)
+
+        result = []
+        for obj, delta in zip(self._objectives, deltas):
+            team = obj.tallied_control_team(delta)
+            result.append(team if team is not None else obj.control_team)
+        return result
 
     def display_objective_status(self):
-        print("\nObjective Control Status:")
+        if self.log is None or not self.log.enabled(INFO):
+            return
+        self._say("objective_status", "\nObjective Control Status:")
         for obj in self.objectives:
             owner = f"Team {obj.control_team}" if obj.control_team else "Uncontrolled"
-            print(f" - Objective at ({obj.x}, {obj.y}) is controlled by {owner}.")
\ No newline at end of file
+            self._say("objective_status", " - Objective at ({x}, {y}) is controlled by {owner}.",
+                      x=obj.x, y=obj.y, owner=owner)
\ No newline at end of file
@@ -0,0 +1,159 @@
+"""Exact damage distributions for weapon profiles.
+
+The calculator follows the same rules as ``resolve_melee_attacks``: every
+model makes the weapon's attacks, hits and wounds on the profile's values,
+saves are a flat roll (4+ by default) and each point of damage is applied to
+the first surviving model, spilling over to the next one.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from game_logic.dice import parse_dice
+
+
+def _freeze(array):
+    array.flags.writeable = False
+    return array
+
+
+def _success_chance(target):
+    """Chance of rolling ``target`` or more on a D6."""
+    return min(max((7 - target) / 6.0, 0.0), 1.0)
+
+
+@lru_cache(maxsize=None)
+def dice_pmf(expr):
+    """Probability mass of ``expr`` indexed by value."""
+    dice, sides, modifier = parse_dice(expr)
+    pmf = np.zeros(modifier + 1)
+    pmf[modifier] = 1.0
+    if sides:
+        single = np.zeros(sides + 1)
+        single[1:] = 1.0 / sides
+        for _ in range(dice):
+            pmf = np.convolve(pmf, single)
+    return _freeze(pmf)
+
+
+def _power_mixture(per_attack, attacks_pmf):
+    """Distribution of the sum of N independent ``per_attack`` draws where N
+    follows ``attacks_pmf``."""
+    result = np.zeros(1 + (len(per_attack) - 1) * (len(attacks_pmf) - 1))
+    power = np.ones(1)
+    for n, weight in enumerate(attacks_pmf):
+        if n:
+            power = np.convolve(power, per_attack)
+        if weight:
+            result[:len(power)] += weight * power
+    return result
+
+
+def _weapon_key(weapon):
+    return (weapon["attacks"], weapon["to_hit"], weapon["to_wound"],
+            weapon.get("rend", 0), weapon["damage"])
+
+
+@lru_cache(maxsize=4096)
+def _weapon_pmfs(key, num_models, save):
+    attacks, to_hit, to_wound, _rend, damage = key
+    p = _success_chance(to_hit) * _success_chance(to_wound)
+    if save is not None:
+        p *= 1.0 - _success_chance(save)
+
+    attacks_pmf = np.ones(1)
+    for _ in range(num_models):
+        attacks_pmf = np.convolve(attacks_pmf, dice_pmf(attacks))
+
+    wound = np.array([1.0 - p, p])
+    per_attack = dice_pmf(damage) * p
+    per_attack[0] += 1.0 - p
+    return (_freeze(_power_mixture(wound, attacks_pmf)),
+            _freeze(_power_mixture(per_attack, attacks_pmf)))
+
+
+def weapon_distributions(weapon, num_models=1, save=4):
+    """Return ``(unsaved_wounds_pmf, damage_pmf)`` for ``weapon``.
+
+    Results are memoised on the weapon profile, attacker count and save.
+    """
+    return _weapon_pmfs(_weapon_key(weapon), num_models, save)
+
+
+@lru_cache(maxsize=4096)
+def _slain_pmf(damage_pmf_bytes, healths):
+    damage_pmf = np.frombuffer(damage_pmf_bytes)
+    thresholds = np.cumsum(healths)
+    slain = np.searchsorted(thresholds, np.arange(len(damage_pmf)), side="right")
+    return _freeze(np.bincount(slain, weights=damage_pmf, minlength=len(healths) + 1))
+
+
+def models_slain_pmf(damage_pmf, healths):
+    """Distribution of models slain when ``damage_pmf`` is applied in order to
+    models with the given remaining ``healths``."""
+    return _slain_pmf(np.ascontiguousarray(damage_pmf, dtype=float).tobytes(), tuple(healths))
+
+
+@dataclass(frozen=True)
+class AttackDistribution:
+    """Exact outcome distributions of an attack, each indexed by count."""
+
+    wounds: np.ndarray
+    damage: np.ndarray
+    slain: np.ndarray
+
+    @staticmethod
+    def _mean(pmf):
+        return float(np.dot(np.arange(len(pmf)), pmf))
+
+    @property
+    def expected_wounds(self):
+        return self._mean(self.wounds)
+
+    @property
+    def expected_damage(self):
+        return self._mean(self.damage)
+
+    @property
+    def expected_slain(self):
+        return self._mean(self.slain)
+
+    def chance_to_slay(self, models=1):
+        """Probability of slaying at least ``models`` models."""
+        return float(self.slain[models:].sum())
+
+
+def attack_distribution(weapons, num_models=1, target_models=1, target_health=1, save=4):
+    """Combine one or more weapon profiles against a uniform target.
+
+    ``weapons`` is a weapon dict or a list of them, each used by
+    ``num_models`` attackers. The target has ``target_models`` models with
+    ``target_health`` wounds each.
+    """
+    healths = (target_health,) * target_models
+    return _combine(weapons, num_models, healths, save)
+
+
+def unit_attack_distribution(unit, target, save=4):
+    """Distribution of ``unit``'s melee attacks against ``target`` as it
+    currently stands, including damage already taken."""
+    healths = tuple(m.current_health for m in target.models if m.is_alive())
+    return _combine(unit.melee_weapons, len(unit.models), healths, save)
+
+
+def _combine(weapons, num_models, healths, save):
+    if isinstance(weapons, dict):
+        weapons = [weapons]
+    wounds = np.ones(1)
+    damage = np.ones(1)
+    for weapon in weapons:
+        w, d = weapon_distributions(weapon, num_models, save)
+        wounds = np.convolve(wounds, w)
+        damage = np.convolve(damage, d)
+    return AttackDistribution(
+        wounds=_freeze(wounds),
+        damage=_freeze(damage),
+        slain=models_slain_pmf(damage, healths),
+    )
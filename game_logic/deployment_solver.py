@@ -0,0 +1,84 @@
+"""Choose where the AI deploys a unit.
+
+A formation puts every model's base at a fixed offset from the leader's
+central square. Each model's free-anchor mask, shifted by its offset and
+intersected with the deployment zone, gives every legal leader square in
+one pass; a scoring function then ranks those squares.
+
+Scores are vectorized: ``score(board, unit, xs, ys, enemy_zone)`` gets
+the candidate leader squares as integer arrays and returns one number
+per candidate, higher is better.
+"""
+
+import numpy as np
+
+from game_logic.footprints import footprint_size, shift_mask
+from game_logic.formations import fit_formation, formation_anchors
+
+
+def legal_unit_anchors(board, unit, offsets, zone):
+    """Return the ``[y, x]`` mask of leader squares in ``zone`` at which
+    ``unit`` fits on the board in the formation ``offsets``."""
+    legal = zone.mask.copy()
+    for model, (ax, ay) in zip(unit.models, formation_anchors(unit, offsets)):
+        w, h = footprint_size(model.base_width, model.base_height)
+        legal &= shift_mask(board.anchors.mask(w, h), ax, ay)
+    return legal
+
+
+def fit_unit_in_zone(board, unit, formation, zone, enemy_zone, score=None):
+    """Fallback for a unit whose exact formation fits nowhere in ``zone``:
+    return the :func:`fit_formation` layout around the best-scoring leader
+    square that admits one, or None.
+
+    Leader squares are tried in score order until a layout is found.
+    """
+    score = score or default_score
+    leader = unit.models[0]
+    w, h = footprint_size(leader.base_width, leader.base_height)
+    cx, cy = leader.get_central_square()
+    legal = zone.mask & shift_mask(board.anchors.mask(w, h), leader.x - cx, leader.y - cy)
+    ys, xs = np.nonzero(legal)
+    if not len(xs):
+        return None
+    scores = np.asarray(score(board, unit, xs, ys, enemy_zone), dtype=float)
+    for i in np.argsort(-scores, kind="stable").tolist():
+        layout = fit_formation(board, unit, int(xs[i]), int(ys[i]), formation, zone.orientation)
+        if layout is not None:
+            return layout
+    return None
+
+
+def objective_score(board, unit, xs, ys, enemy_zone):
+    """Closer to the nearest objective is better."""
+    if not board.objectives:
+        return np.zeros(len(xs))
+    return -np.sqrt(board.terrain_distance.objectives()[ys, xs])
+
+
+def screening_score(board, unit, xs, ys, enemy_zone):
+    """Units of several models press toward the enemy to screen; lone
+    models (heroes) stay back behind them."""
+    distance = np.sqrt(enemy_zone.distance_sq[ys, xs])
+    return -distance if len(unit.models) > 1 else distance
+
+
+def default_score(board, unit, xs, ys, enemy_zone):
+    """Objectives first, with troops in front and heroes behind."""
+    return objective_score(board, unit, xs, ys, enemy_zone) + screening_score(board, unit, xs, ys, enemy_zone)
+
+
+def choose_unit_anchor(board, unit, offsets, zone, enemy_zone, score=default_score, dice=None):
+    """Return the best leader square for ``unit`` as ``(x, y)``, or None
+    when it fits nowhere in ``zone``.
+
+    Ties are broken with ``dice`` (the board's deployment stream by
+    default).
+    """
+    ys, xs = np.nonzero(legal_unit_anchors(board, unit, offsets, zone))
+    if not len(xs):
+        return None
+    scores = np.asarray(score(board, unit, xs, ys, enemy_zone), dtype=float)
+    best = np.flatnonzero(scores >= scores.max() - 1e-9)
+    pick = (dice or board.rng.dice("deployment")).choice(best.tolist())
+    return int(xs[pick]), int(ys[pick])
@@ -0,0 +1,127 @@
+"""Batched dice rolling for attack resolution."""
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+import numpy as np
+
+_DICE_RE = re.compile(r"^\s*(\d*)\s*[dD]\s*(\d+)\s*(?:\+\s*(\d+))?\s*$")
+
+
+@lru_cache(maxsize=None)
+def parse_dice(expr):
+    """Return ``(count, sides, modifier)`` for expressions such as ``"2D6"``.
+
+    Plain integers parse as ``(0, 0, value)``. Unknown strings count as a
+    flat 1, matching the behaviour of ``roll_damage``.
+    """
+    if isinstance(expr, (int, np.integer)):
+        return 0, 0, int(expr)
+    match = _DICE_RE.match(str(expr))
+    if not match:
+        return 0, 0, 1
+    count, sides, modifier = match.groups()
+    return int(count or 1), int(sides), int(modifier or 0)
+
+
+@dataclass
+class AttackSummary:
+    """Outcome of rolling one weapon profile for a whole unit."""
+
+    weapon: str
+    attacks: int = 0
+    hits: int = 0
+    wounds: int = 0
+    saves: int = 0
+    # damage rolled for each unsaved wound, in roll order
+    damage: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    # per-roll log lines, only built when a verbose roll was requested
+    trace: list | None = None
+
+    @property
+    def unsaved(self):
+        return self.wounds - self.saves
+
+    @property
+    def total_damage(self):
+        return int(self.damage.sum())
+
+
+class DiceEngine:
+    """Roll dice in NumPy batches from a seeded ``Generator``."""
+
+    def __init__(self, seed=None):
+        if isinstance(seed, np.random.Generator):
+            self.rng = seed
+        else:
+            self.rng = np.random.default_rng(seed)
+
+    def d6(self, count):
+        return self.rng.integers(1, 7, size=count)
+
+    def roll_expr(self, expr, count=1):
+        """Roll ``expr`` (an int or a dice string) ``count`` times."""
+        dice, sides, modifier = parse_dice(expr)
+        if dice == 0:
+            return np.full(count, modifier, dtype=np.int64)
+        rolls = self.rng.integers(1, sides + 1, size=(count, dice)).sum(axis=1)
+        return rolls + modifier
+
+    def roll_attacks(self, weapon, num_models=1, save=4, verbose=False):
+        """Roll the hit, wound and save sequence for ``weapon``.
+
+        Every model in the unit makes the weapon's attacks. ``save`` is the
+        target's save roll (``None`` skips saves). With ``verbose`` the
+        summary carries a per-roll trace.
+        """
+        attacks = int(self.roll_expr(weapon["attacks"], num_models).sum())
+        hit_rolls = self.d6(attacks)
+        hit_mask = hit_rolls >= weapon["to_hit"]
+        wound_rolls = self.d6(int(hit_mask.sum()))
+        wound_mask = wound_rolls >= weapon["to_wound"]
+        wounds = int(wound_mask.sum())
+        if save is None:
+            save_rolls = np.zeros(0, dtype=np.int64)
+            save_mask = np.zeros(wounds, dtype=bool)
+        else:
+            save_rolls = self.d6(wounds)
+            save_mask = save_rolls >= save
+        damage = self.roll_expr(weapon["damage"], wounds - int(save_mask.sum()))
+
+        summary = AttackSummary(
+            weapon=weapon.get("name", ""),
+            attacks=attacks,
+            hits=int(hit_mask.sum()),
+            wounds=wounds,
+            saves=int(save_mask.sum()),
+            damage=damage,
+        )
+        if verbose:
+            summary.trace = _build_trace(weapon, save, hit_rolls, wound_rolls, save_rolls, damage)
+        return summary
+
+
+def _build_trace(weapon, save, hit_rolls, wound_rolls, save_rolls, damage):
+    lines = []
+    wound_iter = iter(wound_rolls.tolist())
+    save_iter = iter(save_rolls.tolist())
+    damage_iter = iter(damage.tolist())
+    for hit in hit_rolls.tolist():
+        lines.append(f"  Hit roll: {hit} (needs {weapon['to_hit']}+)")
+        if hit < weapon["to_hit"]:
+            lines.append("  Missed.")
+            continue
+        wound = next(wound_iter)
+        lines.append(f"  Wound roll: {wound} (needs {weapon['to_wound']}+)")
+        if wound < weapon["to_wound"]:
+            lines.append("  Failed to wound.")
+            continue
+        if save is not None:
+            roll = next(save_iter)
+            lines.append(f"  Save roll: {roll} (needs {save}+)")
+            if roll >= save:
+                lines.append("  Saved!")
+                continue
+        lines.append(f"  {next(damage_iter)} damage inflicted!")
+    return lines
@@ -0,0 +1,79 @@
+"""Exact squared Euclidean distance fields over the board grid.
+
+A field holds, for every ``[y, x]`` tile, the squared distance to the
+nearest source tile (0 on a source). Squared integer distances compare
+exactly with the ``math.hypot(...) < r`` rules they replace: ``d < r``
+is ``d2 < r * r``.
+"""
+
+import numpy as np
+
+
+def squared_distance_field(sources):
+    """Return the squared distance from every tile to the nearest ``True``
+    tile of the boolean ``[y, x]`` array ``sources``.
+
+    Tiles are farther than any real distance when there are no sources.
+    """
+    sources = np.asarray(sources, dtype=bool)
+    h, w = sources.shape
+    far = h + w
+    # Distance along each column to the nearest source in that column...
+    g = np.where(sources, 0, far).astype(np.int64)
+    for y in range(1, h):
+        np.minimum(g[y], g[y - 1] + 1, out=g[y])
+    for y in range(h - 2, -1, -1):
+        np.minimum(g[y], g[y + 1] + 1, out=g[y])
+    # ...then the best column for each tile of each row.
+    xs = np.arange(w)
+    dx2 = (xs[:, None] - xs[None, :]) ** 2
+    return (g[:, None, :] ** 2 + dx2[None, :, :]).min(axis=2)
+
+
+def add_sources(field, tiles):
+    """Lower ``field`` in place to account for new source ``tiles``."""
+    tiles = np.asarray(list(tiles), dtype=np.int64).reshape(-1, 2)
+    if not len(tiles):
+        return field
+    h, w = field.shape
+    ys, xs = np.ogrid[0:h, 0:w]
+    for tx, ty in tiles.tolist():
+        np.minimum(field, (xs - tx) ** 2 + (ys - ty) ** 2, out=field)
+    return field
+
+
+class TerrainDistanceCache:
+    """Squared distance fields to a board's terrain and objectives.
+
+    Terrain only grows between snapshots, so the terrain field is extended
+    with each newly placed tile rather than rebuilt; it is rebuilt when
+    earlier terrain was removed. The objective field is rebuilt when the
+    objectives move.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self._terrain = None
+        self._terrain_tiles = []
+        self._objectives = None
+        self._objective_key = None
+
+    def terrain(self):
+        terrain, known = self.board.terrain, self._terrain_tiles
+        if self._terrain is None or terrain[:len(known)] != known:
+            self._terrain = squared_distance_field(self.board.terrain_plane)
+        elif len(terrain) > len(known):
+            add_sources(self._terrain, terrain[len(known):])
+        self._terrain_tiles = list(terrain)
+        return self._terrain
+
+    def objectives(self):
+        key = tuple((o.x, o.y) for o in self.board.objectives)
+        if key != self._objective_key:
+            sources = np.zeros((self.board.height, self.board.width), dtype=bool)
+            for x, y in key:
+                if 0 <= x < self.board.width and 0 <= y < self.board.height:
+                    sources[y, x] = True
+            self._objectives = squared_distance_field(sources)
+            self._objective_key = key
+        return self._objectives
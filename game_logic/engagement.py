@@ -0,0 +1,80 @@
+"""Board-wide engagement: which units touch or threaten each other.
+
+Both relations are computed for every unit at once and cached until the
+board's ``version`` changes, so charge validation and combat eligibility
+share one pass instead of comparing model pairs per query.
+"""
+
+import numpy as np
+
+# Squares (dx, dy) compared against each square for base contact; the
+# other four neighbours are covered by symmetry.
+_FORWARD = ((1, 0), (0, 1), (1, 1), (1, -1))
+
+
+def contact_pairs(board):
+    """Return ``{(uid_a, uid_b)}`` (``uid_a < uid_b``) for enemy units in
+    base contact, from ``unit_plane`` compared with its shifted copies."""
+    units, teams = board.unit_plane, board.team_plane
+    h, w = units.shape
+    found = set()
+    for dx, dy in _FORWARD:
+        # ``a`` is each square and ``b`` its neighbour at (+dx, +dy)
+        ys_a = slice(max(-dy, 0), h - max(dy, 0))
+        ys_b = slice(max(dy, 0), h + min(dy, 0))
+        a, b = units[ys_a, :w - dx], units[ys_b, dx:]
+        ta, tb = teams[ys_a, :w - dx], teams[ys_b, dx:]
+        hit = (a != 0) & (b != 0) & (ta != tb)
+        if hit.any():
+            lo = np.minimum(a[hit], b[hit]).astype(np.int64)
+            hi = np.maximum(a[hit], b[hit]).astype(np.int64)
+            for key in np.unique(lo << 32 | hi).tolist():
+                found.add((key >> 32, key & 0xFFFFFFFF))
+    return found
+
+
+class EngagementCache:
+    """Cached base-contact pairs and in-combat units for one board."""
+
+    def __init__(self, board):
+        self.board = board
+        self._version = None
+        self._contacts = None
+        self._partners = None
+        self._in_combat = {}
+
+    def _sync(self):
+        if self._version != self.board.version:
+            self._version = self.board.version
+            self._contacts = None
+            self._partners = None
+            self._in_combat.clear()
+
+    def contacts(self):
+        """Return the set of ``(uid_a, uid_b)`` pairs in base contact."""
+        self._sync()
+        if self._contacts is None:
+            self._contacts = contact_pairs(self.board)
+        return self._contacts
+
+    def partners(self, uid):
+        """Return the uids of enemy units in base contact with ``uid``."""
+        self._sync()
+        if self._partners is None:
+            self._partners = {}
+            for a, b in self.contacts():
+                self._partners.setdefault(a, []).append(b)
+                self._partners.setdefault(b, []).append(a)
+        return self._partners.get(uid, ())
+
+    def in_combat(self, radius):
+        """Return ids of units with a model strictly within ``radius`` tiles
+        of an enemy model (``is_in_combat`` for every unit at once)."""
+        self._sync()
+        units = self._in_combat.get(radius)
+        if units is None:
+            units = self._in_combat[radius] = set()
+            for unit_a, unit_b in self.board.model_index.enemy_pairs(radius, inclusive=False):
+                units.add(id(unit_a))
+                units.add(id(unit_b))
+        return units
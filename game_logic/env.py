@@ -0,0 +1,286 @@
+"""Gym-style environments for training agents against the built-in AI.
+
+:class:`SpearheadEnv` plays one side of a game through ``GameEngine.step``
+and returns ``GameState.to_tensor`` observations. :class:`VectorEnv` steps
+several independent environments in lockstep, either in this process or
+spread over worker processes.
+"""
+
+import multiprocessing
+from dataclasses import dataclass, asdict
+
+import numpy as np
+
+from game_logic.board import BOARD_HEIGHT, BOARD_WIDTH
+from game_logic.game_engine import GameEngine
+from game_logic.game_state import CHANNEL_KEYS
+from game_logic.simulation import AIPolicy, run_headless_deployment
+from game_phases.deployment import load_faction_force
+
+ACTION_TYPES = ("pass", "move", "shoot", "charge", "fight")
+
+
+@dataclass(frozen=True)
+class Action:
+    """One agent action; see ``GameEngine.step`` for the meaning of fields."""
+
+    type: str = "pass"
+    unit: int = 0
+    x: int = 0
+    y: int = 0
+    target: int = 0
+
+    def to_dict(self):
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class ActionSpace:
+    """Bounds of every :class:`Action` field."""
+
+    num_units: int
+    num_targets: int
+    width: int
+    height: int
+
+    def contains(self, action):
+        return (action.type in ACTION_TYPES
+                and 0 <= action.unit < max(self.num_units, 1)
+                and 0 <= action.target < max(self.num_targets, 1)
+                and 0 <= action.x < self.width
+                and 0 <= action.y < self.height)
+
+    def sample(self, rng=None):
+        rng = rng or np.random.default_rng()
+        return Action(
+            type=ACTION_TYPES[int(rng.integers(len(ACTION_TYPES)))],
+            unit=int(rng.integers(max(self.num_units, 1))),
+            x=int(rng.integers(self.width)),
+            y=int(rng.integers(self.height)),
+            target=int(rng.integers(max(self.num_targets, 1))),
+        )
+
+
+class SpearheadEnv:
+    """Play ``side`` of a headless game one action at a time.
+
+    The other side is driven by ``opponent`` (an :class:`AIPolicy` by
+    default) and takes its whole turn between agent steps. The reward is
+    the change in the agent's VP lead over the step; an episode ends after
+    ``rounds`` battle rounds.
+
+    Each game's engine has its own random streams seeded from ``seed``, so
+    several environments can share a process and still replay identically.
+    """
+
+    def __init__(self, factions=("stormcast", "skaven"), rounds=4, side="player",
+                 opponent=None, battlefield=None, deployment_map=None, seed=None):
+        self.factions = tuple(factions)
+        self.rounds = rounds
+        self.side = side
+        self.other = "ai" if side == "player" else "player"
+        self.opponent = opponent or AIPolicy()
+        self.battlefield = battlefield
+        self.deployment_map = deployment_map
+        self._seed = seed
+        self._force_sizes = {
+            name: len(load_faction_force(faction, team_number=1))
+            for name, faction in zip(("player", "ai"), self.factions)
+        }
+        self.engine = None
+        self._pending = []
+        self.done = True
+
+    @property
+    def observation_shape(self):
+        return (len(CHANNEL_KEYS), BOARD_HEIGHT, BOARD_WIDTH)
+
+    @property
+    def action_space(self):
+        """Bounds of the agent's actions, known before the first :meth:`reset`."""
+        return ActionSpace(self._force_sizes[self.side], self._force_sizes[self.other],
+                           BOARD_WIDTH, BOARD_HEIGHT)
+
+    def _lead(self):
+        vp = self.engine.game_state.total_vp
+        return (vp[self.engine.team_number(self.side)]
+                - vp[self.engine.team_number(self.other)])
+
+    def _observe(self):
+        return self.engine.game_state.to_tensor()
+
+    def _info(self, applied=True):
+        state = self.engine.game_state
+        return {
+            "applied": applied,
+            "round": state.round,
+            "phase": state.phase,
+            "vp": {side: state.total_vp[self.engine.team_number(side)] for side in ("player", "ai")},
+        }
+
+    def reset(self, seed=None):
+        """Start a new game and return ``(observation, info)``.
+
+        Without ``seed`` the game continues the seed sequence of the previous
+        reset (or the constructor's ``seed``), so auto-resets are reproducible.
+        """
+        if seed is None:
+            seed = self._seed
+        self._seed = None if seed is None else seed + 1
+        self.engine = GameEngine(headless=True, seed=seed, policies={self.other: self.opponent})
+        self._pending = []
+        self._started = False
+        self.done = False
+        run_headless_deployment(self.engine, self.factions, self.battlefield, self.deployment_map)
+        self._advance()
+        return self._observe(), self._info()
+
+    def _advance(self):
+        """Run opponent turns until it is the agent's turn or the game ends."""
+        engine = self.engine
+        state = engine.game_state
+        get_input = self.opponent.get_input
+        while True:
+            if not self._pending:
+                if self._started:
+                    state.round += 1
+                self._started = True
+                if state.round > self.rounds:
+                    self.done = True
+                    return
+                if state.round > 1:
+                    engine.roll_priority(get_input)
+                first = state.current_priority
+                self._pending = [first, "ai" if first == "player" else "player"]
+            team = self._pending.pop(0)
+            if team == self.side:
+                engine.begin_turn(team)
+                return
+            engine.run_turn(team, get_input)
+
+    def step(self, action):
+        """Apply ``action`` and return ``(obs, reward, terminated, truncated, info)``."""
+        if self.done:
+            raise RuntimeError("step() called on a finished episode; call reset() first")
+        if isinstance(action, Action):
+            action = action.to_dict()
+        before = self._lead()
+        applied = self.engine.step(action)
+        if self.engine.game_state.phase == "hero":
+            self._advance()
+        reward = float(self._lead() - before)
+        return self._observe(), reward, self.done, False, self._info(applied)
+
+
+class _LocalEnvs:
+    """Run a group of environments in the calling process."""
+
+    def __init__(self, env_fns):
+        self.envs = [fn() for fn in env_fns]
+
+    def reset(self, seeds):
+        return [env.reset(seed) for env, seed in zip(self.envs, seeds)]
+
+    def step(self, actions):
+        results = []
+        for env, action in zip(self.envs, actions):
+            obs, reward, terminated, truncated, info = env.step(action)
+            if terminated or truncated:
+                info = dict(info, final_observation=obs)
+                obs, _ = env.reset()
+            results.append((obs, reward, terminated, truncated, info))
+        return results
+
+    def close(self):
+        pass
+
+
+def _worker(conn, env_fns):
+    envs = _LocalEnvs(env_fns)
+    try:
+        while True:
+            command, payload = conn.recv()
+            if command == "close":
+                break
+            conn.send(getattr(envs, command)(payload))
+    finally:
+        conn.close()
+
+
+class _RemoteEnvs:
+    """Run a group of environments in a worker process."""
+
+    def __init__(self, env_fns, context):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_worker, args=(child, env_fns), daemon=True)
+        self.process.start()
+        child.close()
+
+    def send(self, command, payload):
+        self.conn.send((command, payload))
+
+    def recv(self):
+        return self.conn.recv()
+
+    def close(self):
+        self.conn.send(("close", None))
+        self.process.join()
+
+
+class VectorEnv:
+    """Step ``len(env_fns)`` independent environments in lockstep.
+
+    ``env_fns`` are zero-argument callables creating a :class:`SpearheadEnv`.
+    With ``workers`` greater than one the environments are split across that
+    many processes (the callables must then be picklable). Finished episodes
+    reset automatically; the last observation of the finished episode is in
+    ``info["final_observation"]``.
+    """
+
+    def __init__(self, env_fns, workers=None):
+        env_fns = list(env_fns)
+        self.num_envs = len(env_fns)
+        if workers is None or workers <= 1:
+            self._groups = [_LocalEnvs(env_fns)]
+            self._sizes = [self.num_envs]
+            self._remote = False
+        else:
+            context = multiprocessing.get_context()
+            chunks = np.array_split(np.arange(self.num_envs), min(workers, self.num_envs))
+            self._groups = [_RemoteEnvs([env_fns[i] for i in chunk], context) for chunk in chunks]
+            self._sizes = [len(chunk) for chunk in chunks]
+            self._remote = True
+
+    def _split(self, items):
+        out, start = [], 0
+        for size in self._sizes:
+            out.append(items[start:start + size])
+            start += size
+        return out
+
+    def _call(self, command, items):
+        parts = self._split(list(items))
+        if self._remote:
+            for group, part in zip(self._groups, parts):
+                group.send(command, part)
+            results = [group.recv() for group in self._groups]
+        else:
+            results = [getattr(group, command)(part) for group, part in zip(self._groups, parts)]
+        return [r for group_results in results for r in group_results]
+
+    def reset(self, seeds=None):
+        """Reset every environment; returns stacked observations and infos."""
+        seeds = [None] * self.num_envs if seeds is None else list(seeds)
+        results = self._call("reset", seeds)
+        return np.stack([obs for obs, _ in results]), [info for _, info in results]
+
+    def step(self, actions):
+        """Step every environment with its action from ``actions``."""
+        results = self._call("step", actions)
+        obs, rewards, terminated, truncated, infos = zip(*results)
+        return (np.stack(obs), np.array(rewards, dtype=np.float32),
+                np.array(terminated), np.array(truncated), list(infos))
+
+    def close(self):
+        for group in self._groups:
+            group.close()
@@ -0,0 +1,88 @@
+"""Structured game events fanned out to live subscribers."""
+
+import itertools
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class GameEvent:
+    """A single state change such as ``unit_moved`` or ``vp_scored``."""
+
+    kind: str
+    data: dict = field(default_factory=dict)
+    seq: int = 0
+
+    def to_dict(self):
+        return {"seq": self.seq, "kind": self.kind, **self.data}
+
+
+class Subscription:
+    """Bounded per-client event queue.
+
+    When the queue is full the oldest event is dropped, so a slow client
+    never blocks the publisher; ``dropped`` counts how many were lost.
+    """
+
+    def __init__(self, maxsize):
+        self._queue = deque(maxlen=maxsize)
+        self._ready = threading.Condition()
+        self.dropped = 0
+        self.closed = False
+
+    def push(self, event):
+        with self._ready:
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+            self._queue.append(event)
+            self._ready.notify()
+
+    def get(self, timeout=None):
+        """Return all queued events, waiting up to ``timeout`` for one."""
+        with self._ready:
+            if not self._queue and not self.closed:
+                self._ready.wait(timeout)
+            events = list(self._queue)
+            self._queue.clear()
+            return events
+
+    def close(self):
+        with self._ready:
+            self.closed = True
+            self._ready.notify_all()
+
+
+class EventStream:
+    """Publish game events to any number of subscribers."""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._seq = itertools.count(1)
+
+    def subscribe(self, maxsize=None):
+        sub = Subscription(maxsize or self.maxsize)
+        with self._lock:
+            self._subscribers.append(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            if sub in self._subscribers:
+                self._subscribers.remove(sub)
+        sub.close()
+
+    @property
+    def has_subscribers(self):
+        return bool(self._subscribers)
+
+    def publish(self, kind, **data):
+        """Send an event to every subscriber and return it."""
+        event = GameEvent(kind, data, next(self._seq))
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            sub.push(event)
+        return event
@@ -1,11 +1,13 @@
 """Base factory for building faction forces."""
 
 try:  # pragma: no cover - allow running as a script
+    from ..model_store import ModelStore
     from ..units import Unit
 except ImportError:  # fallback when executed directly
     import os
     import sys
     sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+    from game_logic.model_store import ModelStore
     from game_logic.units import Unit
 
 class FactionFactory:
@@ -14,6 +16,8 @@ class FactionFactory:
 
     def create_force(self, team):
         force = []
+        store = ModelStore(sum(config["num_models"] * config.get("count", 1)
+                               for config in self.unit_definitions.values()))
         for unit_name, config in self.unit_definitions.items():
             count = config.get("count", 1)
             for i in range(count):
@@ -24,7 +28,8 @@ class FactionFactory:
                     team=team,
                     num_models=config["num_models"],
                     control_score=config.get("control_score", 1),
-                    unit_data=config
+                    unit_data=config,
+                    store=store,
                 )
                 unit.attacks = config.get("attacks", [])
                 force.append(unit)
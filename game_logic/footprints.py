@@ -0,0 +1,100 @@
+"""Base footprints and the squares where they fit.
+
+A base covers a ``w`` x ``h`` block of squares anchored at its top-left
+corner (one square per half inch). The free-anchor mask of a base size
+marks every anchor where that block lies on the board and clear of
+terrain, objectives and units, so checking a placement is one lookup.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def footprint_size(base_width, base_height):
+    """Return the ``(width, height)`` in tiles covered by a base."""
+    return int(round(base_width / 0.5)), int(round(base_height / 0.5))
+
+
+@lru_cache(maxsize=None)
+def footprint_offsets(w, h):
+    """Offsets from the anchor of every square a ``w`` x ``h`` base covers."""
+    return tuple((dx, dy) for dx in range(w) for dy in range(h))
+
+
+def shift_mask(mask, dx, dy):
+    """Return ``out`` with ``out[y, x] == mask[y + dy, x + dx]``, False
+    where that falls off the board."""
+    h, w = mask.shape
+    out = np.zeros((h, w), dtype=bool)
+    out[max(-dy, 0):h - max(dy, 0), max(-dx, 0):w - max(dx, 0)] = \
+        mask[max(dy, 0):h + min(dy, 0), max(dx, 0):w + min(dx, 0)]
+    return out
+
+
+def free_anchor_mask(blocked, w, h):
+    """Squares where a ``w`` x ``h`` base anchored at its top-left corner is
+    on the board and clear of ``blocked``."""
+    height, width = blocked.shape
+    out = np.zeros((height, width), dtype=bool)
+    if w > width or h > height:
+        return out
+    sat = np.zeros((height + 1, width + 1), dtype=np.int32)
+    sat[1:, 1:] = blocked.cumsum(axis=0).cumsum(axis=1)
+    counts = sat[h:, w:] - sat[:-h, w:] - sat[h:, :-w] + sat[:-h, :-w]
+    out[:height - h + 1, :width - w + 1] = counts == 0
+    return out
+
+
+class FreeAnchorCache:
+    """Free-anchor masks of a board, per base size and ignored unit.
+
+    Masks are built on first use and dropped when the board's ``version``
+    changes, so a burst of checks against the same position (placing a
+    unit, validating a move, sweeping reachable squares) shares them.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self._version = None
+        self._blocked = {}
+        self._masks = {}
+
+    def _sync(self):
+        if self._version != self.board.version:
+            self._version = self.board.version
+            self._blocked.clear()
+            self._masks.clear()
+
+    def blocked(self, ignore_uid=0):
+        """Squares holding terrain, an objective or a unit other than
+        ``ignore_uid``."""
+        self._sync()
+        plane = self._blocked.get(ignore_uid)
+        if plane is None:
+            board = self.board
+            units = board.unit_plane != 0
+            if ignore_uid:
+                units &= board.unit_plane != ignore_uid
+            plane = self._blocked[ignore_uid] = board.terrain_plane | board.objective_plane | units
+        return plane
+
+    def mask(self, w, h, ignore_unit=None):
+        """Free-anchor mask for a ``w`` x ``h`` base, indexed ``[y, x]``.
+
+        Squares held by ``ignore_unit`` count as free.
+        """
+        self._sync()
+        uid = 0 if ignore_unit is None else self.board._unit_ids.get(id(ignore_unit), 0)
+        key = (w, h, uid)
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = self._masks[key] = free_anchor_mask(self.blocked(uid), w, h)
+        return mask
+
+    def fits(self, x, y, w, h, ignore_unit=None):
+        """Return True if a ``w`` x ``h`` base fits with its anchor on ``(x, y)``."""
+        if not (0 <= x < self.board.width and 0 <= y < self.board.height):
+            return False
+        return bool(self.mask(w, h, ignore_unit)[y, x])
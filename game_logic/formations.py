@@ -0,0 +1,193 @@
+"""Formation templates and fitting a unit's models around its leader.
+
+A template lists, per model, the offset of its central square from the
+leader's. Templates depend only on the formation, model count,
+orientation and base size, so each is built once and shared as a tuple.
+
+:func:`fit_formation` lays a unit out on an actual board: models whose
+template slot is blocked take the nearest free square that keeps them
+in coherency with the models already placed.
+"""
+
+import math
+from functools import lru_cache
+
+import numpy as np
+
+from game_logic.distance_fields import add_sources
+from game_logic.footprints import footprint_size, free_anchor_mask
+from game_logic.terrain import generate_spiral_offsets
+
+# Models are coherent when their bases are within 1" (2 squares).
+COHERENCY = 2
+
+
+@lru_cache(maxsize=None)
+def _spiral(radius):
+    return tuple(generate_spiral_offsets(radius=radius))
+
+
+def _triangle_offsets(num, orientation, base_width=1.0, base_height=1.0):
+    """Offsets for a triangle formation behind the leader."""
+    offsets = [(0, 0)]
+    placed = 1
+    row = 2
+
+    x_step = math.ceil(base_width / 0.5)
+    y_step = math.ceil(base_height / 0.5)
+    y = -orientation * y_step
+    while placed < num:
+        start_x = -round((row - 1) / 2 * x_step)
+        for i in range(row):
+            if placed >= num:
+                break
+            offsets.append((start_x + i * x_step, y))
+
+            placed += 1
+        row += 1
+        y -= orientation * y_step
+    return offsets
+
+
+def _rectangle_offsets(num, orientation, base_width=1.0, base_height=1.0):
+    """Offsets for a simple rectangular block behind the leader."""
+    offsets = [(0, 0)]
+    cols = math.ceil(math.sqrt(num))
+    rows = math.ceil(num / cols)
+
+    x_step = math.ceil(base_width / 0.5)
+    y_step = math.ceil(base_height / 0.5)
+
+    placed = 1
+    for r in range(rows):
+        if placed >= num:
+            break
+        y = -(r + 1) * orientation * y_step
+
+        start_x = -round((cols - 1) / 2 * x_step)
+        for c in range(cols):
+            if placed >= num:
+                break
+            offsets.append((start_x + c * x_step, y))
+
+            placed += 1
+    return offsets
+
+
+def _circle_offsets(num, orientation, base_width=1.0, base_height=1.0):
+    """Offsets spreading models in a semicircle behind the leader."""
+    offsets = [(0, 0)]
+    spiral = _spiral(6)
+
+    x_step = math.ceil(base_width / 0.5)
+    y_step = math.ceil(base_height / 0.5)
+
+    for dx, dy in spiral[1:]:
+        if len(offsets) >= num:
+            break
+        if -orientation * dy >= 0:
+            offsets.append((dx * x_step, dy * y_step))
+    for dx, dy in spiral[1:]:
+        if len(offsets) >= num:
+            break
+        if -orientation * dy < 0:
+            offsets.append((dx * x_step, dy * y_step))
+    return offsets[:num]
+
+
+_BUILDERS = {"box": _rectangle_offsets, "circle": _circle_offsets, "triangle": _triangle_offsets}
+
+
+def formation_kind(formation):
+    """Return the template name (``"box"``, ``"circle"`` or ``"triangle"``)
+    for a formation as typed by the player; anything else is a triangle."""
+    formation = (formation or "triangle").lower()
+    if formation.startswith("box") or formation.startswith("rect"):
+        return "box"
+    if formation.startswith("circle"):
+        return "circle"
+    return "triangle"
+
+
+@lru_cache(maxsize=None)
+def _template(kind, num_models, orientation, base_width, base_height):
+    return tuple(_BUILDERS[kind](num_models, orientation, base_width, base_height))
+
+
+def formation_offsets(
+    formation,
+    num_models,
+    orientation,
+    base_width=1.0,
+    base_height=1.0,
+):
+    """Return the cached offsets of ``formation`` as a tuple of ``(dx, dy)``."""
+    return _template(formation_kind(formation), num_models, orientation, float(base_width), float(base_height))
+
+
+def formation_anchors(unit, offsets):
+    """Return each model's top-left anchor relative to the leader's central
+    square when ``unit`` stands in the formation ``offsets``.
+
+    Matches laying the models out with ``center_model_on_square`` and
+    then ``center_unit_on_leader_square``.
+    """
+    anchors = []
+    for model, (dx, dy) in zip(unit.models, offsets):
+        cx, cy = model.get_central_square()
+        anchors.append((dx - offsets[0][0] - (cx - model.x), dy - offsets[0][1] - (cy - model.y)))
+    return anchors
+
+
+def unit_orientation(unit):
+    """Return 1 if ``unit``'s models stand above (north of) its leader,
+    else -1, matching the ``orientation`` of the formation templates."""
+    leader_y = unit.models[0].y
+    behind = sum(m.y - leader_y for m in unit.models[1:])
+    return 1 if behind < 0 else -1
+
+
+def fit_formation(board, unit, x, y, formation="box", orientation=1, ignore_unit=None):
+    """Return top-left anchors ``[(x, y), ...]`` laying ``unit`` out in
+    ``formation`` with the leader's central square at ``(x, y)``.
+
+    Squares held by ``ignore_unit`` count as free. A model whose template
+    slot is blocked takes the nearest free anchor within ``COHERENCY`` of
+    a model already placed. Returns None when the leader does not fit or
+    a model has nowhere coherent to go.
+    """
+    offsets = formation_offsets(formation, len(unit.models), orientation, unit.base_width, unit.base_height)
+    height, width = board.height, board.width
+    taken = np.zeros((height, width), dtype=bool)
+    # squared distance to the nearest square already taken by this unit
+    near = np.full((height, width), height * height + width * width, dtype=np.int64)
+    layout = []
+    for i, (model, (ax, ay)) in enumerate(zip(unit.models, formation_anchors(unit, offsets))):
+        w, h = footprint_size(model.base_width, model.base_height)
+        sx, sy = x + ax, y + ay
+        area = (slice(max(sy, 0), max(sy + h, 0)), slice(max(sx, 0), max(sx + w, 0)))
+        fits = (board.anchors.fits(sx, sy, w, h, ignore_unit) and not taken[area].any()
+                and (i == 0 or (near[area] <= COHERENCY ** 2).any()))
+        if not fits:
+            if i == 0:
+                return None
+            free = (board.anchors.mask(w, h, ignore_unit)
+                    & free_anchor_mask(taken, w, h)
+                    & ~free_anchor_mask(near <= COHERENCY ** 2, w, h))
+            ys, xs = np.nonzero(free)
+            if not len(xs):
+                return None
+            best = int(np.argmin((xs - sx) ** 2 + (ys - sy) ** 2))
+            sx, sy = int(xs[best]), int(ys[best])
+            area = (slice(sy, sy + h), slice(sx, sx + w))
+        taken[area] = True
+        add_sources(near, [(sx + dx, sy + dy) for dx in range(w) for dy in range(h)])
+        layout.append((sx, sy))
+    return layout
+
+
+def apply_layout(unit, layout):
+    """Move the models of an unplaced ``unit`` to the anchors ``layout``."""
+    for model, (x, y) in zip(unit.models, layout):
+        model.x, model.y = x, y
+    unit.x, unit.y = layout[0]
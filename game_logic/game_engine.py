@@ -1,8 +1,15 @@
 # game_logic/game_engine.py
-import random
 import math
+import time
+from numbers import Integral
+from collections import defaultdict
+from contextlib import contextmanager
 from game_logic.board import Board
+from game_logic.events import EventStream
+from game_logic.gamelog import GameLog
 from game_logic.game_state import GameState
+from game_logic.mcts import AI_ITERATIONS, MCTSPlanner
+from game_logic.rng import RandomStreams
 from game_phases import movement_phase, shooting_phase, combat_phase, charge_phase, deployment,victory_phase, hero_phase, end_phase, round_start
 from game_phases.deployment import (
     choose_faction, list_factions, roll_off, choose_battlefield,
@@ -10,164 +17,350 @@ from game_phases.deployment import (
     get_deployment_zones, deploy_terrain, deploy_units, load_faction_force
 )
 
+# Phases a side acts in during a stepped turn, and the action each accepts.
+STEP_PHASES = ("movement", "shooting", "charge", "combat")
+ACTION_PHASES = {"move": "movement", "shoot": "shooting", "charge": "charge", "fight": "combat"}
+
+
+def _no_input(prompt):
+    return ""
+
+
+def _pick(items, index):
+    """Return ``items[index]`` if ``index`` is an int in range, else None."""
+    if isinstance(index, Integral) and 0 <= index < len(items):
+        return items[index]
+    return None
+
+
 class GameEngine:
-    def __init__(self):
+    def __init__(self, headless=False, policies=None, seed=None):
         self.board = Board(60, 44)
         self.game_state = GameState(self.board)
         self.round = 1
         self.current_priority = "player"
         self.setup_complete = False
-
-
-    def step(self, action_dict):
+        # Headless engines never pause between phases. ``policies`` maps
+        # "player"/"ai" to an object driving that side's phases (see
+        # ``game_logic.simulation``); sides without a policy use the
+        # interactive player or built-in AI phase functions.
+        self.headless = headless
+        self.policies = dict(policies or {})
+        self.phase_times = defaultdict(float)
+        # Every random draw of the game comes from these streams (see
+        # ``game_logic.rng``); ``seed`` makes the whole game reproducible.
+        self.rng = RandomStreams(seed)
+        self.board.rng = self.rng
+        # The built-in AI searches from the "ai" stream; a seeded game bounds
+        # each search by iterations instead of time so it replays identically.
+        self.board.planner = (MCTSPlanner() if seed is None
+                              else MCTSPlanner(time_budget=None, max_iterations=AI_ITERATIONS))
+        # Live spectators subscribe here; the board publishes into it too.
+        self.events = EventStream()
+        self.board.events = self.events
+        # Game messages from the phases and the board. Interactive games keep
+        # them in ``game_state.messages``; headless ones format nothing unless
+        # a sink subscribes.
+        self.log = GameLog()
+        self.board.log = self.log
+        if not headless:
+            self.log.subscribe(self.game_state.log_message)
+        # units that already acted in the current phase of a stepped turn
+        self._acted = set()
+
+    def _set_phase(self, phase):
+        self.game_state.phase = phase
+        self.events.publish("phase_changed", phase=phase, round=self.game_state.round,
+                            team=self.game_state.current_turn_team)
+
+    @contextmanager
+    def _log_to(self, log):
+        """Yield the log a call should write to.
+
+        ``None`` means the engine's :attr:`log`. Any other callable, such as
+        ``print``, is subscribed to it as a text sink for the duration of
+        the call, so board messages reach it too.
         """
-        Takes a single action:
-        - movement
-        - shooting
-        - charging
-        - etc.
+        if log is None or isinstance(log, GameLog):
+            yield self.log if log is None else log
+            return
+        added = not self.log.subscribed(log)
+        if added:
+            self.log.subscribe(log)
+        try:
+            yield self.log
+        finally:
+            if added:
+                self.log.unsubscribe(log)
+
+    def team_number(self, side):
+        """Return the board team number (1 or 2) that ``side`` is playing."""
+        units = self.game_state.units.get(side)
+        if units:
+            return units[0].team
+        return 1 if side == 'player' else 2
+
+    @contextmanager
+    def _timed(self, phase):
+        """Accumulate wall time spent in ``phase`` into ``phase_times``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_times[phase] += time.perf_counter() - start
+
+
+    def begin_turn(self, team, log=None):
+        """Start a turn for ``team`` that is played through :meth:`step`."""
+        with self._log_to(log) as log:
+            self.game_state.current_turn_team = team
+            self.board.update_objective_control()
+            self._acted = set()
+            self._set_phase("movement")
+
+    def step(self, action_dict, log=None):
+        """Apply a single action for the side whose turn it is.
+
+        ``action_dict["type"]`` is one of ``move``, ``shoot``, ``charge``,
+        ``fight`` or ``pass``. Other keys are ``unit`` (index into the acting
+        side's units), ``x``/``y`` (destination for move and charge) and
+        ``target`` (index into the enemy units for shoot and fight).
+
+        Actions must match the current phase and each unit acts at most once
+        per phase. ``pass`` ends the phase; passing in combat lets the enemy's
+        remaining units fight and then runs the end and victory phases.
+        Returns True if the action was applied.
         """
-        phase = action_dict["phase"]
-        if phase == "movement":
-            movement_phase.player_movement_phase(self.board, self.game_state.player_units, action_dict)
-        elif phase == "shooting":
-            shooting_phase.player_shooting_phase(self.board, ...)
-        # Add more phases as needed
-
-        return self.game_state.to_grid_dict()
+        with self._log_to(log) as log:
+            team = self.game_state.current_turn_team
+            phase = self.game_state.phase
+            kind = action_dict.get("type", "pass")
+            if phase not in STEP_PHASES:
+                return False
+            if kind == "pass":
+                if phase == "combat":
+                    with self._timed("combat"):
+                        self._fight_back(team, log)
+                    self._finish_turn(team, _no_input, log)
+                else:
+                    self._acted = set()
+                    self._set_phase(STEP_PHASES[STEP_PHASES.index(phase) + 1])
+                return True
+            if ACTION_PHASES.get(kind) != phase:
+                return False
+
+            own_units = self.game_state.units[team]
+            enemy_units = self.game_state.units['ai' if team == 'player' else 'player']
+            unit = _pick(own_units, action_dict.get("unit", 0))
+            if unit is None or not unit.models or id(unit) in self._acted:
+                return False
+            x, y = action_dict.get("x", unit.x), action_dict.get("y", unit.y)
+            target = _pick(enemy_units, action_dict.get("target", 0))
+
+            with self._timed(phase):
+                if kind == "move":
+                    applied = movement_phase.move_unit_to(unit, self.board, x, y, unit.move_range, log)
+                elif kind == "charge":
+                    applied = charge_phase.is_near_enemy(unit, self.board)
+                    if applied:
+                        roll = self.rng.dice("charge").roll_2d6()
+                        log.emit("charge_roll", "Rolled a charge distance of {roll} inches.",
+                                 unit=unit.name, roll=roll)
+                        charge_phase.attempt_charge(unit, self.board, x, y, roll, log)
+                elif target is None or not target.models:
+                    applied = False
+                elif kind == "shoot":
+                    applied = (bool(unit.ranged_attacks)
+                               and shooting_phase.is_valid_shooting_target(unit, target, self.board)
+                               and shooting_phase.resolve_ranged_attacks(unit, target, self.board, log))
+                else:
+                    applied = combat_phase.fight(self.board, unit, enemy_units, target, log)
+
+            if applied:
+                self._acted.add(id(unit))
+            return applied
+
+    def _fight_back(self, team, log):
+        """Let the enemy's units in combat fight the nearest unit of ``team``."""
+        targets = self.game_state.units[team]
+        for unit in self.game_state.units['ai' if team == 'player' else 'player']:
+            if unit.models and combat_phase.get_eligible_combat_units([unit], self.board):
+                target, _ = combat_phase._nearest_enemy(unit, targets)
+                if target:
+                    combat_phase.fight(self.board, unit, targets, target, log)
 
     def advance_round(self):
         self.round += 1
         self.board.update_objective_control()
         # Possibly roll for new priority
 
-    def run_turn(self, team, get_input=input, log=print):
+    def run_turn(self, team, get_input=input, log=None):
         """Run all phases for the given team."""
-        self.game_state.current_turn_team = team
-
-        log(f"\n-- {'Player' if team == 'player' else 'AI'} Turn --")
-        log("\n[Start of Round Objective Check]")
-        self.board.update_objective_control()
-        self.board.display_objective_status()
-
-        def _pause(next_phase: str) -> None:
-            """Pause until the player is ready to proceed to the given phase."""
-            prompt = f"\nPress Enter to begin the {next_phase.capitalize()} Phase..."
-            get_input(prompt)
-
-        self.game_state.phase = "movement"
-        if team == 'player':
-            movement_phase.player_movement_phase(self.board, self.game_state.units['player'], get_input, log)
-        else:
-            movement_phase.ai_movement_phase(self.board, self.game_state.units['ai'], get_input, log)
-
-        _pause("shooting")
-
-        self.game_state.phase = "shooting"
-        if team == 'player':
-            shooting_phase.player_shooting_phase(self.board, self.game_state.units['player'], self.game_state.units['ai'], get_input, log)
-
-        _pause("charge")
-
-        self.game_state.phase = "charge"
-        if team == 'player':
-            charge_phase.charge_phase(self.board, self.game_state.units['player'], get_input, log)
-        else:
-            charge_phase.ai_charge_phase(self.board, self.game_state.units['ai'], self.game_state.units['player'], get_input, log)
-
-        _pause("combat")
-
-        self.game_state.phase = "combat"
-        current_team_num = 1 if team == 'player' else 2
-        combat_phase.combat_phase(self.board, current_team=current_team_num,
-                                  player_units=self.game_state.units['player'],
-                                  ai_units=self.game_state.units['ai'],
-                                  get_input=get_input, log=log)
-
-        _pause("end")
-
-        self.game_state.phase = "end"
-        end_units = self.game_state.units['player'] if team == 'player' else self.game_state.units['ai']
-        victory_phase.process_end_phase_actions(self.board, end_units, get_input, log)
-
-        log("\n[End of Round Objective Check]")
-        self.board.update_objective_control()
-        self.board.display_objective_status()
-
-        _pause("victory")
-
-        self.game_state.phase = "victory"
-        scoring_team = 1 if team == 'player' else 2
-        victory_phase.calculate_victory_points(self.board, self.game_state.total_vp, scoring_team, get_input, log)
+        with self._log_to(log) as log:
+            self.game_state.current_turn_team = team
+            other = 'ai' if team == 'player' else 'player'
+            policy = self.policies.get(team)
+            own_units = self.game_state.units[team]
+            enemy_units = self.game_state.units[other]
+
+            log.emit("turn_started", "\n-- {side} Turn --", side='Player' if team == 'player' else 'AI')
+            log("\n[Start of Round Objective Check]")
+            self.board.update_objective_control()
+            self.board.display_objective_status()
+
+            def _pause(next_phase: str) -> None:
+                """Pause until the player is ready to proceed to the given phase."""
+                if self.headless:
+                    return
+                prompt = f"\nPress Enter to begin the {next_phase.capitalize()} Phase..."
+                get_input(prompt)
+
+            self._set_phase("movement")
+            with self._timed("movement"):
+                if policy is not None:
+                    policy.movement_phase(self.board, own_units, enemy_units, log)
+                elif team == 'player':
+                    movement_phase.player_movement_phase(self.board, own_units, get_input, log)
+                else:
+                    movement_phase.ai_movement_phase(self.board, own_units, get_input, log)
+
+            _pause("shooting")
+
+            self._set_phase("shooting")
+            with self._timed("shooting"):
+                if policy is not None:
+                    policy.shooting_phase(self.board, own_units, enemy_units, log)
+                elif team == 'player':
+                    shooting_phase.player_shooting_phase(self.board, own_units, enemy_units, get_input, log)
+
+            _pause("charge")
+
+            self._set_phase("charge")
+            with self._timed("charge"):
+                if policy is not None:
+                    policy.charge_phase(self.board, own_units, enemy_units, log)
+                elif team == 'player':
+                    charge_phase.charge_phase(self.board, own_units, get_input, log)
+                else:
+                    charge_phase.ai_charge_phase(self.board, own_units, enemy_units, get_input, log)
+
+            _pause("combat")
+
+            self._set_phase("combat")
+            # combat_phase numbers the sides, not the board teams: 1 is the
+            # player's units (who are prompted), 2 the AI's
+            with self._timed("combat"):
+                combat_phase.combat_phase(self.board, current_team=1 if team == 'player' else 2,
+                                          player_units=self.game_state.units['player'],
+                                          ai_units=self.game_state.units['ai'],
+                                          get_input=get_input, log=log)
+
+            _pause("end")
+
+            self._finish_turn(team, get_input, log, _pause)
+
+    def _finish_turn(self, team, get_input, log, pause=None):
+        """Run the end and victory phases for ``team``."""
+        own_units = self.game_state.units[team]
+
+        self._set_phase("end")
+        with self._timed("end"):
+            victory_phase.process_end_phase_actions(self.board, own_units, get_input, log)
+
+            log("\n[End of Round Objective Check]")
+            self.board.update_objective_control()
+            self.board.display_objective_status()
+
+        if pause:
+            pause("victory")
+
+        self._set_phase("victory")
+        scoring_team = self.team_number(team)
+        with self._timed("victory"):
+            before = self.game_state.total_vp[scoring_team]
+            victory_phase.calculate_victory_points(self.board, self.game_state.total_vp, scoring_team, get_input, log)
+            self.events.publish("vp_scored", team=scoring_team,
+                                vp=self.game_state.total_vp[scoring_team] - before,
+                                total=self.game_state.total_vp[scoring_team])
 
         # Prepare for next turn
-        self.game_state.phase = "hero"
+        self._set_phase("hero")
 
-    def run_round(self, get_input=input, log=print):
-        """Run a full round for both teams."""
-        log(f"\n=== Round {self.game_state.round} Begins ===")
-
-        if self.game_state.round > 1:
+    def roll_priority(self, get_input=input, log=None):
+        """Roll off to decide who takes the first turn of the round."""
+        with self._log_to(log) as log:
             log("\nRolling off for priority...")
-            player_roll = random.randint(1, 6)
-            ai_roll = random.randint(1, 6)
-            log(f"You rolled a {player_roll}, AI rolled a {ai_roll}")
+            dice = self.rng.dice("priority")
+            player_roll = dice.d6()
+            ai_roll = dice.d6()
+            log.emit("priority_roll", "You rolled a {player}, AI rolled a {ai}", player=player_roll, ai=ai_roll)
 
             if player_roll > ai_roll:
                 choice = get_input("You win the roll-off. Go first or second? (first/second): ").strip().lower()
                 self.game_state.current_priority = 'player' if choice == 'first' else 'ai'
             elif ai_roll > player_roll:
-                self.game_state.current_priority = random.choice(['player', 'ai'])
-                log(f"AI wins the roll-off and chooses to go {'first' if self.game_state.current_priority == 'ai' else 'second'}.")
+                self.game_state.current_priority = dice.choice(['player', 'ai'])
+                log.emit("priority_choice", "AI wins the roll-off and chooses to go {order}.",
+                         order='first' if self.game_state.current_priority == 'ai' else 'second')
             else:
                 log("It's a tie! Player retains priority.")
 
-        first = self.game_state.current_priority
-        second = 'ai' if first == 'player' else 'player'
-
-        self.run_turn(first, get_input, log)
-        self.run_turn(second, get_input, log)
+    def run_round(self, get_input=input, log=None):
+        """Run a full round for both teams."""
+        with self._log_to(log) as log:
+            log.emit("round_started", "\n=== Round {round} Begins ===", round=self.game_state.round)
 
-        self.game_state.round += 1
+            if self.game_state.round > 1:
+                self.roll_priority(get_input, log)
 
-    def deployment_phase(self, get_input=input, log=print):
-        """Run the deployment phase."""
-        run_deployment_phase(self.game_state, self.board, get_input, log)
+            first = self.game_state.current_priority
+            second = 'ai' if first == 'player' else 'player'
 
-    def run_game(self, rounds=4, get_input=input, log=print):
-        """Run a complete game via the CLI interface."""
-        log("Welcome to Spearhead: Skirmish for the Realms!")
-        log("==============================================")
-        log("The battlefield awaits your command.\n")
+            self.run_turn(first, get_input, log)
+            self.run_turn(second, get_input, log)
 
-        run_deployment_phase(self.game_state, self.board, get_input, log)
+            self.game_state.round += 1
 
-        for _ in range(1, rounds + 1):
-            self.run_round(get_input, log)
+    def deployment_phase(self, get_input=input, log=None):
+        """Run the deployment phase."""
+        with self._log_to(log) as log:
+            run_deployment_phase(self.game_state, self.board, get_input, log)
 
-        log("\n=== Game Over ===")
-        log(
-            f"Final Victory Points:\n  Player 1: {self.game_state.total_vp[1]}\n"
-            f"Player 2: {self.game_state.total_vp[2]}"
-        )
-        if self.game_state.total_vp[1] > self.game_state.total_vp[2]:
-            log(">> Player 1 wins!")
-        elif self.game_state.total_vp[2] > self.game_state.total_vp[1]:
-            log(">> Player 2 wins!")
-        else:
-            log(">> It's a tie!")
+    def run_game(self, rounds=4, get_input=input, log=None):
+        """Run a complete game via the CLI interface."""
+        with self._log_to(log) as log:
+            log("Welcome to Spearhead: Skirmish for the Realms!")
+            log("==============================================")
+            log("The battlefield awaits your command.\n")
+
+            run_deployment_phase(self.game_state, self.board, get_input, log)
+
+            for _ in range(1, rounds + 1):
+                self.run_round(get_input, log)
+
+            log("\n=== Game Over ===")
+            log(
+                f"Final Victory Points:\n  Player 1: {self.game_state.total_vp[1]}\n"
+                f"Player 2: {self.game_state.total_vp[2]}"
+            )
+            if self.game_state.total_vp[1] > self.game_state.total_vp[2]:
+                log(">> Player 1 wins!")
+            elif self.game_state.total_vp[2] > self.game_state.total_vp[1]:
+                log(">> Player 2 wins!")
+            else:
+                log(">> It's a tie!")
 
 
 def run_deployment_phase(game_state, board, get_input, log):
 
     # Faction Selection
     player_faction = choose_faction(get_input, log)
-    ai_faction = random.choice([f for f in list_factions() if f != player_faction])
+    ai_faction = board.rng.dice("deployment").choice([f for f in list_factions() if f != player_faction])
     log(f"You chose: {player_faction.title()}")
     log(f"AI will play: {ai_faction.title()}")
 
     # Roll-Off
-    attacker, defender = roll_off(get_input, log)
+    attacker, defender = roll_off(get_input, log, board.rng)
     log(f"{attacker.capitalize()} is the attacker, {defender} is the defender.")
 
     # Placeholder enhancement step
@@ -195,16 +388,16 @@ def run_deployment_phase(game_state, board, get_input, log):
     deploy_terrain(
         board,
         team=defender_team,
-        zone=[(x, y) for x in range(board.width) for y in range(board.height) if defender_zone(x, y)],
-        enemy_zone=[(x, y) for x in range(board.width) for y in range(board.height) if attacker_zone(x, y)],
+        zone=defender_zone,
+        enemy_zone=attacker_zone,
         get_input=get_input,
         log=log,
     )
     deploy_terrain(
         board,
         team=attacker_team,
-        zone=[(x, y) for x in range(board.width) for y in range(board.height) if attacker_zone(x, y)],
-        enemy_zone=[(x, y) for x in range(board.width) for y in range(board.height) if defender_zone(x, y)],
+        zone=attacker_zone,
+        enemy_zone=defender_zone,
         get_input=get_input,
         log=log,
     )
@@ -231,7 +424,7 @@ def run_deployment_phase(game_state, board, get_input, log):
         choice = get_input("Do you want to go first or second? (first/second): ").strip().lower()
         first = "player" if choice == "first" else "ai"
     else:
-        first = random.choice(["ai", "player"])
+        first = board.rng.dice("priority").choice(["ai", "player"])
         log(f"AI chooses {first} to go first.")
 
     game_state.phase = "hero"
@@ -1,6 +1,43 @@
 # game_logic/game_state.py
+from functools import lru_cache
+
 import numpy as np
 
+from game_logic.board import footprint_size
+
+CHANNEL_KEYS = [
+    "terrain",
+    "objective",
+    "control1",
+    "control2",
+    "team1",
+    "team2",
+    "leader1",
+    "leader2",
+    "center",
+    "move_range",
+    "control_score",
+]
+_TERRAIN, _OBJECTIVE, _CONTROL1, _CONTROL2, _TEAM1, _TEAM2, _LEADER1, _LEADER2, \
+    _CENTER, _MOVE_RANGE, _CONTROL_SCORE = range(len(CHANNEL_KEYS))
+
+
+@lru_cache(maxsize=None)
+def _display_kernel(width_tiles, height_tiles):
+    """Elliptical base mask ``[dy, dx]`` and centre offset for a footprint.
+
+    Matches ``Model.get_display_squares`` and ``Model.get_central_square``.
+    """
+    dy, dx = np.mgrid[0:height_tiles, 0:width_tiles]
+    rx = width_tiles / 2.0
+    ry = height_tiles / 2.0
+    mask = ((dx + 0.5 - rx) ** 2) / (rx ** 2) + ((dy + 0.5 - ry) ** 2) / (ry ** 2) <= 1
+    mask.flags.writeable = False
+    cx = width_tiles // 2 - (1 if width_tiles % 2 == 0 else 0)
+    cy = height_tiles // 2 - (1 if height_tiles % 2 == 0 else 0)
+    return mask, (cx, cy)
+
+
 class GameState:
     def __init__(self, board):
         self.board = board
@@ -23,6 +60,12 @@ class GameState:
 
         self.messages = []
 
+        # Persistent observation buffer and what it was last built from.
+        self._tensor = None
+        self._tensor_version = None
+        self._tensor_terrain = None
+        self._tensor_objectives = None
+
     def to_grid_dict(self):
         grid = {}
 
@@ -81,28 +124,83 @@ class GameState:
 
         return grid
 
-    def to_tensor(self):
-        grid_dict = self.to_grid_dict()
-        channel_keys = [
-            "terrain",
-            "objective",
-            "control1",
-            "control2",
-            "team1",
-            "team2",
-            "leader1",
-            "leader2",
-            "center",
-            "move_range",
-            "control_score",
-        ]
-        tensor = np.zeros((len(channel_keys), self.height, self.width), dtype=np.float32)
-
-        for (x, y), features in grid_dict.items():
-            for i, key in enumerate(channel_keys):
-                tensor[i, y, x] = features.get(key, 0)
-
-        return tensor
+    def to_tensor(self, copy=True):
+        """Return the ``len(CHANNEL_KEYS) x height x width`` observation.
+
+        The tensor is kept between calls and only the channels affected by
+        board changes since the previous call are rewritten. Pass
+        ``copy=False`` to get the internal buffer itself, which is
+        overwritten by later calls.
+        """
+        board = self.board
+        full = self._tensor is None
+        if full:
+            self._tensor = np.zeros((len(CHANNEL_KEYS), self.height, self.width), dtype=np.float32)
+        tensor = self._tensor
+
+        terrain_key = (id(self.terrain), len(self.terrain))
+        if full or self._tensor_terrain != terrain_key:
+            tensor[_TERRAIN] = 0
+            if self.terrain:
+                tx, ty = np.array(self.terrain).T
+                inside = (tx >= 0) & (tx < self.width) & (ty >= 0) & (ty < self.height)
+                tensor[_TERRAIN, ty[inside], tx[inside]] = 1
+            self._tensor_terrain = terrain_key
+
+        objectives = tuple((obj.x, obj.y, obj.control_team) for obj in self.objectives)
+        if full or objectives != self._tensor_objectives:
+            tensor[_OBJECTIVE:_CONTROL2 + 1] = 0
+            for x, y, team in objectives:
+                if 0 <= x < self.width and 0 <= y < self.height:
+                    tensor[_OBJECTIVE, y, x] = 1
+                    if team == 1:
+                        tensor[_CONTROL1, y, x] = 1
+                    elif team == 2:
+                        tensor[_CONTROL2, y, x] = 1
+            self._tensor_objectives = objectives
+
+        if full or board.version != self._tensor_version:
+            tiles = None if full else board.changed_tiles(self._tensor_version)
+            if tiles is None:
+                self._write_unit_channels(0, 0, self.width, self.height)
+            elif tiles:
+                xs = [x for x, _ in tiles]
+                ys = [y for _, y in tiles]
+                self._write_unit_channels(min(xs), min(ys), max(xs) + 1, max(ys) + 1)
+            self._tensor_version = board.version
+
+        return tensor.copy() if copy else tensor
+
+    def _write_unit_channels(self, x0, y0, x1, y1):
+        """Rebuild the unit channels inside the box ``[x0, x1) x [y0, y1)``.
+
+        Models are stamped in board order so overlapping bases resolve the
+        same way as ``to_grid_dict``.
+        """
+        tensor = self._tensor
+        tensor[_TEAM1:, y0:y1, x0:x1] = 0
+        for unit in self.board.units:
+            team_ch, leader_ch = (_TEAM1, _LEADER1) if unit.team == 1 else (_TEAM2, _LEADER2)
+            move_range = unit.move_range / 12  # Normalize max 12"
+            control_score = unit.control_score / 5  # Assume max 5
+            for i, model in enumerate(unit.models):
+                w, h = footprint_size(model.base_width, model.base_height)
+                left, top = max(model.x, x0), max(model.y, y0)
+                right, bottom = min(model.x + w, x1), min(model.y + h, y1)
+                if left >= right or top >= bottom:
+                    continue
+                kernel, (cx, cy) = _display_kernel(w, h)
+                mask = kernel[top - model.y:bottom - model.y, left - model.x:right - model.x]
+                area = (slice(top, bottom), slice(left, right))
+                tensor[team_ch][area][mask] = 1
+                if i == 0:
+                    tensor[leader_ch][area][mask] = 1
+                tensor[_MOVE_RANGE][area][mask] = move_range
+                tensor[_CONTROL_SCORE][area][mask] = control_score
+                center_x, center_y = model.x + cx, model.y + cy
+                if (left <= center_x < right and top <= center_y < bottom
+                        and kernel[cy, cx]):
+                    tensor[_CENTER, center_y, center_x] = 1
 
     def log_message(self, msg: str):
         self.messages.append(msg)
@@ -0,0 +1,92 @@
+"""Structured game log: typed records with levels, formatted on demand.
+
+Game code emits :class:`LogRecord` s through a :class:`GameLog` rather than
+printing. A record keeps its message template and fields separately and is
+only turned into text when a subscribed sink asks for text, so headless
+games with nobody listening skip the formatting entirely.
+
+Plain ``log(message)`` calls still work: a ``GameLog`` is callable, and
+:func:`as_log` wraps any ``log`` callable (``print``, a list's ``append``)
+as a text sink.
+"""
+
+from dataclasses import dataclass, field
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+
+
+@dataclass(frozen=True)
+class LogRecord:
+    """One log entry such as ``model_slain`` or ``unit_moved``."""
+
+    kind: str
+    template: str
+    fields: dict = field(default_factory=dict)
+    level: int = INFO
+
+    @property
+    def text(self):
+        return self.template.format(**self.fields) if self.fields else self.template
+
+    def to_dict(self):
+        return {"kind": self.kind, "level": self.level, "text": self.text, **self.fields}
+
+
+class GameLog:
+    """Fan log records out to subscribed sinks.
+
+    Each sink has a minimum level and receives either the formatted text
+    (``text=True``) or the :class:`LogRecord` itself.
+    """
+
+    def __init__(self):
+        self._sinks = []
+        self._level = None
+
+    def subscribe(self, sink, level=INFO, text=True):
+        self._sinks.append((level, sink, text))
+        self._level = min(lvl for lvl, _, _ in self._sinks)
+        return sink
+
+    def unsubscribe(self, sink):
+        self._sinks = [entry for entry in self._sinks if entry[1] is not sink]
+        self._level = min((lvl for lvl, _, _ in self._sinks), default=None)
+
+    def subscribed(self, sink):
+        return any(entry[1] is sink for entry in self._sinks)
+
+    def enabled(self, level=INFO):
+        """Return True if a record at ``level`` would reach any sink."""
+        return self._level is not None and level >= self._level
+
+    def emit(self, kind, template, level=INFO, **fields):
+        """Publish a record; ``template`` is ``str.format``-ed with ``fields``
+        the first time a text sink needs it."""
+        if self._level is None or level < self._level:
+            return
+        record = LogRecord(kind, template, fields, level)
+        text = None
+        for min_level, sink, wants_text in self._sinks:
+            if level < min_level:
+                continue
+            if wants_text:
+                if text is None:
+                    text = record.text
+                sink(text)
+            else:
+                sink(record)
+
+    def __call__(self, message, level=INFO):
+        self.emit("message", message, level)
+
+
+def as_log(log):
+    """Return ``log`` as a :class:`GameLog`; ``None`` gives a silent one."""
+    if isinstance(log, GameLog):
+        return log
+    game_log = GameLog()
+    if log is not None:
+        game_log.subscribe(log)
+    return game_log
@@ -0,0 +1,89 @@
+"""Vectorised line-of-sight checks with a per-board-version cache."""
+
+import numpy as np
+
+
+def _ceil_div(a, b):
+    return -((-a) // b)
+
+
+def rays_clear(blocked, x0, y0, x1, y1):
+    """Return a bool array telling which rays ``(x0, y0) -> (x1, y1)`` are clear.
+
+    Rays follow exactly the tiles produced by ``Board.get_path`` and, like
+    ``Board.is_path_clear``, ignore the start and end tiles. ``blocked`` is a
+    ``[y, x]`` boolean plane; all arguments after it are equal-length
+    integer arrays.
+    """
+    x0, y0, x1, y1 = (np.asarray(a, dtype=np.int64).ravel() for a in (x0, y0, x1, y1))
+    dx = np.abs(x1 - x0)
+    dy = np.abs(y1 - y0)
+    sx = np.where(x0 > x1, -1, 1)
+    sy = np.where(y0 > y1, -1, 1)
+    steps = np.maximum(dx, dy)
+    if steps.size == 0 or steps.max() < 2:
+        return np.ones(steps.shape, dtype=bool)
+
+    # interior steps 1 .. steps-1 of every ray, padded to the longest ray
+    i = np.arange(1, steps.max())[None, :]
+    valid = i < steps[:, None]
+    x_major = (dx > dy)[:, None]
+    major = np.where(x_major, dx[:, None], dy[:, None])
+    minor = np.where(x_major, dy[:, None], dx[:, None])
+    # number of minor-axis steps taken before the i-th tile is appended
+    k = np.maximum(0, _ceil_div(2 * i * minor - major, 2 * np.maximum(major, 1)))
+    xs = np.where(x_major, x0[:, None] + i * sx[:, None], x0[:, None] + k * sx[:, None])
+    ys = np.where(x_major, y0[:, None] + k * sy[:, None], y0[:, None] + i * sy[:, None])
+
+    height, width = blocked.shape
+    xs = np.where(valid, xs, 0) % width
+    ys = np.where(valid, ys, 0) % height
+    hits = blocked[ys, xs] & valid
+    return ~hits.any(axis=1)
+
+
+class LineOfSightCache:
+    """Cache model-to-model visibility for one board.
+
+    Results are keyed by ray end points and dropped whenever the board's
+    occupancy ``version`` changes, so visibility is computed at most once per
+    position between terrain or model changes.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self._version = None
+        self._blocked = None
+        self._rays = {}
+
+    def _sync(self):
+        if self._version != self.board.version:
+            self._version = self.board.version
+            self._blocked = self.board.blocking_plane()
+            self._rays.clear()
+
+    def is_clear(self, x0, y0, x1, y1):
+        return bool(self.rays_clear([x0], [y0], [x1], [y1])[0])
+
+    def rays_clear(self, x0, y0, x1, y1):
+        """Vectorised, cached equivalent of ``Board.is_path_clear``."""
+        self._sync()
+        keys = list(zip(np.asarray(x0).tolist(), np.asarray(y0).tolist(),
+                        np.asarray(x1).tolist(), np.asarray(y1).tolist()))
+        missing = [key for key in dict.fromkeys(keys) if key not in self._rays]
+        if missing:
+            cols = np.array(missing).T
+            for key, clear in zip(missing, rays_clear(self._blocked, *cols).tolist()):
+                self._rays[key] = clear
+        return np.array([self._rays[key] for key in keys], dtype=bool)
+
+    def visibility(self, models_a, models_b):
+        """Return a ``len(models_a) x len(models_b)`` visibility matrix."""
+        ax = np.array([m.x for m in models_a], dtype=np.int64)
+        ay = np.array([m.y for m in models_a], dtype=np.int64)
+        bx = np.array([m.x for m in models_b], dtype=np.int64)
+        by = np.array([m.y for m in models_b], dtype=np.int64)
+        grid_ax, grid_bx = np.meshgrid(ax, bx, indexing="ij")
+        grid_ay, grid_by = np.meshgrid(ay, by, indexing="ij")
+        clear = self.rays_clear(grid_ax.ravel(), grid_ay.ravel(), grid_bx.ravel(), grid_by.ravel())
+        return clear.reshape(len(models_a), len(models_b))
@@ -0,0 +1,351 @@
+"""Monte Carlo tree search planner for the AI's movement and charges.
+
+A turn is a sequence of decisions, one per unit: first where each unit
+moves, then where it charges. Every search iteration rewinds the board with
+``Board.snapshot``/``restore``, follows the tree with UCT, plays the
+remaining decisions at random and scores the resulting position. Charge
+rolls are sampled on every iteration, so each action's value is its
+expectation over the dice.
+
+The budget for each decision is a wall-clock ``time_budget`` (seconds),
+a ``max_iterations`` count, or both. The subtree below each chosen action
+is kept for the next decision, including across the movement and charge
+phases of the same turn.
+"""
+
+import contextlib
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game_logic.damage_calc import unit_attack_distribution
+from game_logic.dice import DiceEngine
+from game_logic.footprints import footprint_size
+from game_logic.units import is_in_combat
+
+# Charges may target enemies up to 12" (24 tiles) away.
+CHARGE_REACH = 24
+# Search iterations per decision for a reproducible (seeded) AI.
+AI_ITERATIONS = 32
+# Weight of expected melee casualties relative to one objective.
+COMBAT_WEIGHT = 0.5
+
+
+class _Node:
+    __slots__ = ("actions", "children", "visits", "value")
+
+    def __init__(self):
+        self.actions = None  # candidate actions, built on the first visit
+        self.children = {}
+        self.visits = 0
+        self.value = 0.0
+
+
+def move_candidates(board, unit, limit, rng):
+    """Leader destinations worth trying for ``unit``'s normal move.
+
+    ``None`` (hold position) comes first, followed by steps towards each
+    objective and the nearest enemy, a step away from it and random offsets.
+    """
+    if not unit.models:
+        return [None]
+    reach = unit.move_range
+    x0, y0 = unit.x, unit.y
+    goals = [(obj.x, obj.y) for obj in board.objectives]
+    nearest, _, dist = board.model_index.nearest(x0, y0, exclude_team=unit.team)
+    if nearest is not None and dist > 0:
+        goals.append((nearest.x, nearest.y))
+        goals.append((2 * x0 - nearest.x, 2 * y0 - nearest.y))
+
+    points = []
+    for gx, gy in goals:
+        dx, dy = gx - x0, gy - y0
+        length = math.hypot(dx, dy)
+        if length == 0:
+            continue
+        step = min(reach, length)
+        points.append((x0 + int(round(dx / length * step)), y0 + int(round(dy / length * step))))
+    while len(points) < limit * 2:
+        angle = rng.uniform(0, 2 * math.pi)
+        step = rng.uniform(reach / 2, reach)
+        points.append((x0 + int(round(math.cos(angle) * step)), y0 + int(round(math.sin(angle) * step))))
+
+    candidates = [None]
+    for x, y in points:
+        if len(candidates) > limit:
+            break
+        if ((x, y) in candidates or (x, y) == (x0, y0)
+                or not (0 <= x < board.width and 0 <= y < board.height)
+                or math.hypot(x - x0, y - y0) > reach
+                or is_in_combat(x, y, board, unit.team)):
+            continue
+        candidates.append((x, y))
+    return candidates
+
+
+def charge_candidates(board, unit, limit):
+    """Leader destinations that put ``unit`` in base contact with an enemy.
+
+    One destination is tried per enemy unit in reach: the side of its
+    nearest model closest to the charging leader. ``None`` declines.
+    """
+    candidates = [None]
+    if not unit.models:
+        return candidates
+    leader = unit.models[0]
+    w, h = footprint_size(leader.base_width, leader.base_height)
+    targets = board.model_index.within(unit.x, unit.y, CHARGE_REACH, exclude_team=unit.team)
+    seen = set()
+    for model, enemy, _ in sorted(targets, key=lambda t: t[2]):
+        if id(enemy) in seen:
+            continue
+        seen.add(id(enemy))
+        ew, eh = footprint_size(model.base_width, model.base_height)
+        mx, my = model.x, model.y
+        sides = [(mx - w, my), (mx + ew, my), (mx, my - h), (mx, my + eh)]
+        best = min(sides, key=lambda p: math.hypot(p[0] - unit.x, p[1] - unit.y))
+        if best not in candidates:
+            candidates.append(best)
+        if len(candidates) > limit:
+            break
+    return candidates
+
+
+def _apply(board, kind, unit, action, dice):
+    """Play ``action`` for ``unit`` on ``board`` during a simulation."""
+    if action is None or not unit.models:
+        return
+    x, y = action
+    if kind == "move":
+        if not is_in_combat(x, y, board, unit.team):
+            board.move_unit(unit, x, y)
+    else:
+        roll = int(dice.roll_expr("2D6")[0])
+        if math.hypot(x - unit.x, y - unit.y) <= roll * 2:
+            board.charge_unit(unit, x, y)
+
+
+def evaluate(board, team):
+    """Score the position for ``team``, roughly in ``[-1, 1]``.
+
+    Each objective counts +1 if held and -1 if held by the enemy; expected
+    melee casualties of units in base contact add a smaller term.
+    """
+    board.update_objective_control()
+    score = 0.0
+    for obj in board.objectives:
+        if obj.control_team == team:
+            score += 1
+        elif obj.control_team is not None:
+            score -= 1
+
+    for unit in board.units:
+        if not unit.models or not unit.melee_weapons or not board.in_base_contact(unit):
+            continue
+        _, enemy, _ = board.model_index.nearest(unit.x, unit.y, exclude_team=unit.team)
+        if enemy is None:
+            continue
+        slain = unit_attack_distribution(unit, enemy).expected_slain / max(len(enemy.models), 1)
+        score += COMBAT_WEIGHT * (slain if unit.team == team else -slain)
+    return score / max(len(board.objectives), 1)
+
+
+@contextlib.contextmanager
+def _simulating(board):
+    """Silence the board's log and spectators, and keep any undo log the
+    caller is recording, while playing hypotheticals."""
+    events, board.events = board.events, None
+    log, board.log = board.log, None
+    undo, board._undo = board._undo, None
+    try:
+        yield
+    finally:
+        board.events = events
+        board.log = log
+        board._undo = undo
+
+
+class MCTSPlanner:
+    """Choose AI moves and charges by Monte Carlo tree search.
+
+    ``time_budget`` (seconds) and ``max_iterations`` bound the search for
+    each decision; whichever is reached first stops it. With only
+    ``max_iterations`` the planner is deterministic for a given ``seed``
+    (or state of the board's ``"ai"`` random stream). ``workers`` above one runs independent
+    searches in a process pool and sums their root statistics; the tree is
+    then rebuilt for each decision.
+    """
+
+    def __init__(self, time_budget=0.2, max_iterations=None, exploration=1.4,
+                 candidates=6, workers=None, seed=None):
+        if time_budget is None and max_iterations is None:
+            raise ValueError("MCTSPlanner needs a time_budget or max_iterations")
+        self.time_budget = time_budget
+        self.max_iterations = max_iterations
+        self.exploration = exploration
+        self.candidates = candidates
+        self.workers = workers
+        self.seed = seed
+        self.last_iterations = 0
+        self._pool = None
+        self._root = None
+        self._resume = None
+
+    def __getstate__(self):
+        # The worker pool and search tree belong to this process's game.
+        state = self.__dict__.copy()
+        state["_pool"] = state["_root"] = state["_resume"] = None
+        return state
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    # -- search ---------------------------------------------------------
+
+    def _candidates(self, board, kind, unit, rng):
+        if kind == "move":
+            return move_candidates(board, unit, self.candidates, rng)
+        return charge_candidates(board, unit, self.candidates)
+
+    def _select(self, node):
+        log_n = math.log(node.visits)
+        return max(
+            node.children.items(),
+            key=lambda item: (item[1].value / item[1].visits
+                              + self.exploration * math.sqrt(log_n / item[1].visits)),
+        )
+
+    def _iterate(self, board, team, decisions, root, rng, dice):
+        path = [root]
+        node = root
+        depth = 0
+        while depth < len(decisions):
+            kind, unit = decisions[depth]
+            if node.actions is None:
+                node.actions = self._candidates(board, kind, unit, rng)
+            untried = [a for a in node.actions if a not in node.children]
+            if untried:
+                action = rng.choice(untried)
+                child = node.children[action] = _Node()
+            else:
+                action, child = self._select(node)
+            _apply(board, kind, unit, action, dice)
+            path.append(child)
+            node = child
+            depth += 1
+            if untried:
+                break
+
+        for kind, unit in decisions[depth:]:
+            action = rng.choice(self._candidates(board, kind, unit, rng))
+            _apply(board, kind, unit, action, dice)
+
+        value = evaluate(board, team)
+        for visited in path:
+            visited.visits += 1
+            visited.value += value
+
+    def _search(self, board, team, decisions, root, rng):
+        dice = DiceEngine(rng.getrandbits(64))
+        deadline = None if self.time_budget is None else time.perf_counter() + self.time_budget
+        snap = board.snapshot()
+        iterations = 0
+        with _simulating(board):
+            try:
+                while ((self.max_iterations is None or iterations < self.max_iterations)
+                       and (deadline is None or time.perf_counter() < deadline or not iterations)):
+                    self._iterate(board, team, decisions, root, rng, dice)
+                    board.restore(snap)
+                    iterations += 1
+            finally:
+                board.restore(snap)
+        self.last_iterations = iterations
+        return root
+
+    def _root_stats(self, board, team, decisions, rng):
+        """Return ``{action: (visits, value)}`` for the first decision."""
+        if not self.workers or self.workers <= 1:
+            if self._root is None:
+                self._root = _Node()
+            root = self._search(board, team, decisions, self._root, rng)
+            return {a: (c.visits, c.value) for a, c in root.children.items()}
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        spec = [(kind, board.units.index(unit)) for kind, unit in decisions]
+        settings = (self.time_budget, self.max_iterations, self.exploration, self.candidates)
+        futures = [
+            self._pool.submit(_search_worker, board, team, spec, settings, rng.getrandbits(64))
+            for _ in range(self.workers)
+        ]
+        totals = {}
+        for future in futures:
+            for action, (visits, value) in future.result().items():
+                v, q = totals.get(action, (0, 0.0))
+                totals[action] = (v + visits, q + value)
+        self._root = None
+        return totals
+
+    def _plan(self, board, team, decisions):
+        seed = self.seed
+        if seed is None:
+            seed = int(board.rng.stream("ai").integers(2**63))
+        rng = random.Random(seed)
+        for i in range(len(decisions)):
+            remaining = decisions[i:]
+            stats = self._root_stats(board, team, remaining, rng)
+            action = max(stats, key=lambda a: (stats[a][0], stats[a][1]), default=None)
+            yield remaining[0][1], action
+            if self._root is not None:
+                self._root = self._root.children.get(action)
+        self._root = None
+
+    # -- turn API -------------------------------------------------------
+
+    def plan_movement(self, board, units):
+        """Yield ``(unit, destination)`` for each of ``units`` in turn.
+
+        The caller applies each move before taking the next one; a
+        destination of ``None`` means hold position. The search keeps the
+        subtree for the following charge phase.
+        """
+        units = [u for u in units if u.models]
+        if not units:
+            return
+        team = units[0].team
+        decisions = [("move", u) for u in units] + [("charge", u) for u in units]
+        self._root = None
+        plan = self._plan(board, team, decisions)
+        for _ in units:
+            yield next(plan)
+        self._resume = (plan, board, board.version, units)
+
+    def plan_charges(self, board, units):
+        """Yield ``(unit, destination)`` charges for ``units``.
+
+        Continues the tree built during movement when nothing else has
+        changed on the board since; ``None`` declines to charge.
+        """
+        units = [u for u in units if u.models]
+        resume, self._resume = self._resume, None
+        if resume is not None:
+            plan, resume_board, version, planned = resume
+            if resume_board is board and version == board.version and planned == units:
+                yield from plan
+                return
+        if not units:
+            return
+        self._root = None
+        yield from self._plan(board, units[0].team, [("charge", u) for u in units])
+
+
+def _search_worker(board, team, spec, settings, seed):
+    time_budget, max_iterations, exploration, candidates = settings
+    planner = MCTSPlanner(time_budget, max_iterations, exploration, candidates)
+    decisions = [(kind, board.units[i]) for kind, i in spec]
+    root = planner._search(board, team, decisions, _Node(), random.Random(seed))
+    return {a: (c.visits, c.value) for a, c in root.children.items()}
+
@@ -0,0 +1,77 @@
+"""Struct-of-arrays storage for models.
+
+An army keeps the state of all its models in one set of NumPy arrays:
+position, health, base size, owning unit and an alive flag, one row per
+model. :class:`~game_logic.units.Model` objects are thin views onto a
+row, so per-model code keeps working while whole-army questions, such
+as the distance between two units, become array operations.
+"""
+
+import numpy as np
+
+_COLUMNS = {
+    "x": np.int32,
+    "y": np.int32,
+    "health": np.int32,
+    "max_health": np.int32,
+    "base_width": np.float64,
+    "base_height": np.float64,
+    "unit_id": np.int32,
+    "alive": np.bool_,
+}
+
+
+class ModelStore:
+    """Growable per-army arrays of model state.
+
+    Columns are full-capacity arrays; only the first ``size`` rows hold
+    models. Rows are never reused, so a model's row stays valid for the
+    life of the store.
+    """
+
+    __slots__ = ("size", "unit_count") + tuple(_COLUMNS)
+
+    def __init__(self, capacity=8):
+        self.size = 0
+        self.unit_count = 0
+        for name, dtype in _COLUMNS.items():
+            setattr(self, name, np.zeros(max(capacity, 1), dtype=dtype))
+
+    def __len__(self):
+        return self.size
+
+    def _grow(self):
+        for name in _COLUMNS:
+            old = getattr(self, name)
+            new = np.zeros(len(old) * 2, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def new_unit(self):
+        """Return a fresh unit id for this store."""
+        self.unit_count += 1
+        return self.unit_count - 1
+
+    def add(self, x, y, max_health=1, base_width=1.0, base_height=1.0, unit_id=-1):
+        """Add a model at full health and return its row."""
+        if self.size == len(self.x):
+            self._grow()
+        row = self.size
+        self.size += 1
+        self.x[row], self.y[row] = x, y
+        self.health[row] = self.max_health[row] = max_health
+        self.base_width[row], self.base_height[row] = base_width, base_height
+        self.unit_id[row] = unit_id
+        self.alive[row] = max_health > 0
+        return row
+
+    def state(self):
+        """Copy of the positions and health, for :meth:`restore`."""
+        n = self.size
+        return self.x[:n].copy(), self.y[:n].copy(), self.health[:n].copy()
+
+    def restore(self, state):
+        x, y, health = state
+        n = len(x)
+        self.x[:n], self.y[:n], self.health[:n] = x, y, health
+        self.alive[:n] = health > 0
@@ -1,5 +1,8 @@
 import math
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+# Models within 6" (12 tiles) of an objective contribute to its control.
+CONTROL_RANGE = 12
 
 
 @dataclass
@@ -7,29 +10,64 @@ class Objective:
     x: int
     y: int
     control_team: int | None = None
+    # Running per-team control totals maintained by ``Board``.
+    control_scores: dict = field(default_factory=dict, compare=False, repr=False)
+
+    def get_control_team(self, units, index=None):
+        """Return the team controlling this objective, or None if contested.
 
-    def get_control_team(self, units):
+        When a :class:`~game_logic.spatial_index.ModelIndex` covering
+        ``units`` is supplied only models in nearby buckets are examined.
+        """
         control_player_1 = 0
         control_player_2 = 0
 
-        for unit in units:
-            for model in unit.models:
-                distance = math.sqrt((model.x - self.x)**2 + (model.y - self.y)**2)
-                if distance <= 12:  # 6 inches in 0.5" tiles
-                    if unit.team == 1:
-                        control_player_1 += unit.control_score
-                    elif unit.team == 2:
-                        control_player_2 += unit.control_score
+        if index is not None:
+            nearby = [unit for _, unit, _ in index.within(self.x, self.y, CONTROL_RANGE, units=units)]
+        else:
+            nearby = [
+                unit
+                for unit in units
+                for model in unit.models
+                if math.sqrt((model.x - self.x)**2 + (model.y - self.y)**2) <= CONTROL_RANGE
+            ]
+
+        for unit in nearby:
+            if unit.team == 1:
+                control_player_1 += unit.control_score
+            elif unit.team == 2:
+                control_player_2 += unit.control_score
+
+        return self._leading_team(control_player_1, control_player_2)
 
-        if control_player_1 > control_player_2:
+    @staticmethod
+    def _leading_team(score_1, score_2):
+        if score_1 > score_2:
             return 1
-        elif control_player_2 > control_player_1:
+        elif score_2 > score_1:
             return 2
         else:
             return None
 
-    def update_control(self, units):
-        current_team = self.get_control_team(units)
+    def tallied_control_team(self, deltas=None):
+        """Return the leading team according to ``control_scores``.
+
+        ``deltas`` optionally adjusts the tallies for a hypothetical change
+        without modifying them.
+        """
+        deltas = deltas or {}
+        return self._leading_team(
+            self.control_scores.get(1, 0) + deltas.get(1, 0),
+            self.control_scores.get(2, 0) + deltas.get(2, 0),
+        )
+
+    def update_control(self, units, index=None):
+        self._apply_control(self.get_control_team(units, index))
+
+    def update_control_from_scores(self):
+        self._apply_control(self.tallied_control_team())
+
+    def _apply_control(self, current_team):
         if current_team is not None and current_team != self.control_team:
             self.control_team = current_team
 
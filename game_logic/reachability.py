@@ -0,0 +1,173 @@
+"""Where a unit can move: a shortest-path sweep over its footprint.
+
+A destination is the square the unit's leader ends on; every other model
+keeps its offset from the leader. A leader square is open when each
+model's base fits on free squares there and the leader stays out of the
+3" zone around enemy models (as ``is_in_combat`` checks). Distances are
+measured along steps in the 16 compass directions used for typed moves,
+so a move only reaches around terrain and units if the detour is within
+range.
+"""
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from game_logic.footprints import footprint_size
+
+# Normal moves may not come within 3" (6 tiles) of an enemy model.
+ENEMY_EXCLUSION = 6
+
+
+def _step(dx, dy):
+    # knight-like steps must also clear the two squares they cut across
+    if abs(dx) == 2 or abs(dy) == 2:
+        sx, sy = (dx > 0) - (dx < 0), (dy > 0) - (dy < 0)
+        via = ((sx, 0), (sx, sy)) if abs(dx) == 2 else ((0, sy), (sx, sy))
+    else:
+        via = ()
+    return dx, dy, math.hypot(dx, dy), via
+
+
+STEPS = tuple(
+    _step(dx, dy)
+    for dx in range(-2, 3) for dy in range(-2, 3)
+    if (dx, dy) != (0, 0) and {abs(dx), abs(dy)} in ({0, 1}, {1}, {1, 2})
+)
+
+
+def shift(array, dx, dy, fill):
+    """Return ``out`` with ``out[y, x] = array[y - dy, x - dx]``."""
+    out = np.full_like(array, fill)
+    h, w = array.shape
+    if abs(dx) >= w or abs(dy) >= h:
+        return out
+    out[max(dy, 0):h + min(dy, 0), max(dx, 0):w + min(dx, 0)] = \
+        array[max(-dy, 0):h + min(-dy, 0), max(-dx, 0):w + min(-dx, 0)]
+    return out
+
+
+def leader_mask(board, unit):
+    """Leader squares where every model of ``unit`` fits on the board."""
+    valid = np.ones((board.height, board.width), dtype=bool)
+    for m in unit.models:
+        w, h = footprint_size(m.base_width, m.base_height)
+        valid &= shift(board.anchors.mask(w, h, ignore_unit=unit), unit.x - m.x, unit.y - m.y, False)
+    return valid
+
+
+def enemy_exclusion(board, team):
+    """Squares within 3" of an enemy of ``team`` (``is_in_combat``)."""
+    zone = np.zeros((board.height, board.width), dtype=bool)
+    r = ENEMY_EXCLUSION
+    dy, dx = np.mgrid[-r:r + 1, -r:r + 1]
+    disk = np.hypot(dx, dy) < r
+    for unit in board.units:
+        if unit.team == team:
+            continue
+        for m in unit.models:
+            x0, y0 = m.x - r, m.y - r
+            top, left = max(y0, 0), max(x0, 0)
+            bottom, right = min(m.y + r + 1, board.height), min(m.x + r + 1, board.width)
+            if top < bottom and left < right:
+                zone[top:bottom, left:right] |= disk[top - y0:bottom - y0, left - x0:right - x0]
+    return zone
+
+
+@dataclass(frozen=True)
+class Reach:
+    """Leader squares a unit can reach, indexed ``[y, x]``."""
+
+    origin: tuple
+    move_range: float
+    distance: np.ndarray
+    parent: np.ndarray
+
+    @property
+    def mask(self):
+        return np.isfinite(self.distance)
+
+    def __contains__(self, tile):
+        x, y = tile
+        h, w = self.distance.shape
+        return 0 <= x < w and 0 <= y < h and bool(np.isfinite(self.distance[y, x]))
+
+    def tiles(self):
+        ys, xs = np.nonzero(self.mask)
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    def path_to(self, x, y):
+        """Leader squares from the origin to ``(x, y)``, or None if unreachable."""
+        if (x, y) not in self:
+            return None
+        path = [(x, y)]
+        while (x, y) != self.origin:
+            dx, dy, _, _ = STEPS[self.parent[y, x]]
+            x, y = x - dx, y - dy
+            path.append((x, y))
+        path.reverse()
+        return path
+
+
+def compute_reach(board, unit, move_range):
+    """Sweep every destination within ``move_range`` tiles of ``unit``."""
+    open_ = leader_mask(board, unit) & ~enemy_exclusion(board, unit.team)
+
+    origin = (unit.x, unit.y)
+    distance = np.full((board.height, board.width), np.inf)
+    parent = np.full((board.height, board.width), -1, dtype=np.int8)
+    if not (0 <= unit.x < board.width and 0 <= unit.y < board.height):
+        return Reach(origin, move_range, distance, parent)
+
+    # only squares within ``move_range`` of the origin can be reached
+    r = int(math.floor(move_range))
+    top, left = max(unit.y - r, 0), max(unit.x - r, 0)
+    window = (slice(top, min(unit.y + r + 1, board.height)),
+              slice(left, min(unit.x + r + 1, board.width)))
+    open_ = open_[window]
+    dist = distance[window]
+    par = parent[window]
+    dist[unit.y - top, unit.x - left] = 0.0
+
+    # squares each step may land on: open, with any squares it cuts across
+    # (relative to the landing square) open as well
+    landing = []
+    for dx, dy, cost, via in STEPS:
+        ok = open_.copy()
+        for vx, vy in via:
+            ok &= shift(open_, dx - vx, dy - vy, False)
+        landing.append(ok)
+
+    # relax until no distance improves; each pass extends paths by one step
+    changed = True
+    while changed:
+        changed = False
+        for k, (dx, dy, cost, _) in enumerate(STEPS):
+            candidate = shift(dist, dx, dy, np.inf) + cost
+            better = landing[k] & (candidate < dist - 1e-9) & (candidate <= move_range + 1e-9)
+            if better.any():
+                dist[better] = candidate[better]
+                par[better] = k
+                changed = True
+    return Reach(origin, move_range, distance, parent)
+
+
+class ReachabilityCache:
+    """Cache :class:`Reach` results until the board's ``version`` changes."""
+
+    def __init__(self, board):
+        self.board = board
+        self._version = None
+        self._reach = {}
+
+    def get(self, unit, move_range=None):
+        if self._version != self.board.version:
+            self._version = self.board.version
+            self._reach.clear()
+        move_range = unit.move_range if move_range is None else move_range
+        key = (id(unit), unit.x, unit.y, move_range)
+        reach = self._reach.get(key)
+        if reach is None:
+            reach = self._reach[key] = compute_reach(self.board, unit, move_range)
+        return reach
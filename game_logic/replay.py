@@ -0,0 +1,343 @@
+"""Compact binary game replays and deterministic re-simulation.
+
+A replay file is ``MAGIC`` followed by length-prefixed records, written in
+order as the game is played:
+
+* ``HEADER``: seed, factions, rounds, battlefield choices and how each side
+  was driven (JSON).
+* ``TURN``: the round, turn (1 or 2) and side about to play, plus a
+  zlib-compressed keyframe of the position at that point.
+* ``INPUT``: one answer to a prompt, tagged with the side asked.
+* ``RESULT``: the final score (JSON).
+
+Games recorded with :func:`~game_logic.simulation.simulate_game` reseed
+their random streams at every turn
+(:func:`~game_logic.simulation.seed_turn`), so any turn can be rebuilt from
+its keyframe and the inputs after it, without replaying the turns before. A four-round game takes around 2 KB.
+"""
+
+import json
+import struct
+import zlib
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from game_logic.game_engine import GameEngine
+from game_logic.mcts import MCTSPlanner
+from game_logic.simulation import (
+    AIPolicy, Policy, game_result, play_turn, run_headless_deployment, seed_turn,
+)
+
+MAGIC = b"SPRP\x01"
+
+HEADER = 1
+TURN = 2
+INPUT = 3
+RESULT = 4
+
+_RECORD = struct.Struct("<IB")  # payload length, record type
+_TURN = struct.Struct("<HBB")  # round, turn, side
+SIDES = ("player", "ai")
+
+
+def _policy_spec(policy):
+    if isinstance(policy, AIPolicy):
+        planner = policy.planner
+        if not isinstance(planner, MCTSPlanner) or planner.time_budget is not None:
+            raise ValueError("Only iteration-bounded MCTS AI can be replayed")
+        return {"type": "ai", "iterations": planner.max_iterations,
+                "exploration": planner.exploration, "candidates": planner.candidates,
+                "seed": planner.seed}
+    return {"type": "input"}
+
+
+def _policy_from_spec(spec):
+    if spec["type"] == "ai":
+        return AIPolicy(MCTSPlanner(time_budget=None, max_iterations=spec["iterations"],
+                                    exploration=spec["exploration"],
+                                    candidates=spec["candidates"], seed=spec["seed"]))
+    return Policy()
+
+
+# -- keyframes ------------------------------------------------------------
+
+def capture_keyframe(engine, roster):
+    """Encode the position of ``engine`` as compressed bytes.
+
+    ``roster`` lists every unit with the models it was deployed with, so
+    slain models are stored with zero health.
+    """
+    state = engine.game_state
+    values = [state.round, SIDES.index(state.current_priority),
+              state.total_vp[1], state.total_vp[2], len(engine.board.objectives)]
+    values += [obj.control_team or 0 for obj in engine.board.objectives]
+    for unit, models in roster:
+        alive = {id(model) for model in unit.models}
+        values += [unit.x, unit.y, int(bool(getattr(unit, "has_run", False)))]
+        for model in models:
+            if id(model) in alive:
+                values += [model.x, model.y, model.current_health]
+            else:
+                values += [0, 0, 0]
+    return zlib.compress(np.array(values, dtype=np.int16).tobytes(), 9)
+
+
+def apply_keyframe(engine, roster, data):
+    """Restore a position saved by :func:`capture_keyframe` onto an engine
+    deployed from the same seed."""
+    values = iter(np.frombuffer(zlib.decompress(data), dtype=np.int16).tolist())
+    state, board = engine.game_state, engine.board
+    state.round = next(values)
+    state.current_priority = SIDES[next(values)]
+    state.total_vp[1] = next(values)
+    state.total_vp[2] = next(values)
+    controls = [next(values) or None for _ in range(next(values))]
+
+    placements = []
+    for unit, models in roster:
+        unit_x, unit_y, unit.has_run = next(values), next(values), bool(next(values))
+        surviving = []
+        for model in models:
+            x, y, health = next(values), next(values), next(values)
+            if health > 0:
+                surviving.append((model, x, y, health))
+        placements.append((unit, surviving, unit_x, unit_y))
+    board.load_positions(placements)
+    board.update_objective_control()
+    for obj, team in zip(board.objectives, controls):
+        obj.control_team = team
+    state.turn_order = [state.current_priority,
+                        "ai" if state.current_priority == "player" else "player"]
+
+
+# -- writing --------------------------------------------------------------
+
+class ReplayWriter:
+    """Append the records of one game to ``path`` as it is played.
+
+    Every record is flushed as it is written, so an interrupted game still
+    leaves a readable prefix. ``keyframe_every`` stores a keyframe on every
+    n-th turn.
+    """
+
+    def __init__(self, path, keyframe_every=1):
+        self.path = path
+        self.keyframe_every = keyframe_every
+        self._file = None
+        self._turns = 0
+        self._roster = None
+        self._wrapped = []
+
+    def _write(self, kind, payload):
+        self._file.write(_RECORD.pack(len(payload), kind))
+        self._file.write(payload)
+        self._file.flush()
+
+    def start(self, engine, seed, factions, rounds, battlefield=None, deployment_map=None):
+        """Open the file, write the header and start recording every side's
+        inputs.
+
+        Raises ValueError, before anything is written, if a side cannot be
+        replayed or both sides share one policy object (its answers could
+        not be told apart).
+        """
+        policies = [engine.policies[side] for side in SIDES]
+        if policies[0] is policies[1]:
+            raise ValueError("Each side needs its own policy to be replayed")
+        header = {
+            "seed": seed, "factions": list(factions), "rounds": rounds,
+            "battlefield": battlefield, "deployment_map": deployment_map,
+            "policies": {side: _policy_spec(policy) for side, policy in zip(SIDES, policies)},
+        }
+        self._file = open(self.path, "wb")
+        self._file.write(MAGIC)
+        self._write(HEADER, json.dumps(header, separators=(",", ":")).encode())
+        for side, policy in zip(SIDES, policies):
+            self._wrapped.append((policy, policy.get_input))
+            policy.get_input = self._recording(side, policy.get_input)
+
+    def _recording(self, side, get_input):
+        code = bytes([SIDES.index(side)])
+
+        def get_recorded_input(prompt):
+            answer = get_input(prompt)
+            self._write(INPUT, code + str(answer).encode())
+            return answer
+
+        return get_recorded_input
+
+    def deployed(self, engine):
+        """Remember the deployed models so keyframes can mark slain ones."""
+        self._roster = [(unit, list(unit.models)) for unit in engine.board.units]
+
+    def turn(self, engine, turn, team):
+        """Mark the start of ``team``'s turn, with a keyframe when due."""
+        payload = _TURN.pack(engine.game_state.round, turn, SIDES.index(team))
+        if self._turns % self.keyframe_every == 0:
+            payload += capture_keyframe(engine, self._roster)
+        self._turns += 1
+        self._write(TURN, payload)
+
+    def finish(self, result):
+        summary = {key: result[key] for key in ("realm", "map_layout", "vp", "winner")}
+        self._write(RESULT, json.dumps(summary, separators=(",", ":")).encode())
+
+    def close(self):
+        """Stop recording, restoring each policy's ``get_input``."""
+        for policy, get_input in self._wrapped:
+            policy.get_input = get_input
+        self._wrapped = []
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# -- reading --------------------------------------------------------------
+
+@dataclass(frozen=True)
+class TurnMark:
+    round: int
+    turn: int
+    team: str
+    position: int
+    keyframe: bytes | None
+
+
+@dataclass
+class Replay:
+    """The records of a replay file; see :func:`load_replay`."""
+
+    header: dict
+    turns: list = field(default_factory=list)
+    # (record position, side, answer)
+    inputs: list = field(default_factory=list)
+    result: dict | None = None
+
+    def find_turn(self, round_number, turn=1):
+        """Return the index in :attr:`turns` of ``(round_number, turn)``."""
+        for i, mark in enumerate(self.turns):
+            if (mark.round, mark.turn) == (round_number, turn):
+                return i
+        raise ValueError(f"Turn {turn} of round {round_number} is not in this replay")
+
+    def answers(self, side, after=0):
+        """Answers given by ``side`` after record ``after``."""
+        return [text for position, s, text in self.inputs if s == side and position > after]
+
+
+def load_replay(path):
+    """Read a replay file written by :class:`ReplayWriter`."""
+    with open(path, "rb") as fh:
+        data = fh.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not a replay file")
+    offset = len(MAGIC)
+    replay = None
+    position = 0
+    while offset + _RECORD.size <= len(data):
+        length, kind = _RECORD.unpack_from(data, offset)
+        offset += _RECORD.size
+        payload = data[offset:offset + length]
+        offset += length
+        if len(payload) < length:
+            break  # truncated final record
+        position += 1
+        if kind == HEADER:
+            replay = Replay(json.loads(payload))
+        elif kind == TURN:
+            round_number, turn, side = _TURN.unpack_from(payload)
+            keyframe = payload[_TURN.size:] or None
+            replay.turns.append(TurnMark(round_number, turn, SIDES[side], position, keyframe))
+        elif kind == INPUT:
+            replay.inputs.append((position, SIDES[payload[0]], payload[1:].decode()))
+        elif kind == RESULT:
+            replay.result = json.loads(payload)
+    if replay is None:
+        raise ValueError(f"{path} has no header")
+    return replay
+
+
+# -- re-simulation --------------------------------------------------------
+
+def _deploy(replay, after):
+    """Build and deploy the recorded game, feeding each side the answers it
+    gave after record ``after``."""
+    header = replay.header
+    policies = {side: _policy_from_spec(header["policies"][side]) for side in SIDES}
+    for side, policy in policies.items():
+        answers = iter(replay.answers(side, after))
+        policy.get_input = lambda prompt, answers=answers: next(answers, "")
+    engine = GameEngine(headless=True, seed=header["seed"], policies=policies)
+    run_headless_deployment(engine, header["factions"], header["battlefield"],
+                            header["deployment_map"])
+    roster = [(unit, list(unit.models)) for unit in engine.board.units]
+    return engine, roster
+
+
+def _play(engine, replay, start, stop, resumed, on_turn=None):
+    """Play the turns ``replay.turns[start:stop]``; ``resumed`` means the
+    engine is already positioned at the start of ``turns[start]``."""
+    seed = replay.header["seed"]
+    state = engine.game_state
+    get_input = engine.policies["player"].get_input
+    for i in range(start, stop):
+        mark = replay.turns[i]
+        if mark.turn == 1 and not (resumed and i == start):
+            state.round = mark.round
+            seed_turn(engine, seed, mark.round, 0)
+            if mark.round > 1:
+                engine.roll_priority(get_input)
+        if on_turn is not None:
+            on_turn(mark)
+        play_turn(engine, seed, mark.team, mark.turn, get_input)
+        if mark.turn == 2:
+            state.round += 1
+
+
+def resimulate(replay, round_number=None, turn=1):
+    """Re-execute a recorded game from its seed and return the engine.
+
+    Without ``round_number`` the whole game is played again. Otherwise the
+    engine is returned at the start of that turn: it is restored from the
+    latest keyframe at or before the turn and only the turns in between
+    are played.
+    """
+    if round_number is None:
+        engine, _ = _deploy(replay, 0)
+        _play(engine, replay, 0, len(replay.turns), resumed=False)
+        return engine
+
+    target = replay.find_turn(round_number, turn)
+    start = next((i for i in range(target, -1, -1) if replay.turns[i].keyframe), None)
+    if start is None:
+        engine, _ = _deploy(replay, 0)
+        _play(engine, replay, 0, target, resumed=False)
+    else:
+        mark = replay.turns[start]
+        engine, roster = _deploy(replay, mark.position)
+        apply_keyframe(engine, roster, mark.keyframe)
+        _play(engine, replay, start, target, resumed=True)
+    engine.game_state.round = round_number
+    return engine
+
+
+def verify_replay(replay):
+    """Replay the whole game, checking every keyframe and the final score.
+
+    Returns a list of mismatches; an empty list means the replay re-executes
+    exactly.
+    """
+    engine, roster = _deploy(replay, 0)
+    problems = []
+
+    def check(mark):
+        if mark.keyframe and zlib.decompress(capture_keyframe(engine, roster)) != zlib.decompress(mark.keyframe):
+            problems.append(f"round {mark.round} turn {mark.turn}: position differs")
+
+    _play(engine, replay, 0, len(replay.turns), resumed=False, on_turn=check)
+    if replay.result is not None:
+        vp = game_result(engine, replay.header["seed"], replay.header["factions"])["vp"]
+        if vp != replay.result["vp"]:
+            problems.append(f"final score {vp} != recorded {replay.result['vp']}")
+    return problems
@@ -0,0 +1,118 @@
+"""Seedable random streams, one per game and subsystem.
+
+Game code does not call the ``random`` module. Each :class:`GameEngine`
+owns a :class:`RandomStreams` (shared with its board as ``board.rng``) that
+derives an independent NumPy ``Generator`` for every subsystem from one
+seed. The stream for a subsystem depends only on the seed and the
+subsystem's name, never on the order streams are requested or on the
+process, so games seeded the same way replay identically in worker
+processes.
+
+Single dice come from :class:`DiceBuffer`, which draws them in blocks;
+batched attack rolls use a :class:`~game_logic.dice.DiceEngine` on the
+``"attacks"`` stream.
+"""
+
+import zlib
+
+import numpy as np
+
+from game_logic.dice import DiceEngine
+
+# Dice with at most this many sides are drawn in blocks; larger ranges
+# (such as picking a square from a deployment zone) are drawn one at a time.
+_BUFFERED_SIDES = 64
+
+
+class DiceBuffer:
+    """Roll single dice from blocks pre-drawn from ``rng``.
+
+    Drawing ``block`` rolls per NumPy call is far cheaper than one
+    ``randint`` per die. Each die size has its own block, so rolls are
+    deterministic for a given sequence of calls.
+    """
+
+    def __init__(self, rng, block=256):
+        self.rng = rng
+        self.block = block
+        self._blocks = {}
+
+    def roll(self, sides=6):
+        """Roll one die with ``sides`` faces (1 to ``sides``)."""
+        if sides > _BUFFERED_SIDES:
+            return int(self.rng.integers(1, sides + 1))
+        rolls = self._blocks.get(sides)
+        if not rolls:
+            rolls = self._blocks[sides] = self.rng.integers(1, sides + 1, size=self.block).tolist()
+        return rolls.pop()
+
+    def d6(self):
+        return self.roll(6)
+
+    def d3(self):
+        return self.roll(3)
+
+    def roll_2d6(self):
+        return self.roll(6) + self.roll(6)
+
+    def randint(self, low, high):
+        """Return an integer in ``[low, high]`` like ``random.randint``."""
+        return low - 1 + self.roll(high - low + 1)
+
+    def choice(self, seq):
+        """Return a random element of the non-empty sequence ``seq``."""
+        return seq[self.roll(len(seq)) - 1]
+
+
+def _stream_key(name):
+    # crc32 rather than hash(): string hashes differ between processes
+    return zlib.crc32(name.encode())
+
+
+class RandomStreams:
+    """Independent random streams for one game.
+
+    ``seed`` is anything ``numpy.random.SeedSequence`` accepts: ``None``
+    for fresh OS entropy, an int, or a sequence of ints such as
+    ``(suite_seed, game_index)`` to give every game of a batch its own
+    reproducible streams.
+    """
+
+    def __init__(self, seed=None):
+        self.reseed(seed)
+
+    def reseed(self, seed):
+        """Restart every stream from ``seed``."""
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        self.seed_sequence = seed
+        self._streams = {}
+        self._dice = {}
+        self._attack_dice = None
+
+    def stream(self, name):
+        """Return the ``Generator`` for subsystem ``name``."""
+        rng = self._streams.get(name)
+        if rng is None:
+            seq = self.seed_sequence
+            child = np.random.SeedSequence(seq.entropy, spawn_key=seq.spawn_key + (_stream_key(name),))
+            rng = self._streams[name] = np.random.default_rng(child)
+        return rng
+
+    def dice(self, name):
+        """Return the :class:`DiceBuffer` for subsystem ``name``."""
+        dice = self._dice.get(name)
+        if dice is None:
+            dice = self._dice[name] = DiceBuffer(self.stream(name))
+        return dice
+
+    @property
+    def attack_dice(self):
+        """:class:`DiceEngine` for batched hit, wound, save and damage rolls."""
+        if self._attack_dice is None:
+            self._attack_dice = DiceEngine(self.stream("attacks"))
+        return self._attack_dice
+
+    def spawn(self, n):
+        """Return ``n`` independent :class:`RandomStreams` derived from this one."""
+        return [RandomStreams(seq) for seq in self.seed_sequence.spawn(n)]
@@ -0,0 +1,256 @@
+"""Headless game simulation and batch tournament runner."""
+
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+
+from game_logic.game_engine import GameEngine
+from game_logic.mcts import AI_ITERATIONS, MCTSPlanner
+from game_phases import movement_phase, shooting_phase, charge_phase
+from game_phases.deployment import (
+    get_objectives_for_battlefield, get_deployment_zones, deploy_terrain,
+    deploy_units, load_faction_force,
+)
+
+BATTLEFIELDS = ("aqshy", "ghyran")
+DEPLOYMENT_MAPS = ("straight", "diagonal")
+
+
+class Policy:
+    """Drives one side of a headless game.
+
+    The base policy runs the interactive player phases and answers every
+    prompt through :meth:`get_input`, which returns an empty string (the
+    default choice) unless overridden.
+    """
+
+    def get_input(self, prompt):
+        return ""
+
+    def movement_phase(self, board, units, enemies, log):
+        movement_phase.player_movement_phase(board, units, self.get_input, log)
+
+    def shooting_phase(self, board, units, enemies, log):
+        shooting_phase.player_shooting_phase(board, units, enemies, self.get_input, log)
+
+    def charge_phase(self, board, units, enemies, log):
+        charge_phase.charge_phase(board, units, self.get_input, log)
+
+
+class ScriptedPolicy(Policy):
+    """Answer prompts from a fixed list of responses, then with defaults."""
+
+    def __init__(self, responses=()):
+        self.responses = list(responses)
+
+    def get_input(self, prompt):
+        return self.responses.pop(0) if self.responses else ""
+
+
+class AIPolicy(Policy):
+    """Use the built-in AI behaviour for every phase.
+
+    ``planner`` defaults to an iteration-bounded :class:`MCTSPlanner` so a
+    seeded game always replays the same way.
+    """
+
+    def __init__(self, planner=None):
+        self.planner = planner or MCTSPlanner(time_budget=None, max_iterations=AI_ITERATIONS)
+
+    def movement_phase(self, board, units, enemies, log):
+        movement_phase.ai_movement_phase(board, units, self.get_input, log, self.planner)
+
+    def shooting_phase(self, board, units, enemies, log):
+        pass
+
+    def charge_phase(self, board, units, enemies, log):
+        charge_phase.ai_charge_phase(board, units, enemies, self.get_input, log, self.planner)
+
+
+def run_headless_deployment(engine, factions, battlefield=None, deployment_map=None, log=None):
+    """Deploy both forces without prompting.
+
+    The roll-off, battlefield, deployment map and first turn are chosen at
+    random unless given, and both sides place terrain and units using the
+    automatic AI placement. Messages go to ``log`` (the engine's log by
+    default).
+    """
+    game_state, board = engine.game_state, engine.board
+    with engine._log_to(log) as log:
+        player_faction, ai_faction = factions
+
+        dice = engine.rng.dice("deployment")
+        attacker, defender = dice.choice([("player", "ai"), ("ai", "player")])
+        battlefield = battlefield or dice.choice(BATTLEFIELDS)
+        deployment_map = deployment_map or dice.choice(DEPLOYMENT_MAPS)
+
+        game_state.realm = battlefield
+        board.objectives = get_objectives_for_battlefield(battlefield)
+        game_state.objectives = board.objectives
+        game_state.map_layout = deployment_map
+        defender_zone, attacker_zone = get_deployment_zones(board, deployment_map)
+        deploy_terrain(board, 1, defender_zone, attacker_zone, None, log, auto=True)
+        deploy_terrain(board, 2, attacker_zone, defender_zone, None, log, auto=True)
+
+        defender_faction = player_faction if defender == "player" else ai_faction
+        attacker_faction = ai_faction if defender == "player" else player_faction
+        defender_units = load_faction_force(defender_faction, team_number=1)
+        attacker_units = load_faction_force(attacker_faction, team_number=2)
+        deploy_units(board, defender_units, defender_zone, attacker_zone, deployment_map, "AI", None, log)
+        deploy_units(board, attacker_units, attacker_zone, defender_zone, deployment_map, "AI", None, log)
+
+        game_state.players["attacker"] = attacker
+        game_state.players["defender"] = defender
+        game_state.units[defender] = defender_units
+        game_state.units[attacker] = attacker_units
+
+        first = engine.rng.dice("priority").choice(["player", "ai"])
+        game_state.current_priority = first
+        game_state.turn_order = [first, "ai" if first == "player" else "player"]
+        game_state.phase = "hero"
+
+
+def seed_turn(engine, seed, round_number, turn):
+    """Reseed the engine's random streams for one step of a game.
+
+    Turn 0 is the start of a round (the priority roll); turns 1 and 2 are
+    the two sides' turns. Reseeding at every turn makes each turn depend
+    only on the seed and the board, so a replay can resume at any turn.
+    """
+    engine.rng.reseed((seed, round_number, turn))
+
+
+def play_turn(engine, seed, team, turn, get_input):
+    """Play ``team``'s turn (1 or 2 within the current round) from a fresh
+    RNG state and a canonical model index."""
+    engine.board.rebuild_model_index()
+    seed_turn(engine, seed, engine.game_state.round, turn)
+    engine.run_turn(team, get_input)
+
+
+def play_rounds(engine, seed, rounds, get_input, recorder=None):
+    """Play rounds until ``rounds`` have been completed.
+
+    ``recorder`` (a :class:`~game_logic.replay.ReplayWriter`) is told where
+    each turn starts so it can store a keyframe there.
+    """
+    state = engine.game_state
+    while state.round <= rounds:
+        seed_turn(engine, seed, state.round, 0)
+        if state.round > 1:
+            engine.roll_priority(get_input)
+        first = state.current_priority
+        for turn, team in enumerate([first, "ai" if first == "player" else "player"], 1):
+            if recorder is not None:
+                recorder.turn(engine, turn, team)
+            play_turn(engine, seed, team, turn, get_input)
+        state.round += 1
+
+
+def game_result(engine, seed, factions):
+    """Summarise a finished game as returned by :func:`simulate_game`."""
+    vp = {side: engine.game_state.total_vp[engine.team_number(side)] for side in ("player", "ai")}
+    if vp["player"] > vp["ai"]:
+        winner = "player"
+    elif vp["ai"] > vp["player"]:
+        winner = "ai"
+    else:
+        winner = None
+    return {
+        "seed": seed,
+        "factions": {"player": factions[0], "ai": factions[1]},
+        "realm": engine.game_state.realm,
+        "map_layout": engine.game_state.map_layout,
+        "vp": vp,
+        "winner": winner,
+        "phase_times": dict(engine.phase_times),
+    }
+
+
+def simulate_game(seed, factions, rounds=4, battlefield=None, deployment_map=None,
+                  player_policy=None, ai_policy=None, replay=None):
+    """Play one game headlessly and return a result summary.
+
+    ``factions`` is a ``(player_faction, ai_faction)`` pair. Both sides use
+    :class:`AIPolicy` unless another policy is given. Nothing subscribes to
+    the engine's log, so no messages are formatted.
+
+    ``replay`` is a path the game is recorded to (see
+    :mod:`game_logic.replay`). A ``seed`` of None draws a fresh one from OS
+    entropy; the result records it, so the game can still be replayed.
+    """
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy)
+    engine = GameEngine(headless=True, seed=seed, policies={
+        "player": player_policy or AIPolicy(),
+        "ai": ai_policy or AIPolicy(),
+    })
+    recorder = None
+    if replay is not None:
+        from game_logic.replay import ReplayWriter  # replay builds on this module
+        recorder = ReplayWriter(replay)
+
+    try:
+        if recorder is not None:
+            recorder.start(engine, seed, factions, rounds, battlefield, deployment_map)
+        get_input = engine.policies["player"].get_input
+        with engine._timed("deployment"):
+            run_headless_deployment(engine, factions, battlefield, deployment_map)
+        if recorder is not None:
+            recorder.deployed(engine)
+        play_rounds(engine, seed, rounds, get_input, recorder)
+        result = game_result(engine, seed, factions)
+        if recorder is not None:
+            recorder.finish(result)
+    finally:
+        if recorder is not None:
+            recorder.close()
+    return result
+
+
+def summarize_results(results):
+    """Aggregate per-game results into win rates, VP and timing statistics."""
+    games = len(results)
+    wins = Counter(r["winner"] or "tie" for r in results)
+    faction_wins = Counter(r["factions"][r["winner"]] for r in results if r["winner"])
+    vp_distribution = {side: Counter(r["vp"][side] for r in results) for side in ("player", "ai")}
+    phase_totals = defaultdict(float)
+    for r in results:
+        for phase, seconds in r["phase_times"].items():
+            phase_totals[phase] += seconds
+
+    return {
+        "games": games,
+        "wins": {side: wins.get(side, 0) for side in ("player", "ai", "tie")},
+        "win_rate": {side: wins.get(side, 0) / games if games else 0.0 for side in ("player", "ai", "tie")},
+        "faction_wins": dict(faction_wins),
+        "vp_distribution": {side: dict(sorted(c.items())) for side, c in vp_distribution.items()},
+        "mean_vp": {side: sum(r["vp"][side] for r in results) / games if games else 0.0
+                    for side in ("player", "ai")},
+        "phase_times": {phase: total / games for phase, total in phase_totals.items()},
+        "results": results,
+    }
+
+
+def simulate_many(n_games, factions, seeds=None, workers=None, **game_kwargs):
+    """Simulate ``n_games`` headless games and aggregate the results.
+
+    ``seeds`` defaults to ``range(n_games)``. With ``workers`` greater than
+    one the games are fanned out across a ``ProcessPoolExecutor``; extra
+    keyword arguments are passed to :func:`simulate_game` and must be
+    picklable in that case.
+    """
+    seeds = list(range(n_games) if seeds is None else seeds)[:n_games]
+    if len(seeds) < n_games:
+        raise ValueError(f"Expected {n_games} seeds, got {len(seeds)}")
+    run = partial(simulate_game, factions=tuple(factions), **game_kwargs)
+
+    if workers is None or workers <= 1:
+        results = [run(seed) for seed in seeds]
+    else:
+        chunksize = max(1, n_games // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run, seeds, chunksize=chunksize))
+    return summarize_results(results)
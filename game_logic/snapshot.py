@@ -0,0 +1,75 @@
+"""Compact board snapshots for look-ahead search."""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class BoardSnapshot:
+    """Everything ``Board.restore`` needs to rewind a board.
+
+    Units, models and objectives are kept by reference; their mutable state
+    (positions, health, control) is copied into flat arrays. Model state
+    is copied straight from the model stores, so taking a snapshot costs a
+    few array copies per army plus a copy of each plane.
+    """
+
+    planes: tuple
+    terrain_count: int
+    objectives: list
+    control_team: tuple
+    control_scores: np.ndarray
+    dirty_objectives: frozenset
+    units: tuple
+    # models of each unit, including ones slain since the snapshot
+    models: tuple
+    unit_xy: np.ndarray
+    # (store, saved state) for every model store of the units
+    stores: tuple
+
+
+def take_snapshot(board):
+    units = tuple(board.units)
+    models = tuple(tuple(unit.models) for unit in units)
+    stores = {id(m.store): m.store for unit_models in models for m in unit_models}
+    objectives = board.objectives
+    return BoardSnapshot(
+        planes=tuple(plane.copy() for plane in board.planes()),
+        terrain_count=len(board.terrain),
+        objectives=objectives,
+        control_team=tuple(obj.control_team for obj in objectives),
+        control_scores=np.array(
+            [(obj.control_scores.get(1, 0), obj.control_scores.get(2, 0)) for obj in objectives],
+            dtype=np.int64,
+        ).reshape(len(objectives), 2),
+        dirty_objectives=frozenset(board.dirty_objectives),
+        units=units,
+        models=models,
+        unit_xy=np.array([(unit.x, unit.y) for unit in units], dtype=np.int64).reshape(-1, 2),
+        stores=tuple((store, store.state()) for store in stores.values()),
+    )
+
+
+def apply_snapshot(board, snap):
+    for plane, saved in zip(board.planes(), snap.planes):
+        np.copyto(plane, saved)
+    del board.terrain[snap.terrain_count:]
+
+    if board.objectives is not snap.objectives:
+        board.objectives = snap.objectives
+    for obj, team, (score_1, score_2) in zip(snap.objectives, snap.control_team,
+                                              snap.control_scores.tolist()):
+        obj.control_team = team
+        obj.control_scores = {1: score_1, 2: score_2}
+    board.dirty_objectives = set(snap.dirty_objectives)
+
+    board.units[:] = snap.units
+    for store, state in snap.stores:
+        store.restore(state)
+    board.model_index.clear()
+    for unit, models, (ux, uy) in zip(snap.units, snap.models, snap.unit_xy.tolist()):
+        unit.x, unit.y = ux, uy
+        unit.models[:] = models
+        for model in models:
+            board.model_index.add(unit, model)
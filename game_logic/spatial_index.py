@@ -0,0 +1,218 @@
+"""Uniform-bucket spatial index for model proximity queries."""
+
+import heapq
+import math
+
+# Bucket sizes in tiles matching the common query radii (3", 6" and 12").
+DEFAULT_CELL_SIZES = (6, 12, 24)
+
+
+class ModelIndex:
+    """Bucket model positions so radius and nearest queries avoid full scans.
+
+    Positions are bucketed at several cell sizes. Radius queries use the
+    smallest level whose cells are at least as large as the radius so only a
+    3x3 block of buckets is visited. Nearest-neighbour queries expand rings of
+    buckets on the finest level until no closer model can exist.
+
+    The index is kept up to date by :class:`~game_logic.board.Board`; callers
+    that move models should go through the board rather than writing
+    ``model.x``/``model.y`` directly.
+    """
+
+    def __init__(self, cell_sizes=DEFAULT_CELL_SIZES):
+        self.cell_sizes = tuple(sorted(cell_sizes))
+        self._levels = [{} for _ in self.cell_sizes]
+        # id(model) -> [model, unit, x, y] with the position as last indexed
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, model):
+        return id(model) in self._entries
+
+    def clear(self):
+        for buckets in self._levels:
+            buckets.clear()
+        self._entries.clear()
+
+    def _bucket_add(self, key, x, y):
+        # buckets are insertion-ordered dicts rather than sets so query
+        # results, and ties between them, do not depend on object addresses
+        for size, buckets in zip(self.cell_sizes, self._levels):
+            buckets.setdefault((x // size, y // size), {})[key] = None
+
+    def _bucket_remove(self, key, x, y):
+        for size, buckets in zip(self.cell_sizes, self._levels):
+            cell = (x // size, y // size)
+            members = buckets.get(cell)
+            if members is not None:
+                members.pop(key, None)
+                if not members:
+                    del buckets[cell]
+
+    def add(self, unit, model):
+        """Index ``model`` belonging to ``unit`` at its current position."""
+        key = id(model)
+        if key in self._entries:
+            self.move(model)
+            return
+        x, y = model.x, model.y
+        self._entries[key] = [model, unit, x, y]
+        self._bucket_add(key, x, y)
+
+    def remove(self, model):
+        entry = self._entries.pop(id(model), None)
+        if entry is not None:
+            self._bucket_remove(id(model), entry[2], entry[3])
+
+    def move(self, model):
+        """Re-bucket ``model`` after its position changed."""
+        key = id(model)
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        old_x, old_y = entry[2], entry[3]
+        x, y = model.x, model.y
+        if (old_x, old_y) == (x, y):
+            return
+        self._bucket_remove(key, old_x, old_y)
+        entry[2], entry[3] = x, y
+        self._bucket_add(key, x, y)
+
+    def _matches(self, unit, team, exclude_team, units):
+        if team is not None and unit.team != team:
+            return False
+        if exclude_team is not None and unit.team == exclude_team:
+            return False
+        if units is not None and id(unit) not in units:
+            return False
+        return True
+
+    @staticmethod
+    def _unit_ids(units):
+        return None if units is None else {id(u) for u in units}
+
+    def _candidates(self, level, cells):
+        buckets = self._levels[level]
+        for cell in cells:
+            members = buckets.get(cell)
+            if members:
+                for key in members:
+                    yield self._entries[key]
+
+    def within(self, x, y, radius, team=None, exclude_team=None, units=None,
+               inclusive=True):
+        """Return ``(model, unit, distance)`` for models within ``radius`` tiles.
+
+        ``team``/``exclude_team`` restrict results by owning team and
+        ``units`` to a collection of units. With ``inclusive`` False the
+        comparison is strict (``distance < radius``).
+        """
+        level = next((i for i, size in enumerate(self.cell_sizes) if size >= radius),
+                     len(self.cell_sizes) - 1)
+        size = self.cell_sizes[level]
+        reach = max(1, math.ceil(radius / size))
+        cx, cy = x // size, y // size
+        cells = [(cx + dx, cy + dy)
+                 for dx in range(-reach, reach + 1)
+                 for dy in range(-reach, reach + 1)]
+        ids = self._unit_ids(units)
+
+        found = []
+        for model, unit, mx, my in self._candidates(level, cells):
+            if not self._matches(unit, team, exclude_team, ids):
+                continue
+            dist = math.hypot(mx - x, my - y)
+            if dist < radius or (inclusive and dist == radius):
+                found.append((model, unit, dist))
+        return found
+
+    def any_within(self, x, y, radius, team=None, exclude_team=None, units=None,
+                   inclusive=True):
+        """Return True if any matching model lies within ``radius`` tiles."""
+        return bool(self.within(x, y, radius, team, exclude_team, units, inclusive))
+
+    def enemy_pairs(self, radius, inclusive=True):
+        """Return ``(unit_a, unit_b)`` for every pair of units on different
+        teams with models within ``radius`` tiles of each other.
+
+        Each pair is reported once, from a single sweep over the buckets in
+        which every bucket is compared with itself and its forward
+        neighbours.
+        """
+        level = next((i for i, size in enumerate(self.cell_sizes) if size >= radius),
+                     len(self.cell_sizes) - 1)
+        size = self.cell_sizes[level]
+        reach = max(1, math.ceil(radius / size))
+        forward = [(dx, dy)
+                   for dx in range(0, reach + 1)
+                   for dy in range(-reach, reach + 1)
+                   if dx > 0 or dy > 0]
+        buckets = self._levels[level]
+
+        pairs = {}
+        for (cx, cy), members in buckets.items():
+            local = [self._entries[key] for key in members]
+            ahead = [self._entries[key]
+                     for dx, dy in forward
+                     for key in buckets.get((cx + dx, cy + dy), ())]
+            for i, (_, unit_a, ax, ay) in enumerate(local):
+                for _, unit_b, bx, by in local[i + 1:] + ahead:
+                    if unit_a.team == unit_b.team:
+                        continue
+                    key = (id(unit_a), id(unit_b)) if id(unit_a) < id(unit_b) else (id(unit_b), id(unit_a))
+                    if key in pairs:
+                        continue
+                    dist = math.hypot(bx - ax, by - ay)
+                    if dist < radius or (inclusive and dist == radius):
+                        pairs[key] = (unit_a, unit_b)
+        return list(pairs.values())
+
+    def k_nearest(self, x, y, k, team=None, exclude_team=None, units=None):
+        """Return up to ``k`` ``(model, unit, distance)`` tuples, closest first."""
+        if k <= 0 or not self._entries:
+            return []
+        size = self.cell_sizes[0]
+        buckets = self._levels[0]
+        cx, cy = x // size, y // size
+        max_ring = max(max(abs(bx - cx), abs(by - cy)) for bx, by in buckets)
+        ids = self._unit_ids(units)
+
+        # max-heap of the best k so far as (-distance, order, entry)
+        best = []
+        order = 0
+        for ring in range(max_ring + 1):
+            if ring == 0:
+                cells = [(cx, cy)]
+            else:
+                cells = [(cx + dx, cy + dy)
+                         for dx in range(-ring, ring + 1)
+                         for dy in range(-ring, ring + 1)
+                         if max(abs(dx), abs(dy)) == ring]
+            for model, unit, mx, my in self._candidates(0, cells):
+                if not self._matches(unit, team, exclude_team, ids):
+                    continue
+                dist = math.hypot(mx - x, my - y)
+                order += 1
+                if len(best) < k:
+                    heapq.heappush(best, (-dist, order, model, unit))
+                elif dist < -best[0][0]:
+                    heapq.heapreplace(best, (-dist, order, model, unit))
+            # models in the next ring are at least ``ring * size`` tiles away
+            if len(best) == k and -best[0][0] <= ring * size:
+                break
+
+        return [(model, unit, -neg) for neg, _, model, unit in sorted(best, key=lambda e: (-e[0], e[1]))]
+
+    def nearest(self, x, y, team=None, exclude_team=None, units=None):
+        """Return the closest ``(model, unit, distance)`` or ``(None, None, inf)``."""
+        result = self.k_nearest(x, y, 1, team, exclude_team, units)
+        if not result:
+            return None, None, float("inf")
+        return result[0]
+
+    def nearest_enemy(self, x, y, team, units=None):
+        """Return the closest model not belonging to ``team``."""
+        return self.nearest(x, y, exclude_team=team, units=units)
@@ -1,47 +1,112 @@
 import importlib
-import math
 from dataclasses import dataclass, field
 
+import numpy as np
+
+from game_logic.footprints import footprint_offsets, footprint_size
+from game_logic.gamelog import as_log
+from game_logic.model_store import ModelStore
+
 
-@dataclass
 class Model:
-    x: int
-    y: int
-    max_health: int = 1
-    base_width: float = 1.0
-    base_height: float = 1.0
-    ranged_attacks: list = field(default_factory=list)
-    current_health: int = field(init=False)
+    """One model, a view onto a row of a :class:`ModelStore`.
+
+    A model created on its own gets a one-row store; units create theirs
+    in their army's store.
+    """
+
+    __slots__ = ("_store", "_row", "ranged_attacks")
+
+    def __init__(self, x, y, max_health=1, base_width=1.0, base_height=1.0,
+                 ranged_attacks=None, store=None, unit_id=-1):
+        self._store = ModelStore(1) if store is None else store
+        self._row = self._store.add(x, y, max_health, base_width, base_height, unit_id)
+        self.ranged_attacks = () if ranged_attacks is None else ranged_attacks
+
+    # Columns are read with ``ndarray.item`` so callers get plain Python
+    # numbers; spelled out per column, as these are hot.
+    @property
+    def x(self):
+        """Column of the base's top-left square."""
+        return self._store.x.item(self._row)
+
+    @x.setter
+    def x(self, value):
+        self._store.x[self._row] = value
+
+    @property
+    def y(self):
+        """Row of the base's top-left square."""
+        return self._store.y.item(self._row)
+
+    @y.setter
+    def y(self, value):
+        self._store.y[self._row] = value
+
+    @property
+    def max_health(self):
+        return self._store.max_health.item(self._row)
+
+    @max_health.setter
+    def max_health(self, value):
+        self._store.max_health[self._row] = value
+
+    @property
+    def base_width(self):
+        """Base width in inches."""
+        return self._store.base_width.item(self._row)
+
+    @base_width.setter
+    def base_width(self, value):
+        self._store.base_width[self._row] = value
+
+    @property
+    def base_height(self):
+        """Base height in inches."""
+        return self._store.base_height.item(self._row)
+
+    @base_height.setter
+    def base_height(self, value):
+        self._store.base_height[self._row] = value
+
+    @property
+    def store(self):
+        """The :class:`ModelStore` holding this model."""
+        return self._store
+
+    @property
+    def row(self):
+        """This model's row in :attr:`store`."""
+        return self._row
+
+    @property
+    def current_health(self):
+        return self._store.health.item(self._row)
+
+    @current_health.setter
+    def current_health(self, value):
+        self._store.health[self._row] = value
+        self._store.alive[self._row] = value > 0
 
     @property
     def base_diameter(self) -> float:
         """Largest dimension of the model's base."""
         return max(self.base_width, self.base_height)
 
-    def __post_init__(self):
-        self.current_health = self.max_health
-
     def is_alive(self):
-        return self.current_health > 0
+        return self._store.alive.item(self._row)
 
     def take_damage(self, dmg):
-        self.current_health -= dmg
-        if self.current_health < 0:
-            self.current_health = 0
+        self.current_health = max(self.current_health - dmg, 0)
 
     def position(self):
         return self.x, self.y
 
     def get_occupied_squares(self):
         """Return the board squares occupied by this model."""
-        occupied = []
-        width_tiles = int(round(self.base_width / 0.5))
-        height_tiles = int(round(self.base_height / 0.5))
-
-        for dx in range(width_tiles):
-            for dy in range(height_tiles):
-                occupied.append((self.x + dx, self.y + dy))
-        return occupied
+        x, y = self.x, self.y
+        offsets = footprint_offsets(*footprint_size(self.base_width, self.base_height))
+        return [(x + dx, y + dy) for dx, dy in offsets]
 
     def get_display_squares(self):
         """Return squares representing a circular or elliptical base."""
@@ -82,7 +147,7 @@ class Model:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Unit:
     name: str
     faction: str
@@ -100,6 +165,13 @@ class Unit:
     models: list = field(default_factory=list)
     has_run: bool = False
     keywords: list = field(default_factory=list)
+    attacks: list = field(default_factory=list)
+    # Board the unit is placed on; set by ``Board.place_unit``.
+    board: object = field(default=None, repr=False, compare=False)
+    # Army store holding the models' state (see ``game_logic.model_store``);
+    # a unit created without one gets its own.
+    store: ModelStore = field(default=None, repr=False, compare=False)
+    unit_id: int = field(default=-1, repr=False, compare=False)
 
     def __post_init__(self):
         unit_data = self.unit_data
@@ -120,11 +192,16 @@ class Unit:
         self.melee_weapons = unit_data.get("melee_weapons", [])
         self.keywords = unit_data.get("keywords", self.keywords)
 
+        if self.store is None:
+            self.store = ModelStore(self.num_models)
+        self.unit_id = self.store.new_unit()
+
         leader_x = self.x
         leader_y = self.y
 
         self.models = [Model(leader_x, leader_y, max_health=model_health,
-                             base_width=self.base_width, base_height=self.base_height)]
+                             base_width=self.base_width, base_height=self.base_height,
+                             store=self.store, unit_id=self.unit_id)]
 
         placed_positions = {(leader_x, leader_y)}
         ring_radius = 1
@@ -140,7 +217,9 @@ class Unit:
                         self.models.append(Model(new_x, new_y,
                                                 max_health=model_health,
                                                 base_width=self.base_width,
-                                                base_height=self.base_height))
+                                                base_height=self.base_height,
+                                                store=self.store,
+                                                unit_id=self.unit_id))
                         model_index += 1
                         if model_index >= self.num_models:
                             break
@@ -148,8 +227,13 @@ class Unit:
                     break
             ring_radius += 1
 
+        # models without weapons of their own share one tuple
+        def model_attacks(i):
+            return tuple(atk for atk in self.ranged_attacks if atk.get("model_index") is None or atk.get("model_index") == i)
+        indexed = {atk.get("model_index") for atk in self.ranged_attacks}
+        shared = model_attacks(None)
         for i, model in enumerate(self.models):
-            model.ranged_attacks = [atk for atk in self.ranged_attacks if atk.get("model_index") is None or atk.get("model_index") == i]
+            model.ranged_attacks = model_attacks(i) if i in indexed else shared
 
     def position(self):
         return self.x, self.y
@@ -163,28 +247,54 @@ class Unit:
             label = "Leader" if i == 0 else f"Model {i}"
             print(f" - {label} at ({model.x}, {model.y}) | Base: {model.base_diameter}\"")
 
+    def positions(self):
+        """``(xs, ys)`` arrays of the models' anchors, gathered from the
+        model store."""
+        store = self.store
+        rows = [m._row for m in self.models if m._store is store]
+        if len(rows) == len(self.models):
+            rows = np.array(rows, dtype=np.intp)
+            return store.x[rows], store.y[rows]
+        return (np.array([m.x for m in self.models], dtype=np.int32),
+                np.array([m.y for m in self.models], dtype=np.int32))
+
     def model_count(self):
         return len(self.models)
 
-    def apply_damage(self, dmg):
-        """Apply damage to the first alive model in the unit."""
-        for model in list(self.models):
+    def apply_damage(self, dmg, log=None):
+        """Apply damage to the first alive model in the unit.
+
+        Messages go to ``log``, or to the board's log by default.
+        """
+        if log is None and self.board is not None:
+            log = self.board.log
+        log = as_log(log)
+        for model in self.models:
             if model.is_alive():
-                model.take_damage(dmg)
-                print(
-                    f"{self.name}: Model took {dmg} damage (HP: {model.current_health}/{model.max_health})"
-                )
+                self.damage_model(model, dmg)
+                log.emit("model_damaged", "{unit}: Model took {dmg} damage (HP: {hp}/{max_hp})",
+                         unit=self.name, dmg=dmg, hp=model.current_health, max_hp=model.max_health)
                 if not model.is_alive():
-                    print(f"{self.name}: A model has been slain!")
-                    self.models.remove(model)
+                    log.emit("model_slain", "{unit}: A model has been slain!", unit=self.name)
+                    self.remove_model(model)
                 break
-        print(f"{self.name}: {len(self.models)} model(s) remaining.")
+        log.emit("models_remaining", "{unit}: {count} model(s) remaining.",
+                 unit=self.name, count=len(self.models))
+
+    def damage_model(self, model, dmg):
+        """Damage one model, through the board if the unit is on one."""
+        if self.board is not None:
+            self.board.damage_model(self, model, dmg)
+        else:
+            model.take_damage(dmg)
+
+    def remove_model(self, model):
+        """Remove a slain model, freeing its squares if the unit is on a board."""
+        if self.board is not None:
+            self.board.remove_model(self, model)
+        else:
+            self.models.remove(model)
 
 
 def is_in_combat(x, y, board, team, radius=6):
-    for enemy_unit in board.units:
-        if enemy_unit.team != team:
-            for model in enemy_unit.models:
-                if math.sqrt((x - model.x)**2 + (y - model.y)**2) < radius:
-                    return True
-    return False
+    return board.model_index.any_within(x, y, radius, exclude_team=team, inclusive=False)
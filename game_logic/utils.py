@@ -25,6 +25,14 @@ def center_model_on_square(model, center_x, center_y):
     model.y += dy
 
 
+def arrange_formation(unit, offsets, center_x, center_y):
+    """Lay ``unit`` out in the formation ``offsets`` with the leader's
+    central square at ``center_x, center_y``."""
+    for model, (dx, dy) in zip(unit.models, offsets):
+        center_model_on_square(model, center_x + dx, center_y + dy)
+    center_unit_on_leader_square(unit, center_x, center_y)
+
+
 def _simple_deploy_units(board, units, territory, enemy_territory, zone_name, player_label, get_input=None, log=lambda *a, **k: None):
     """Simplified unit placement used for web UI and tests."""
     for idx, unit in enumerate(units):
@@ -0,0 +1,82 @@
+"""Deployment zones compiled to boolean masks.
+
+Each deployment map is compiled once per board size into a pair of
+:class:`DeploymentZone` s holding a read-only ``[y, x]`` mask, the zone's
+tiles and its centroid and facing. A zone is also callable as
+``zone(x, y)``, so code written against the old per-tile predicates keeps
+working.
+"""
+
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+
+import numpy as np
+
+from game_logic.distance_fields import squared_distance_field
+
+
+@dataclass(frozen=True, eq=False)
+class DeploymentZone:
+    """One side's deployment zone on a ``width`` x ``height`` board."""
+
+    name: str
+    mask: np.ndarray
+    # (x, y) tiles in column order (x, then y), as the old coordinate
+    # lists were built
+    tiles: tuple
+    centroid: tuple
+    # formation facing: 1 for a zone in the top half of the board, else -1
+    orientation: int
+    tile_set: frozenset = field(repr=False)
+
+    def __call__(self, x, y):
+        return (x, y) in self.tile_set
+
+    @cached_property
+    def distance_sq(self):
+        """Squared distance from every tile to the nearest zone tile."""
+        field = squared_distance_field(self.mask)
+        field.setflags(write=False)
+        return field
+
+    @classmethod
+    def from_mask(cls, name, mask):
+        mask = np.array(mask, dtype=bool)
+        mask.setflags(write=False)
+        coords = np.argwhere(mask.T)
+        tiles = tuple(map(tuple, coords.tolist()))
+        cx, cy = coords.mean(axis=0).tolist() if tiles else (float("nan"), float("nan"))
+        orientation = 1 if cy < mask.shape[0] / 2 else -1
+        return cls(name, mask, tiles, (cx, cy), orientation, frozenset(tiles))
+
+
+@lru_cache(maxsize=None)
+def deployment_zones(width, height, map_type):
+    """Return ``(defender_zone, attacker_zone)`` for ``map_type``
+    (``"straight"`` or ``"diagonal"``) on a board of the given size."""
+    ys, xs = np.mgrid[0:height, 0:width]
+    if map_type == "straight":
+        defender = ys < height // 2
+    elif map_type == "diagonal":
+        slope = (15 - 43) / (59 - 20)
+        intercept = (height / 2) - slope * (width / 2)
+        defender = ys < slope * xs + intercept
+    else:
+        raise ValueError(f"Unknown map type: {map_type}")
+    return (DeploymentZone.from_mask("defender", defender),
+            DeploymentZone.from_mask("attacker", ~defender))
+
+
+def as_zone(zone, width, height):
+    """Return ``zone`` as a :class:`DeploymentZone`, compiling a plain
+    ``(x, y)`` predicate or a collection of ``(x, y)`` tiles."""
+    if isinstance(zone, DeploymentZone):
+        return zone
+    if callable(zone):
+        mask = [[bool(zone(x, y)) for x in range(width)] for y in range(height)]
+        return DeploymentZone.from_mask(getattr(zone, "__name__", "zone"), mask)
+    mask = np.zeros((height, width), dtype=bool)
+    for x, y in zone:
+        if 0 <= x < width and 0 <= y < height:
+            mask[y, x] = True
+    return DeploymentZone.from_mask("zone", mask)
@@ -1,23 +1,50 @@
 import math
-import random
+from game_logic.gamelog import as_log
 
 def is_near_enemy(unit, board, within_inches=12):
     limit = within_inches * 2
-    for model in unit.models:
-        for enemy_unit in board.units:
-            if enemy_unit.team != unit.team:
-                for enemy_model in enemy_unit.models:
-                    dist = math.sqrt((model.x - enemy_model.x)**2 + (model.y - enemy_model.y)**2)
-                    if dist <= limit:
-                        return True
+    return any(
+        board.model_index.any_within(model.x, model.y, limit, exclude_team=unit.team)
+        for model in unit.models
+    )
+
+
+def attempt_charge(unit, board, dest_x, dest_y, charge_roll, log):
+    """Charge ``unit`` so its leader ends on ``(dest_x, dest_y)``.
+
+    Every model moves by the same offset. The charge fails, and the unit is
+    put back, if the leader would travel further than ``charge_roll`` inches,
+    a model cannot be placed, or no model ends in base contact with an enemy.
+    """
+    log = as_log(log)
+    dx = dest_x - unit.x
+    dy = dest_y - unit.y
+    if math.sqrt(dx ** 2 + dy ** 2) > charge_roll * 2:
+        log("That position is beyond the charge distance.")
+        return False
+
+    if board.charge_unit(unit, dest_x, dest_y):
+        log.emit("charge_succeeded", "{unit} successfully charged!", unit=unit.name)
+        return True
+    log.emit("charge_failed", "Charge failed.", unit=unit.name)
     return False
 
 
-def ai_charge_phase(board, ai_units, player_units, get_input, log):
-    """AI skips charging for now."""
+def ai_charge_phase(board, ai_units, player_units, get_input, log, planner=None):
+    """Charge with the AI units ``planner`` (the board's MCTS planner by
+    default) picks, continuing the search tree from the movement phase."""
+    log = as_log(log)
     log("\n--- AI Charge Phase ---")
-    for unit in ai_units:
-        log(f"{unit.name} does not charge.")
+    planner = planner or board.planner
+    eligible = [u for u in ai_units if not u.has_run]
+    for unit, dest in planner.plan_charges(board, eligible):
+        if dest is None:
+            log.emit("charge_declined", "{unit} does not charge.", unit=unit.name)
+            continue
+        charge_roll = board.rng.dice("charge").roll_2d6()
+        log.emit("charge_roll", "{unit} rolled a charge distance of {roll} inches.",
+                 unit=unit.name, roll=charge_roll)
+        attempt_charge(unit, board, dest[0], dest[1], charge_roll, log)
 
 def charge_phase(board, player_units, get_input, log):
     """Handle the player's charge phase with manual placement only."""
@@ -41,7 +68,7 @@ def charge_phase(board, player_units, get_input, log):
             continue
         unit = remaining.pop(choice - 1)
 
-        charge_roll = random.randint(1, 6) + random.randint(1, 6)
+        charge_roll = board.rng.dice("charge").roll_2d6()
         log(f"Rolled a charge distance of {charge_roll} inches.")
         max_distance_squares = charge_roll * 2
 
@@ -86,13 +113,7 @@ def charge_phase(board, player_units, get_input, log):
                 log("Charge cancelled.")
                 break
 
-            in_range = False
-            for enemy_unit in board.units:
-                if enemy_unit.team != unit.team:
-                    if board.units_base_to_base(unit, enemy_unit):
-                        in_range = True
-                        break
-            if not in_range:
+            if not board.engaged_with(unit):
                 log("Charge must end within 1 square of an enemy unit.")
                 for i, (ox, oy) in enumerate(original_pos):
                     board.move_model(unit, i, ox, oy, enforce_coherency=False)
@@ -1,58 +1,48 @@
 # game_logic/combat_phase.py
 import math
-import random
-from game_logic.units import is_in_combat
-from game_phases.shooting_phase import roll_damage
+import numpy as np
+from game_logic.gamelog import DEBUG, INFO, as_log
 
 
 def _apply_damage(unit, dmg, log):
     """Apply ``dmg`` wounds to ``unit`` logging the results."""
-    for model in list(unit.models):
-        if model.is_alive():
-            model.take_damage(dmg)
-            log(
-                f"{unit.name}: Model took {dmg} damage (HP: {model.current_health}/{model.max_health})"
-            )
-            if not model.is_alive():
-                log(f"{unit.name}: A model has been slain!")
-                unit.models.remove(model)
-            break
-    log(f"{unit.name}: {len(unit.models)} model(s) remaining.")
+    unit.apply_damage(dmg, log)
 
 def get_eligible_combat_units(units, board):
-    return [
-        unit
-        for unit in units
-        if any(is_in_combat(model.x, model.y, board, unit.team) for model in unit.models)
-    ]
+    return board.units_in_combat(units)
 
 def pile_in(board, unit, enemies):
+    """Move each model of ``unit`` up to 3" toward the nearest enemy model,
+    stopping before the first square its base does not fit on."""
     for model in unit.models:
-        closest = None
-        min_distance = float("inf")
-        for enemy in enemies:
-            for enemy_model in enemy.models:
-                distance = math.sqrt((enemy_model.x - model.x) ** 2 + (enemy_model.y - model.y) ** 2)
-                if distance < min_distance:
-                    min_distance = distance
-                    closest = enemy_model
+        closest, _, min_distance = board.model_index.nearest(model.x, model.y, units=enemies)
 
         if closest and min_distance > 0:
-            dx = closest.x - model.x
-            dy = closest.y - model.y
+            x, y = model.x, model.y
+            dx = closest.x - x
+            dy = closest.y - y
             move_distance = min(6, min_distance)  # 3" = 6 tiles
             norm = math.sqrt(dx**2 + dy**2)
-            step_x = round((dx / norm) * move_distance) if norm != 0 else 0
-            step_y = round((dy / norm) * move_distance) if norm != 0 else 0
-            new_x = model.x + step_x
-            new_y = model.y + step_y
-            if 0 <= new_x < board.width and 0 <= new_y < board.height:
-                model.x = new_x
-                model.y = new_y
+            new_x, new_y = x, y
+            for step in range(1, int(move_distance) + 1):
+                step_x = x + round(dx / norm * step)
+                step_y = y + round(dy / norm * step)
+                if not board.model_fits(model, step_x, step_y):
+                    break
+                new_x, new_y = step_x, step_y
+            if (new_x, new_y) != (x, y):
+                board.relocate_model(unit, model, new_x, new_y)
 
 def _nearest_enemy(unit, enemy_units):
     closest = None
     min_dist = float("inf")
+    if unit.board is not None:
+        for model in unit.models:
+            _, enemy, dist = unit.board.model_index.nearest(model.x, model.y, units=enemy_units)
+            if dist < min_dist:
+                min_dist = dist
+                closest = enemy
+        return closest, min_dist
     for enemy in enemy_units:
         for e_model in enemy.models:
             for model in unit.models:
@@ -64,13 +54,10 @@ def _nearest_enemy(unit, enemy_units):
 
 
 def _distance_between_units(a, b):
-    min_dist = float("inf")
-    for m in a.models:
-        for e in b.models:
-            d = math.sqrt((m.x - e.x) ** 2 + (m.y - e.y) ** 2)
-            if d < min_dist:
-                min_dist = d
-    return min_dist
+    if not a.models or not b.models:
+        return float("inf")
+    (ax, ay), (bx, by) = a.positions(), b.positions()
+    return math.sqrt((np.subtract.outer(ax, bx) ** 2 + np.subtract.outer(ay, by) ** 2).min())
 
 
 def _targets_in_range(unit, enemies, max_dist=3):
@@ -81,8 +68,16 @@ def _targets_in_range(unit, enemies, max_dist=3):
     return res
 
 
-def resolve_melee_attacks(unit, enemy_units, log, target=None):
-    """Resolve melee attacks from ``unit`` against ``target`` or the nearest enemy."""
+def resolve_melee_attacks(unit, enemy_units, log, target=None, verbose=False, dice=None):
+    """Resolve melee attacks from ``unit`` against ``target`` or the nearest enemy.
+
+    Rolls use ``dice``, by default the attack dice of the board ``unit``
+    is placed on.
+
+    Each weapon's rolls are made in one batch. Per-roll lines are logged
+    when ``verbose`` is set, or at DEBUG level if a DEBUG sink is listening.
+    """
+    log = as_log(log)
     if target is None:
         target, distance = _nearest_enemy(unit, enemy_units)
     else:
@@ -91,8 +86,9 @@ def resolve_melee_attacks(unit, enemy_units, log, target=None):
         log("No enemies in melee range.")
         return
 
-    log(f"{unit.name} attacks {target.name}!")
+    log.emit("melee_attack", "{unit} attacks {target}!", unit=unit.name, target=target.name)
 
+    dice = dice or unit.board.rng.attack_dice
     total_attacks = 0
     total_wounds = 0
     total_saves = 0
@@ -100,43 +96,46 @@ def resolve_melee_attacks(unit, enemy_units, log, target=None):
     models_before = len(target.models)
 
     for weapon in unit.melee_weapons:
-        log(f"Using {weapon['name']}:")
-        for model in unit.models:
-            for _ in range(weapon['attacks']):
-                total_attacks += 1
-                hit = random.randint(1, 6)
-                log(f"  Hit roll: {hit} (needs {weapon['to_hit']}+)")
-                if hit >= weapon['to_hit']:
-                    wound = random.randint(1, 6)
-                    log(f"  Wound roll: {wound} (needs {weapon['to_wound']}+)")
-                    if wound >= weapon['to_wound']:
-                        total_wounds += 1
-                        save = random.randint(1, 6)
-                        log(f"  Save roll: {save} (needs 4+)")
-                        if save >= 4:
-                            total_saves += 1
-                            log("  Saved!")
-                        else:
-                            dmg = roll_damage(weapon['damage'])
-                            total_damage += dmg
-                            log(f"  {dmg} damage inflicted!")
-                            for _ in range(dmg):
-                                _apply_damage(target, 1, log)
-                    else:
-                        log("  Failed to wound.")
-                else:
-                    log("  Missed.")
+        log.emit("weapon", "Using {weapon}:", weapon=weapon['name'])
+        summary = dice.roll_attacks(weapon, len(unit.models), save=4,
+                                    verbose=verbose or log.enabled(DEBUG))
+        if summary.trace:
+            for line in summary.trace:
+                log(line, INFO if verbose else DEBUG)
+        total_attacks += summary.attacks
+        total_wounds += summary.wounds
+        total_saves += summary.saves
+        total_damage += summary.total_damage
+        for _ in range(summary.total_damage):
+            if not target.models:
+                break
+            _apply_damage(target, 1, log)
 
     models_after = len(target.models)
-    log(
-        f"Attacks rolled: {total_attacks}, Wounds rolled: {total_wounds}, Saves made: {total_saves}"
-    )
-    log(
-        f"{target.name} took {total_damage} wounds, {models_before - models_after} models died, {models_after} remain."
-    )
+    log.emit("melee_summary", "Attacks rolled: {attacks}, Wounds rolled: {wounds}, Saves made: {saves}",
+             attacks=total_attacks, wounds=total_wounds, saves=total_saves)
+    log.emit("melee_result", "{target} took {damage} wounds, {slain} models died, {remaining} remain.",
+             target=target.name, damage=total_damage, slain=models_before - models_after,
+             remaining=models_after)
+
+def fight(board, unit, enemy_units, target, log):
+    """Activate ``unit``: pile in, then attack ``target`` if it is in range.
+
+    Returns False without piling in when ``unit`` is not in combat.
+    """
+    if not unit.models or not get_eligible_combat_units([unit], board):
+        return False
+    pile_in(board, unit, enemy_units)
+    if target not in _targets_in_range(unit, enemy_units):
+        log("No enemies in melee range.")
+        return False
+    resolve_melee_attacks(unit, enemy_units, log, target=target, dice=board.rng.attack_dice)
+    return True
+
 
 def _alternate_fights(board, enemy_map, units_by_team, start_team, get_input, log):
     """Alternate activations between teams for the given ``units_by_team``."""
+    log = as_log(log)
     active = start_team
     inactive = 2 if start_team == 1 else 1
     while units_by_team[1] or units_by_team[2]:
@@ -166,7 +165,7 @@ def _alternate_fights(board, enemy_map, units_by_team, start_team, get_input, lo
         if not unit.models:
             continue
 
-        log(f"\n{unit.name} (Team {unit.team}) activates!")
+        log.emit("unit_activated", "\n{unit} (Team {team}) activates!", unit=unit.name, team=unit.team)
         pile_in(board, unit, enemy_map[unit.team])
 
         # choose target
@@ -194,12 +193,14 @@ def _alternate_fights(board, enemy_map, units_by_team, start_team, get_input, lo
                 target, _ = _nearest_enemy(unit, enemy_map[unit.team])
 
         if target:
-            resolve_melee_attacks(unit, enemy_map[unit.team], log, target=target)
+            resolve_melee_attacks(unit, enemy_map[unit.team], log, target=target,
+                                  dice=board.rng.attack_dice)
 
         active, inactive = inactive, active
 
 
 def combat_phase(board, current_team, player_units, ai_units, get_input, log):
+    log = as_log(log)
     enemy_map = {1: ai_units, 2: player_units}
 
     all_units = {
@@ -1,15 +1,22 @@
 import os
-import random
 import importlib
-import math
+import numpy as np
 from game_logic.units import Unit, Model
-from game_logic.board import Objective, TILE_OBJECTIVE, TILE_EMPTY
-from game_logic.utils import center_unit_on_leader_square, center_model_on_square
-from game_logic.terrain import RECTANGLE_WALL, L_SHAPE_WALL, rotate_shape, generate_spiral_offsets
+from game_logic.board import Objective, footprint_size
+from game_logic.footprints import shift_mask
+from game_logic.rng import RandomStreams
+from game_logic.zones import as_zone, deployment_zones
+from game_logic.deployment_solver import choose_unit_anchor, default_score, fit_unit_in_zone
+from game_logic.formations import apply_layout, fit_formation, formation_offsets
+from game_logic.utils import arrange_formation
+from game_logic.terrain import DIRECTION_VECTORS, RECTANGLE_WALL, L_SHAPE_WALL, rotate_shape
 from game_logic.factions.skaven import SkavenFactory
 from game_logic.factions.stormcast import StormcastFactory
 
 FACTIONS_PATH = "game_logic/factions"
+# Terrain must stay this many tiles from the enemy zone and from other terrain.
+TERRAIN_ENEMY_CLEARANCE = 6
+TERRAIN_SPACING = 12
 
 def list_factions():
     return sorted([
@@ -40,9 +47,10 @@ def choose_faction(get_input, log):
         except ValueError:
             log("Please enter a number.")
 
-def roll_off(get_input, log):
-    player_roll = random.randint(1, 6)
-    ai_roll = random.randint(1, 6)
+def roll_off(get_input, log, rng=None):
+    dice = (rng or RandomStreams()).dice("deployment")
+    player_roll = dice.d6()
+    ai_roll = dice.d6()
     log(f"Player rolled: {player_roll}")
     log(f"AI rolled: {ai_roll}")
     if player_roll > ai_roll:
@@ -51,7 +59,7 @@ def roll_off(get_input, log):
         return ("player", "ai") if role == "a" else ("ai", "player")
     elif ai_roll > player_roll:
         log("AI wins the roll-off.")
-        role = random.choice(["attacker", "defender"])
+        role = dice.choice(["attacker", "defender"])
         log(f"AI chooses to be {role}.")
         return ("ai", "player") if role == "attacker" else ("player", "ai")
     else:
@@ -95,135 +103,43 @@ def choose_deployment_map(get_input, log):
             log("Invalid choice.")
 
 
-def _triangle_offsets(num, orientation, base_width=1.0, base_height=1.0):
-    """Offsets for a triangle formation behind the leader."""
-    offsets = [(0, 0)]
-    placed = 1
-    row = 2
-
-    x_step = math.ceil(base_width / 0.5)
-    y_step = math.ceil(base_height / 0.5)
-    y = -orientation * y_step
-    while placed < num:
-        start_x = -round((row - 1) / 2 * x_step)
-        for i in range(row):
-            if placed >= num:
-                break
-            offsets.append((start_x + i * x_step, y))
-
-            placed += 1
-        row += 1
-        y -= orientation * y_step
-    return offsets
-
-
-def _rectangle_offsets(num, orientation, base_width=1.0, base_height=1.0):
-    """Offsets for a simple rectangular block behind the leader."""
-    offsets = [(0, 0)]
-    cols = math.ceil(math.sqrt(num))
-    rows = math.ceil(num / cols)
-
-    x_step = math.ceil(base_width / 0.5)
-    y_step = math.ceil(base_height / 0.5)
-
-    placed = 1
-    for r in range(rows):
-        if placed >= num:
-            break
-        y = -(r + 1) * orientation * y_step
-
-        start_x = -round((cols - 1) / 2 * x_step)
-        for c in range(cols):
-            if placed >= num:
-                break
-            offsets.append((start_x + c * x_step, y))
-
-            placed += 1
-    return offsets
-
-
-def _circle_offsets(num, orientation, base_width=1.0, base_height=1.0):
-    """Offsets spreading models in a semicircle behind the leader."""
-    offsets = [(0, 0)]
-    spiral = generate_spiral_offsets(radius=6)
-
-    x_step = math.ceil(base_width / 0.5)
-    y_step = math.ceil(base_height / 0.5)
-
-    for dx, dy in spiral[1:]:
-        if len(offsets) >= num:
-            break
-        if -orientation * dy >= 0:
-            offsets.append((dx * x_step, dy * y_step))
-    for dx, dy in spiral[1:]:
-        if len(offsets) >= num:
-            break
-        if -orientation * dy < 0:
-            offsets.append((dx * x_step, dy * y_step))
-    return offsets[:num]
-
-
-def formation_offsets(
-    formation,
-    num_models,
-    orientation,
-    base_width=1.0,
-    base_height=1.0,
-):
-    formation = (formation or "triangle").lower()
-    if formation.startswith("box") or formation.startswith("rect"):
-        return _rectangle_offsets(num_models, orientation, base_width, base_height)
-    if formation.startswith("circle"):
-        return _circle_offsets(num_models, orientation, base_width, base_height)
-    return _triangle_offsets(num_models, orientation, base_width, base_height)
-
 def get_deployment_zones(board, map_type):
-    if map_type == "straight":
-        mid = board.height // 2
-
-        def defender_zone(x, y):
-            return y < mid
-
-        def attacker_zone(x, y):
-            return y >= mid
-
-    elif map_type == "diagonal":
-        slope = (15 - 43) / (59 - 20)
-        intercept = (board.height / 2) - slope * (board.width / 2)
-
-        def line_y(x): return slope * x + intercept
+    """Return ``(defender_zone, attacker_zone)`` for ``map_type``.
 
-        def attacker_zone(x, y):
-            return y >= line_y(x)
+    The zones are compiled masks shared by every board of this size (see
+    ``game_logic.zones``) and can be called as ``zone(x, y)``.
+    """
+    return deployment_zones(board.width, board.height, map_type)
 
-        def defender_zone(x, y):
-            return y < line_y(x)
-    else:
-        raise ValueError(f"Unknown map type: {map_type}")
-
-    return defender_zone, attacker_zone
+def deploy_terrain(board, team, zone, enemy_zone, get_input, log, auto=None):
+    """Place both terrain pieces for ``team``.
 
-def deploy_terrain(board, team, zone, enemy_zone, get_input, log):
+    ``zone`` and ``enemy_zone`` are deployment zones or lists of tiles.
+    ``auto`` selects random AI placement among all legal positions; by
+    default team 2 places automatically and team 1 is prompted.
+    """
     zone_name = "Player 1" if team == 1 else "Player 2"
     log(f"{zone_name} Terrain Deployment")
+    if auto is None:
+        auto = team == 2
 
     for name, base_shape in [("Rectangle Wall", RECTANGLE_WALL), ("L-Shaped Wall", L_SHAPE_WALL)]:
-        if team == 2:
+        if auto:
             log(f"AI is placing {name}...")
-            attempts = 100
-            directions = list(rotate_shape.__globals__["DIRECTION_VECTORS"].keys())
-            for _ in range(attempts):
-                x, y = random.choice(zone)
-                direction = random.choice(directions)
+            dice = board.rng.dice("deployment")
+            directions = list(DIRECTION_VECTORS)
+            start = directions.index(dice.choice(directions))
+            for direction in directions[start:] + directions[:start]:
                 rotated = rotate_shape(base_shape, direction)
-                legal, _ = is_valid_terrain_placement(x, y, rotated, board, zone, enemy_zone)
-
-                if legal:
-                    if board.place_terrain_piece(x, y, rotated):
-                        log(f"✅ AI placed {name} at ({x}, {y}) facing {direction}")
-                        break
+                anchors = np.argwhere(legal_terrain_anchors(board, rotated, zone, enemy_zone).T).tolist()
+                if not anchors:
+                    continue
+                x, y = dice.choice(anchors)
+                if board.place_terrain_piece(x, y, rotated):
+                    log(f"✅ AI placed {name} at ({x}, {y}) facing {direction}")
+                    break
             else:
-                log(f"❌ AI failed to place {name} after 100 attempts.")
+                log(f"❌ AI found no legal position for {name}.")
         else:
             while True:
                 user_input = get_input(f"Place {name} - Enter 'x y direction' or 'skip':").strip().lower()
@@ -249,46 +165,47 @@ def deploy_terrain(board, team, zone, enemy_zone, get_input, log):
                 except Exception as e:
                     log(f"⚠️ Error: {e}")
 
-def deploy_units(board, units, territory_bounds, enemy_bounds, zone_name, player_label, get_input, log):
-    zone_coords = [(i, j) for i in range(board.width) for j in range(board.height) if territory_bounds(i, j)]
-    enemy_coords = [(i, j) for i in range(board.width) for j in range(board.height) if enemy_bounds(i, j)]
-    zone_list = zone_coords
-    center_y = sum(y for _, y in zone_list) / len(zone_list)
-    orientation = 1 if center_y < board.height / 2 else -1
+def deploy_units(board, units, territory_bounds, enemy_bounds, zone_name, player_label, get_input, log,
+                 score=default_score):
+    """Deploy ``units`` in ``territory_bounds``.
+
+    The AI lays each unit out in box formation at the legal leader square
+    that ``score`` ranks highest (see ``game_logic.deployment_solver``),
+    bending the formation around obstacles when it fits nowhere whole.
+    The player is prompted, and their formation is fitted around the
+    leader the same way.
+    """
+    territory = as_zone(territory_bounds, board.width, board.height)
+    enemy = as_zone(enemy_bounds, board.width, board.height)
+    zone_coords = territory.tiles
+    enemy_coords = enemy.tiles
+    orientation = territory.orientation
 
     for unit in units:
         if player_label.lower() == "ai":
-            placed = False
-            attempts = 100
-            while not placed and attempts > 0:
-                x = random.randint(0, board.width - 1)
-                y = random.randint(0, board.height - 1)
-                if territory_bounds(x, y):
-                    offsets = formation_offsets(
-                        "box",
-                        len(unit.models),
-                        orientation,
-                        unit.base_width,
-                        unit.base_height,
-                    )
-
-                    for i, (dx, dy) in enumerate(offsets):
-                        center_model_on_square(unit.models[i], x + dx, y + dy)
-
-                    center_unit_on_leader_square(unit, x, y)
-
-                    valid, _ = is_valid_unit_placement(x, y, unit, board, zone_coords, enemy_coords)
-                    if valid and board.place_unit(unit):
-                        placed = True
-                attempts -= 1
-            if not placed:
-                log(f"⚠ AI could not place {unit.name} after 100 attempts.")
+            offsets = formation_offsets(
+                "box",
+                len(unit.models),
+                orientation,
+                unit.base_width,
+                unit.base_height,
+            )
+            anchor = choose_unit_anchor(board, unit, offsets, territory, enemy, score)
+            if anchor is not None:
+                arrange_formation(unit, offsets, *anchor)
+            else:
+                layout = fit_unit_in_zone(board, unit, "box", territory, enemy, score)
+                if layout is None:
+                    log(f"⚠ AI found no legal position for {unit.name}.")
+                    continue
+                apply_layout(unit, layout)
+            board.place_unit(unit)
         else:
             while True:
                 try:
                     pos = get_input(f"Placing {unit.name} leader x y:").split()
                     x, y = map(int, pos)
-                    if not territory_bounds(x, y):
+                    if not territory(x, y):
                         log("❌ Not within your deployment zone.")
                         continue
                     ok, reason = is_valid_leader_position(x, y, board, zone_coords, enemy_coords)
@@ -296,22 +213,11 @@ def deploy_units(board, units, territory_bounds, enemy_bounds, zone_name, player
                         log(f"❌ Placement invalid: {reason}")
                         continue
                     formation = get_input("Choose formation (box/triangle/circle):").strip().lower()
-                    offsets = formation_offsets(
-                        formation,
-                        len(unit.models),
-                        orientation,
-                        unit.base_width,
-                        unit.base_height,
-                    )
-                    for i, (dx, dy) in enumerate(offsets):
-                        center_model_on_square(unit.models[i], x + dx, y + dy)
-
-                    center_unit_on_leader_square(unit, x, y)
-
-                    valid, reason = is_valid_unit_placement(x, y, unit, board, zone_coords, enemy_coords)
-                    if not valid:
-                        log(f"❌ Placement invalid: {reason}")
+                    layout = fit_formation(board, unit, x, y, formation, orientation)
+                    if layout is None:
+                        log("❌ Placement invalid: the unit does not fit there")
                         continue
+                    apply_layout(unit, layout)
                     log("Proposed positions:")
                     for i, m in enumerate(unit.models):
                         log(f"  Model {i} -> ({m.x}, {m.y})")
@@ -350,7 +256,7 @@ def is_within_zone(x, y, rotated_shape, zone):
 def is_clear_of_objectives(x, y, rotated_shape, board):
     for dx, dy in rotated_shape:
         px, py = x + dx, y + dy
-        if board.grid[py][px] == TILE_OBJECTIVE:
+        if board.objective_plane[py, px]:
             return False, (px, py)
     return True, None
 
@@ -360,31 +266,49 @@ def is_valid_leader_position(x, y, board, zone, enemy_zone):
     return True, None
 
 
+def terrain_clearance(board, zone, enemy_zone):
+    """Return the ``[y, x]`` mask of tiles a terrain piece may cover.
+
+    Allowed tiles are inside ``zone``, at least ``TERRAIN_ENEMY_CLEARANCE``
+    tiles from ``enemy_zone`` and ``TERRAIN_SPACING`` from placed terrain,
+    and not on an objective. The distances come from cached distance
+    fields, so this costs a few array operations.
+    """
+    zone = as_zone(zone, board.width, board.height)
+    enemy_zone = as_zone(enemy_zone, board.width, board.height)
+    return (zone.mask
+            & (enemy_zone.distance_sq >= TERRAIN_ENEMY_CLEARANCE ** 2)
+            & (board.terrain_distance.terrain() >= TERRAIN_SPACING ** 2)
+            & ~board.objective_plane)
+
+
+def legal_terrain_anchors(board, rotated_shape, zone, enemy_zone):
+    """Return the ``[y, x]`` mask of every anchor at which
+    ``rotated_shape`` is a valid terrain placement."""
+    allowed = terrain_clearance(board, zone, enemy_zone)
+    anchors = np.ones(allowed.shape, dtype=bool)
+    for dx, dy in set(rotated_shape):
+        # the anchor at (x, y) needs ``allowed[y + dy, x + dx]``
+        anchors &= shift_mask(allowed, dx, dy)
+    return anchors
+
+
 def is_valid_terrain_placement(x, y, rotated_shape, board, zone, enemy_zone):
-    zone_set = set(zone)
-    enemy_set = set(enemy_zone)
+    allowed = terrain_clearance(board, zone, enemy_zone)
     for dx, dy in rotated_shape:
         px, py = x + dx, y + dy
-        if (px, py) not in zone_set:
-            return False, (px, py)
-        for ex, ey in enemy_set:
-            if math.hypot(px - ex, py - ey) < 6:
-                return False, (px, py)
-        if board.grid[py][px] == TILE_OBJECTIVE:
+        if not (0 <= px < board.width and 0 <= py < board.height) or not allowed[py, px]:
             return False, (px, py)
-        for tx, ty in board.terrain:
-            if math.hypot(px - tx, py - ty) < 12:
-                return False, (px, py)
     return True, None
 
 def is_valid_unit_placement(x, y, unit, board, zone, enemy_zone):
     """Check that all model squares are on the board and unoccupied."""
 
     for model in unit.models:
-        for px, py in model.get_occupied_squares():
-            if not (0 <= px < board.width and 0 <= py < board.height):
-                return False, "out of bounds"
-            if board.grid[py][px] != TILE_EMPTY:
-                return False, "occupied"
+        w, h = footprint_size(model.base_width, model.base_height)
+        if not board.in_bounds(model.x, model.y, w, h):
+            return False, "out of bounds"
+        if not board.base_fits(model, model.x, model.y):
+            return False, "occupied"
 
     return True, None
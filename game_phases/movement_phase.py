@@ -1,5 +1,6 @@
 import math
-import random
+from game_logic.formations import fit_formation, formation_kind, unit_orientation
+from game_logic.gamelog import WARNING, as_log
 from game_logic.units import is_in_combat
 
 
@@ -143,7 +144,7 @@ def normal_move(unit, board, get_input, log):
     move_input_loop(unit, board, move_range, get_input, log)
 
 def run_move(unit, board, get_input, log):
-    run_bonus = random.randint(1, 6)
+    run_bonus = board.rng.dice("movement").d6()
     move_range = unit.move_range + run_bonus * 2  # in squares
     unit.has_run = True
     log(f"Running! Rolled a {run_bonus}. Total range: {move_range / 2:.1f} inches")
@@ -167,7 +168,7 @@ def player_unit_move(unit, board, get_input, log):
                     log(f"{unit.name} skipped their retreat.")
                     break
                 if attempt_move(unit, board, move_input, unit.move_range, log):
-                    dmg = random.randint(1, 3)
+                    dmg = board.rng.dice("movement").d3()
                     log(f"{unit.name} suffers {dmg} damage while retreating!")
                     unit.apply_damage(dmg)
                     break
@@ -182,7 +183,7 @@ def player_unit_move(unit, board, get_input, log):
         return
 
     if choice.startswith("r"):
-        run_bonus = random.randint(1, 6)
+        run_bonus = board.rng.dice("movement").d6()
         move_range = unit.move_range + run_bonus * 2
         unit.has_run = True
         log(f"Running! Rolled a {run_bonus}. Total range: {move_range / 2:.1f} inches")
@@ -246,7 +247,7 @@ def retreat_move(unit, board, get_input, log):
             success = board.move_unit(unit, dest_x, dest_y)
             if success:
                 # ✅ Apply D3 mortal wounds after retreating
-                dmg = random.randint(1, 3)
+                dmg = board.rng.dice("movement").d3()
                 log(f"{unit.name} suffers {dmg} damage while retreating!")
                 unit.apply_damage(dmg)
                 adjust_unit_formation(unit, board, get_input, log)
@@ -256,51 +257,61 @@ def retreat_move(unit, board, get_input, log):
 
 
                 
-def ai_movement_phase(board, ai_units, get_input, log):
-    """AI skips movement for now."""
+def ai_movement_phase(board, ai_units, get_input, log, planner=None):
+    """Move each AI unit where ``planner`` (the board's MCTS planner by
+    default) expects it to do best."""
+    log = as_log(log)
     log("\nAI's Turn:")
+    planner = planner or board.planner
     for unit in ai_units:
         unit.has_run = False
-        log(f"{unit.name} does not move.")
+    for unit, dest in planner.plan_movement(board, ai_units):
+        if dest is None or not move_unit_to(unit, board, dest[0], dest[1], unit.move_range, log):
+            log.emit("unit_held", "{unit} does not move.", unit=unit.name)
 
 
 # Additional helpers for web interface movement
 
 
 def move_unit_to(unit, board, dest_x, dest_y, move_range, log):
-    """Move a unit to an explicit destination, enforcing distance and proximity checks."""
+    """Move a unit to an explicit destination in its reach, going around
+    terrain and units where needed."""
+    log = as_log(log)
     if not (0 <= dest_x < board.width and 0 <= dest_y < board.height):
-        log("Move out of bounds!")
-        return False
-
-    dx = dest_x - unit.x
-    dy = dest_y - unit.y
-    distance = math.sqrt(dx**2 + dy**2)
-    if distance > move_range:
-        log(f"{unit.name} can't move that far (max {move_range / 2:.1f} inches).")
+        log("Move out of bounds!", WARNING)
         return False
 
-    if is_in_combat(dest_x, dest_y, board, unit.team):
-        log("Destination too close to an enemy unit.")
-        return False
-
-    path = board.get_path(unit.x, unit.y, dest_x, dest_y)
-    blocked, blocked_tile = board.is_path_blocked(path, (unit.x, unit.y), unit)
-    if blocked:
-        log(f"Path is blocked at {blocked_tile}.")
+    if (dest_x, dest_y) not in board.reachable_tiles(unit, move_range):
+        if math.hypot(dest_x - unit.x, dest_y - unit.y) > move_range:
+            log.emit("move_invalid", "{unit} can't move that far (max {inches:.1f} inches).",
+                     WARNING, unit=unit.name, inches=move_range / 2)
+        elif is_in_combat(dest_x, dest_y, board, unit.team):
+            log("Destination too close to an enemy unit.", WARNING)
+        else:
+            log.emit("move_invalid", "No clear path to ({x}, {y}).", WARNING, x=dest_x, y=dest_y)
         return False
 
-    # Delegate to board.move_unit which now handles formation movement
-    success = board.move_unit(unit, dest_x, dest_y)
+    success = board.move_unit_within_reach(unit, dest_x, dest_y, move_range)
     if success:
-        log(f"{unit.name} moved to ({dest_x}, {dest_y}).")
+        log.emit("unit_moved", "{unit} moved to ({x}, {y}).", unit=unit.name, x=dest_x, y=dest_y)
     return success
 
 
 def adjust_unit_formation(unit, board, get_input, log):
-    """Allow the player to manually reposition models after a move."""
-    log("Adjust unit formation? (y/n):")
+    """Allow the player to reposition models after a move, by hand or
+    (``auto``) by fitting a formation around the leader."""
+    log("Adjust unit formation? (y/n/auto):")
     choice = get_input(">> ").strip().lower()
+    if choice in ["a", "auto"]:
+        formation = get_input("Choose formation (box/triangle/circle):").strip().lower()
+        cx, cy = unit.models[0].get_central_square()
+        layout = fit_formation(board, unit, cx, cy, formation, unit_orientation(unit), ignore_unit=unit)
+        if layout is None:
+            log("No room for that formation here.")
+        else:
+            board.reform_unit(unit, layout)
+            log(f"{unit.name} reformed in {formation_kind(formation)} formation.")
+        return
     if choice not in ["y", "yes"]:
         return
 
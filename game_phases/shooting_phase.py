@@ -1,22 +1,30 @@
-import random
-import math
+import numpy as np
+from game_logic.dice import DiceEngine
+from game_logic.gamelog import DEBUG, INFO, as_log
 
 
 def is_valid_shooting_target(shooter, target, board, max_range=24):
-    for shooter_model in shooter.models:
-        for target_model in target.models:
-            dx = target_model.x - shooter_model.x
-            dy = target_model.y - shooter_model.y
-            distance = math.sqrt(dx**2 + dy**2)
-            if distance <= max_range:
-                if board.is_path_clear(shooter_model.x, shooter_model.y, target_model.x, target_model.y):
-                    return True
-    return False
+    """Return True if any shooter model can see a target model within range.
+
+    Line of sight comes from the board's cache, so repeated checks within a
+    phase only trace rays once until terrain or models move.
+    """
+    if not shooter.models or not target.models:
+        return False
+    sx = np.array([m.x for m in shooter.models])
+    sy = np.array([m.y for m in shooter.models])
+    tx = np.array([m.x for m in target.models])
+    ty = np.array([m.y for m in target.models])
+    in_range = np.hypot(tx[None, :] - sx[:, None], ty[None, :] - sy[:, None]) <= max_range
+    si, ti = np.nonzero(in_range)
+    if not si.size:
+        return False
+    return bool(board.line_of_sight.rays_clear(sx[si], sy[si], tx[ti], ty[ti]).any())
 
 def get_player_units_that_can_shoot(player_units, ai_units, board):
     eligible = []
     for unit in player_units:
-        if not unit.models or not hasattr(unit, "ranged_weapons"):
+        if not unit.models or not unit.ranged_attacks:
             continue
         for enemy in ai_units:
             if is_valid_shooting_target(unit, enemy, board):
@@ -83,48 +91,46 @@ def player_shooting_phase(board, player_units, ai_units, get_input, log):
             log("Invalid choice.")
 
 
-def roll_damage(damage_value):
-    if isinstance(damage_value, int):
-        return damage_value
-    if isinstance(damage_value, str):
-        if damage_value.upper() == "D3":
-            return random.randint(1, 3)
-        elif damage_value.upper() == "D6":
-            return random.randint(1, 6)
-        elif damage_value.upper() == "2D3":
-            return random.randint(1, 3) + random.randint(1, 3)
-        elif damage_value.upper() == "2D6":
-            return random.randint(1, 6) + random.randint(1, 6)
-    return 1
-
-def resolve_ranged_attacks(unit, target_unit, board, log):
-    if not hasattr(unit, "ranged_weapons") or not unit.ranged_weapons:
-        log(f"{unit.name} has no ranged weapons!")
-        return
-
-    log(f"\n{unit.name} is shooting at {target_unit.name}!")
-
-    for weapon in unit.ranged_weapons:
-        log(f"Using {weapon['name']}:")
-
-        for model in unit.models:
-            for _ in range(weapon["attacks"]):
-                hit = random.randint(1, 6)
-                log(f"  Rolled to hit: {hit} (needs {weapon['to_hit']}+)")
-
-                if hit >= weapon["to_hit"]:
-                    wound = random.randint(1, 6)
-                    log(f"  Rolled to wound: {wound} (needs {weapon['to_wound']}+)")
-
-                    if wound >= weapon["to_wound"]:
-                        damage = weapon["damage"]
-                        enemy_model = target_unit.models[0] if target_unit.models else None
-                        if enemy_model:
-                            log(f"  {damage} damage dealt to model at ({enemy_model.x}, {enemy_model.y})")
-                            target_unit.apply_damage(damage)
-                        else:
-                            log("  No targets left in unit!")
-                    else:
-                        log("  Failed to wound.")
-                else:
-                    log("  Missed.")
+def roll_damage(damage_value, dice=None):
+    """Roll a damage value such as ``2`` or ``"D3"`` with ``dice`` (a fresh,
+    unseeded engine by default)."""
+    dice = dice or DiceEngine()
+    return int(dice.roll_expr(damage_value)[0])
+
+def resolve_ranged_attacks(unit, target_unit, board, log, verbose=False, dice=None):
+    """Resolve every ranged weapon of ``unit`` against ``target_unit``.
+
+    Each weapon is fired by every model still carrying it, in one batch, and
+    each successful wound applies its rolled damage to a single model. Per-roll lines are logged
+    when ``verbose`` is set, or at DEBUG level if a DEBUG sink is listening.
+    Returns True if any weapon was fired.
+    """
+    log = as_log(log)
+    if not unit.ranged_attacks:
+        log.emit("no_ranged_weapons", "{unit} has no ranged weapons!", unit=unit.name)
+        return False
+
+    log.emit("ranged_attack", "\n{unit} is shooting at {target}!", unit=unit.name, target=target_unit.name)
+    dice = dice or board.rng.attack_dice
+    fired = False
+
+    for weapon in unit.ranged_attacks:
+        shooters = sum(any(w is weapon for w in m.ranged_attacks) for m in unit.models)
+        if not shooters:
+            continue
+        fired = True
+        log.emit("weapon", "Using {weapon}:", weapon=weapon['name'])
+        summary = dice.roll_attacks(weapon, shooters, save=None,
+                                    verbose=verbose or log.enabled(DEBUG))
+        if summary.trace:
+            for line in summary.trace:
+                log(line, INFO if verbose else DEBUG)
+
+        for damage in summary.damage.tolist():
+            if not target_unit.models:
+                log("  No targets left in unit!")
+                break
+            target_unit.apply_damage(damage, log)
+        log.emit("ranged_result", "  {hits} hits, {wounds} wounds, {damage} damage.",
+                 hits=summary.hits, wounds=summary.wounds, damage=summary.total_damage)
+    return fired
@@ -1,3 +1,6 @@
+from game_logic.gamelog import as_log
+
+
 def process_end_phase_actions(board, units, get_input, log):
     # Placeholder for future faction-specific abilities
     log("Processing end phase actions (none for now).")
@@ -24,4 +27,5 @@ def calculate_victory_points(board, total_vp, scoring_team, get_input, log):
         vp += 1
 
     total_vp[scoring_team] += vp
-    log(f"\nVictory Points scored by Team {scoring_team}: {vp} (Total: {total_vp[scoring_team]})")
+    as_log(log).emit("vp_scored", "\nVictory Points scored by Team {team}: {vp} (Total: {total})",
+                     team=scoring_team, vp=vp, total=total_vp[scoring_team])
@@ -0,0 +1,84 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import DisplayGridCache, build_display_grid
+from game_logic.board import Board
+from game_logic.game_state import GameState
+from game_logic.objective import Objective
+from game_logic.units import Unit
+
+
+def _unit(team, x, y):
+    return Unit("Test", "stormcast", team=team, num_models=3, x=x, y=y,
+                unit_data={"num_models": 3, "move_range": 12,
+                           "base_width": 1.5, "base_height": 1.5})
+
+
+def test_display_cache_updates_only_changed_tiles():
+    board = Board()
+    board.objectives = [Objective(30, 22)]
+    state = GameState(board)
+    unit = _unit(1, 10, 10)
+    board.place_unit(unit)
+
+    cache = DisplayGridCache()
+    cache.refresh(state, board)
+    version = cache.version
+    assert cache.diff(state, board, version) == (version, {})
+
+    board.move_unit(unit, 14, 10)
+    board.place_unit(_unit(2, 40, 30))
+    grid = cache.refresh(state, board)
+    assert grid == build_display_grid(state, board)
+
+    new_version, tiles = cache.diff(state, board, version)
+    assert new_version > version
+    assert (10, 10) in tiles and (14, 10) in tiles and (40, 30) in tiles
+    assert (0, 0) not in tiles
+
+    board.objectives[0].control_team = 1
+    assert cache.diff(state, board, new_version)[1] is None
+
+
+def test_event_stream_drops_oldest_for_slow_clients():
+    from game_logic.events import EventStream
+
+    stream = EventStream(maxsize=3)
+    sub = stream.subscribe()
+    for i in range(5):
+        stream.publish("unit_moved", x=i)
+    events = sub.get(timeout=0)
+    assert [e.data["x"] for e in events] == [2, 3, 4]
+    assert sub.dropped == 2
+    stream.unsubscribe(sub)
+    stream.publish("unit_moved", x=5)
+    assert sub.get(timeout=0) == []
+
+
+def test_engine_publishes_board_events():
+    from game_logic.game_engine import GameEngine
+
+    engine = GameEngine()
+    sub = engine.events.subscribe()
+    unit = _unit(1, 10, 10)
+    engine.board.place_unit(unit)
+    engine.board.move_unit(unit, 12, 10)
+    unit.apply_damage(2)
+    kinds = [e.kind for e in sub.get(timeout=0)]
+    assert kinds == ["unit_placed", "unit_moved", "model_slain"]
+
+
+def test_display_cache_redraws_new_leader_after_leader_dies():
+    board = Board()
+    state = GameState(board)
+    unit = _unit(1, 10, 10)
+    board.place_unit(unit)
+    cache = DisplayGridCache()
+    cache.refresh(state, board)
+    version = cache.version
+
+    board.remove_model(unit, unit.models[0])
+    leader = unit.models[0].get_central_square()
+    assert cache.refresh(state, board) == build_display_grid(state, board)
+    assert cache.refresh(state, board)[leader] == {"color": "#0044cc", "label": "L"}
+    assert leader in cache.diff(state, board, version)[1]
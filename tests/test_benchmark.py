@@ -0,0 +1,24 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+
+from benchmark import compare, midboard_engine, run_benchmarks
+
+
+def test_midboard_scenario_is_engaged():
+    engine = midboard_engine()
+    units = engine.game_state.units["player"] + engine.game_state.units["ai"]
+    assert all(unit in engine.board.units for unit in units)
+    assert engine.board.units_in_combat(units)
+
+
+def test_results_are_json_and_comparable():
+    results = run_benchmarks(["board.move_unit", "resolve_melee_attacks"], repeat=1)
+    results = json.loads(json.dumps(results))
+    assert set(results["benchmarks"]) == {"board.move_unit", "resolve_melee_attacks"}
+    assert compare(results, results) == []
+
+    slower = json.loads(json.dumps(results))
+    slower["benchmarks"]["board.move_unit"]["min_ms"] *= 3
+    assert [name for name, _ in compare(slower, results)] == ["board.move_unit"]
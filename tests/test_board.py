@@ -0,0 +1,192 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+
+import pytest
+
+from game_logic.board import Board, TILE_EMPTY, TILE_UNIT, TILE_TERRAIN, TILE_OBJECTIVE
+from game_logic.units import Unit, is_in_combat
+
+
+def _unit(team=1, num_models=1, x=3, y=3, base=0.5):
+    return Unit("Test", "stormcast", team=team, num_models=num_models, x=x, y=y,
+                unit_data={"num_models": num_models, "move_range": 6,
+                           "base_width": base, "base_height": base})
+
+
+def test_grid_view_reflects_planes():
+    board = Board()
+    board.place_objective(10, 10)
+    board.place_terrain_piece(20, 20, [(0, 0), (1, 0)])
+    unit = _unit(base=1.5)
+    assert board.place_unit(unit)
+
+    assert board.grid[10][10] == TILE_OBJECTIVE
+    assert board.grid[20][21] == TILE_TERRAIN
+    assert board.grid[5][5] == TILE_UNIT
+    assert board.grid[0][0] == TILE_EMPTY
+    assert board.team_plane[3:6, 3:6].tolist() == [[1] * 3] * 3
+    with pytest.raises(TypeError):
+        board.grid[0][0] = TILE_UNIT
+
+
+def test_move_unit_updates_planes():
+    board = Board()
+    unit = _unit(num_models=2)
+    board.place_unit(unit)
+    version = board.version
+
+    assert board.move_unit(unit, unit.x + 2, unit.y)
+    assert board.version > version
+    assert int(board.unit_plane.astype(bool).sum()) == 2
+    for model in unit.models:
+        assert board.unit_plane[model.y, model.x] == board.unit_id(unit)
+
+
+def test_path_blocked_by_terrain_and_units():
+    board = Board()
+    board.place_terrain_piece(5, 3, [(0, 0)])
+    assert not board.is_path_clear(3, 3, 8, 3)
+    assert board.is_path_clear(3, 4, 8, 4)
+
+    unit = _unit(num_models=1, x=2, y=4)
+    board.place_unit(unit)
+    blocked, tile = board.is_path_blocked(board.get_path(2, 4, 8, 4), (2, 4), unit)
+    assert not blocked
+    other = _unit(team=2, num_models=1, x=6, y=4)
+    board.place_unit(other)
+    blocked, tile = board.is_path_blocked(board.get_path(2, 4, 8, 4), (2, 4), unit)
+    assert blocked and tile == (6, 4)
+
+
+def test_line_of_sight_cache_matches_path_checks():
+    import random
+
+    board = Board()
+    rng = random.Random(4)
+    for _ in range(40):
+        board.place_terrain_piece(rng.randrange(60), rng.randrange(44), [(0, 0)])
+
+    rays = [(rng.randrange(60), rng.randrange(44), rng.randrange(60), rng.randrange(44))
+            for _ in range(300)]
+    x0, y0, x1, y1 = zip(*rays)
+    clear = board.line_of_sight.rays_clear(x0, y0, x1, y1)
+    assert clear.tolist() == [board.is_path_clear(*ray) for ray in rays]
+
+    # cached until the board changes
+    wall = next(ray for ray, ok in zip(rays, clear) if ok and max(abs(ray[2] - ray[0]), abs(ray[3] - ray[1])) > 2)
+    path = board.get_path(*wall)
+    board.place_terrain_piece(*path[1], [(0, 0)])
+    assert not board.line_of_sight.is_clear(*wall)
+
+
+def test_incremental_objective_control_matches_full_recount():
+    from game_logic.objective import Objective
+
+    board = Board()
+    board.objectives = [Objective(10, 10), Objective(30, 22)]
+    friend = _unit(team=1, num_models=3, x=4, y=10)
+    enemy = _unit(team=2, num_models=1, x=30, y=40)
+    board.place_unit(friend)
+    board.place_unit(enemy)
+    board.update_objective_control()
+    assert [o.control_team for o in board.objectives] == [1, None]
+    assert not board.dirty_objectives
+
+    assert board.preview_objective_control([(enemy, enemy.models[0], 30, 30)]) == [1, 2]
+    assert board.objectives[1].control_team is None
+
+    enemy.move_range = 12
+    assert board.move_unit(enemy, 30, 30)
+    assert board.dirty_objectives == {1}
+    board.update_objective_control()
+    for obj in board.objectives:
+        assert obj.control_team == obj.get_control_team(board.units)
+
+
+def _board_state(board):
+    return (
+        [plane.copy() for plane in board.planes()],
+        [(u.x, u.y, [(m.x, m.y, m.current_health) for m in u.models]) for u in board.units],
+        [(o.control_team, dict(o.control_scores)) for o in board.objectives],
+    )
+
+
+def _assert_same_state(a, b):
+    planes_a, units_a, objectives_a = a
+    planes_b, units_b, objectives_b = b
+    assert all((pa == pb).all() for pa, pb in zip(planes_a, planes_b))
+    assert units_a == units_b
+    assert objectives_a == objectives_b
+
+
+def _skirmish():
+    board = Board()
+    board.place_objective(20, 20)
+    unit = _unit(num_models=3, x=10, y=10, base=1.0)
+    enemy = _unit(team=2, num_models=2, x=26, y=20, base=1.0)
+    enemy.models[0].max_health = enemy.models[0].current_health = 3
+    board.place_unit(unit)
+    board.place_unit(enemy)
+    board.update_objective_control()
+    return board, unit, enemy
+
+
+def test_snapshot_restore_round_trip():
+    board, unit, enemy = _skirmish()
+    before = _board_state(board)
+    snap = board.snapshot()
+
+    assert board.move_unit(unit, 14, 14)
+    enemy.apply_damage(1)
+    enemy.apply_damage(5)
+    board.update_objective_control()
+    assert len(enemy.models) == 1
+
+    board.restore(snap)
+    _assert_same_state(_board_state(board), before)
+    model, found, _ = board.model_index.nearest(26, 20)
+    assert found is enemy and model is enemy.models[0]
+
+
+def test_undo_reverts_moves_damage_and_removals():
+    board, unit, enemy = _skirmish()
+    before = _board_state(board)
+    marker = board.checkpoint()
+
+    assert board.move_unit(unit, 11, 10)  # overlaps its own old squares
+    assert board.move_model(unit, 1, unit.models[1].x, unit.models[1].y + 1)
+    enemy.apply_damage(1)
+    enemy.apply_damage(5)
+    board.update_objective_control()
+
+    board.undo(marker)
+    _assert_same_state(_board_state(board), before)
+    assert board.changed_tiles(board.version - 1)
+
+
+def test_engagement_matches_model_checks():
+    board = Board()
+    rng = random.Random(5)
+    units = []
+    for i in range(40):
+        unit = _unit(team=1 + i % 2, x=rng.randrange(2, 56), y=rng.randrange(2, 40),
+                     base=rng.choice([0.5, 1.0]))
+        if board.place_unit(unit):
+            units.append(unit)
+
+    expected = {(board.unit_id(a), board.unit_id(b))
+                for a in units for b in units
+                if a.team != b.team and board.unit_id(a) < board.unit_id(b)
+                and any(board.bases_touching(ma, mb) for ma in a.models for mb in b.models)}
+    assert expected
+    assert {(board.unit_id(a), board.unit_id(b)) for a, b in board.engaged_pairs()} == expected
+    for unit in units:
+        partners = {board.unit_id(u) for u in board.engaged_with(unit)}
+        assert partners == {b if a == board.unit_id(unit) else a
+                            for a, b in expected if board.unit_id(unit) in (a, b)}
+
+    in_combat = [u for u in units
+                 if any(is_in_combat(m.x, m.y, board, u.team) for m in u.models)]
+    assert board.units_in_combat(units) == in_combat
@@ -0,0 +1,48 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pytest
+
+from game_logic.damage_calc import attack_distribution, dice_pmf, unit_attack_distribution
+from game_logic.dice import DiceEngine
+from game_logic.factions.skaven import SkavenFactory
+from game_logic.factions.stormcast import StormcastFactory
+from game_logic.units import Unit
+
+
+def test_dice_pmf():
+    assert dice_pmf("D3").tolist() == pytest.approx([0, 1 / 3, 1 / 3, 1 / 3])
+    pmf = dice_pmf("2D6")
+    assert pmf.sum() == pytest.approx(1.0)
+    assert pmf[7] == pytest.approx(6 / 36)
+
+
+def test_single_attack_distribution_is_exact():
+    weapon = {"attacks": 1, "to_hit": 4, "to_wound": 4, "rend": 0, "damage": "D3"}
+    dist = attack_distribution(weapon, target_models=2, target_health=2)
+    p = 0.5 * 0.5 * 0.5
+    assert dist.wounds.tolist() == pytest.approx([1 - p, p])
+    assert dist.damage.tolist() == pytest.approx([1 - p, p / 3, p / 3, p / 3])
+    assert dist.slain.tolist() == pytest.approx([1 - p + p / 3, 2 * p / 3, 0])
+
+
+def test_distribution_matches_sampling():
+    weapons = SkavenFactory.unit_definitions["Clawlord"]["melee_weapons"]
+    dist = attack_distribution(weapons, num_models=1, target_models=5, target_health=2)
+    assert dist.damage.sum() == pytest.approx(1.0)
+    assert dist.slain.sum() == pytest.approx(1.0)
+
+    dice = DiceEngine(11)
+    totals = [sum(dice.roll_attacks(w).total_damage for w in weapons) for _ in range(4000)]
+    assert np.mean(totals) == pytest.approx(dist.expected_damage, rel=0.06)
+
+
+def test_unit_distribution_uses_current_health():
+    data = StormcastFactory.unit_definitions["Liberators"]
+    attacker = Unit("Liberators", "stormcast", team=1, unit_data=data)
+    target = Unit("Liberators", "stormcast", team=2, unit_data=data)
+    fresh = unit_attack_distribution(attacker, target)
+    target.models[0].take_damage(1)
+    hurt = unit_attack_distribution(attacker, target)
+    assert hurt.expected_slain > fresh.expected_slain
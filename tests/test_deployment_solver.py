@@ -0,0 +1,73 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_logic.board import Board
+from game_logic.deployment_solver import choose_unit_anchor, legal_unit_anchors
+from game_logic.rng import RandomStreams
+from game_logic.units import Unit
+from game_logic.utils import arrange_formation
+from game_phases.deployment import (
+    deploy_units, formation_offsets, get_deployment_zones, get_objectives_for_battlefield, is_valid_unit_placement,
+)
+
+
+def _unit(name, models, base=1.0, team=1):
+    data = {"base_width": base, "base_height": base}
+    return Unit(name, "stormcast", team=team, num_models=models, unit_data=data)
+
+
+def test_anchor_mask_matches_placement_checks():
+    board = Board()
+    board.rng = RandomStreams(3)
+    defender, attacker = get_deployment_zones(board, "straight")
+    board.place_terrain_piece(10, 5, [(dx, 0) for dx in range(8)])
+    blocker = _unit("Blocker", 1, base=2.0, team=2)
+    arrange_formation(blocker, [(0, 0)], 30, 10)
+    assert board.place_unit(blocker)
+
+    unit = _unit("Troops", 5, base=1.5)
+    offsets = formation_offsets("box", 5, defender.orientation, 1.5, 1.5)
+    legal = legal_unit_anchors(board, unit, offsets, defender)
+    for x, y in defender.tiles:
+        arrange_formation(unit, offsets, x, y)
+        valid, _ = is_valid_unit_placement(x, y, unit, board, defender.tiles, attacker.tiles)
+        assert legal[y, x] == valid, (x, y)
+
+    x, y = choose_unit_anchor(board, unit, offsets, defender, attacker)
+    assert legal[y, x]
+
+
+def test_ai_places_every_unit_that_fits():
+    board = Board()
+    board.rng = RandomStreams(1)
+    board.objectives = get_objectives_for_battlefield("aqshy")
+    defender, attacker = get_deployment_zones(board, "straight")
+    # leave the zone one strip of free rows deep
+    board.terrain_plane[:board.height // 2 - 4, :] = True
+    board.version += 1
+    units = [_unit(f"Unit {i}", 3, team=1) for i in range(4)]
+    messages = []
+    deploy_units(board, units, defender, attacker, "straight", "AI", None, messages.append)
+
+    assert [u.name for u in board.units] == [u.name for u in units]
+    assert not any("no legal position" in m for m in messages)
+
+    giant = _unit("Giant", 1, base=5.0, team=1)
+    deploy_units(board, [giant], defender, attacker, "straight", "AI", None, messages.append)
+    assert giant not in board.units
+    assert messages[-1] == "⚠ AI found no legal position for Giant."
+
+
+def test_ai_bends_formation_when_box_does_not_fit():
+    board = Board()
+    board.rng = RandomStreams(2)
+    defender, attacker = get_deployment_zones(board, "straight")
+    # only a two-row strip is left: the models have to stand side by side
+    board.terrain_plane[:board.height // 2 - 2, :] = True
+    board.terrain_plane[board.height // 2:, :] = True
+    board.version += 1
+    unit = _unit("Line", 4)
+    deploy_units(board, [unit], defender, attacker, "straight", "AI", None, lambda *a, **k: None)
+
+    assert unit in board.units
+    assert {m.y for m in unit.models} == {board.height // 2 - 2}
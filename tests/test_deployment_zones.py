@@ -33,3 +33,22 @@ def test_diagonal_zones_touch():
             a = attacker_zone(x, y)
             assert d != a
             assert d or a
+
+
+def test_zones_are_cached_masks():
+    board = Board()
+    defender, attacker = get_deployment_zones(board, "diagonal")
+    assert get_deployment_zones(Board(), "diagonal")[0] is defender
+    assert not defender.mask.flags.writeable
+
+    slope = (15 - 43) / (59 - 20)
+    intercept = (board.height / 2) - slope * (board.width / 2)
+    expected = [(x, y) for x in range(board.width) for y in range(board.height)
+                if y < slope * x + intercept]
+    assert list(defender.tiles) == expected
+    assert len(defender.tiles) + len(attacker.tiles) == board.width * board.height
+    assert not defender(-1, 0) and not attacker(board.width, 0)
+
+    top, bottom = get_deployment_zones(board, "straight")
+    assert (top.orientation, bottom.orientation) == (1, -1)
+    assert top.centroid == ((board.width - 1) / 2, (board.height // 2 - 1) / 2)
@@ -0,0 +1,41 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_logic.dice import DiceEngine, parse_dice
+from game_logic.factions.skaven import SkavenFactory
+from game_phases.combat_phase import resolve_melee_attacks
+from game_logic.units import Unit
+
+
+def test_parse_dice_expressions():
+    assert parse_dice(2) == (0, 0, 2)
+    assert parse_dice("D6") == (1, 6, 0)
+    assert parse_dice("2D6") == (2, 6, 0)
+    assert parse_dice("d3") == (1, 3, 0)
+    assert parse_dice("D3+1") == (1, 3, 1)
+
+
+def test_roll_attacks_is_seeded_and_consistent():
+    weapon = SkavenFactory.unit_definitions["Rat Ogors"]["melee_weapons"][0]
+    a = DiceEngine(5).roll_attacks(weapon, num_models=3, verbose=True)
+    b = DiceEngine(5).roll_attacks(weapon, num_models=3)
+    assert (a.hits, a.wounds, a.saves) == (b.hits, b.wounds, b.saves)
+    assert b.trace is None
+    assert a.attacks == 15
+    assert a.hits >= a.wounds >= a.saves
+    assert len(a.damage) == a.unsaved
+    assert a.total_damage == 2 * a.unsaved
+    assert sum("Hit roll" in line for line in a.trace) == a.attacks
+
+
+def test_resolve_melee_attacks_only_traces_when_verbose():
+    data = dict(SkavenFactory.unit_definitions["Clanrats"])
+    attacker = Unit("Clanrats", "skaven", team=1, num_models=10, x=3, y=3, unit_data=data)
+    target = Unit("Clanrats", "skaven", team=2, num_models=10, x=5, y=3, unit_data=data)
+
+    quiet, verbose = [], []
+    resolve_melee_attacks(attacker, [target], quiet.append, target=target, dice=DiceEngine(1))
+    resolve_melee_attacks(attacker, [target], verbose.append, target=target, dice=DiceEngine(1),
+                          verbose=True)
+    assert not any("Hit roll" in line for line in quiet)
+    assert any("Hit roll" in line for line in verbose)
@@ -0,0 +1,63 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from functools import partial
+
+import numpy as np
+
+from game_logic.env import Action, SpearheadEnv, VectorEnv
+
+
+def test_env_episode_rewards_track_vp_lead():
+    env = SpearheadEnv(factions=("skaven", "stormcast"), rounds=2)
+    space = env.action_space
+    obs, info = env.reset(seed=3)
+    state = env.engine.game_state
+    assert space == env.action_space
+    assert (space.num_units, space.num_targets) == (len(state.units["player"]), len(state.units["ai"]))
+    assert (space.width, space.height) == (state.width, state.height)
+    assert obs.shape == env.observation_shape
+    assert info["phase"] == "movement"
+
+    # the opponent may already have scored if it took the first turn
+    total = info["vp"]["player"] - info["vp"]["ai"]
+    done, steps = False, 0
+    while not done:
+        obs, reward, done, _, info = env.step(Action("pass"))
+        total += reward
+        steps += 1
+    assert steps == 2 * 4  # four phases in each of the agent's turns
+    assert total == info["vp"]["player"] - info["vp"]["ai"]
+
+
+def test_env_rejects_actions_for_other_phases():
+    env = SpearheadEnv(factions=("skaven", "stormcast"), rounds=1)
+    env.reset(seed=1)
+    _, _, _, _, info = env.step(Action("fight", unit=0, target=0))
+    assert not info["applied"]
+    unit = env.engine.game_state.units["player"][0]
+    _, _, _, _, info = env.step(Action("move", unit=0, x=unit.x, y=unit.y))
+    assert info["applied"]
+    _, _, _, _, info = env.step(Action("move", unit=0, x=unit.x, y=unit.y))
+    assert not info["applied"]  # each unit moves once per phase
+
+
+def test_vector_env_matches_across_processes():
+    make = partial(SpearheadEnv, factions=("skaven", "stormcast"), rounds=1)
+    local = VectorEnv([make, make])
+    remote = VectorEnv([make, make], workers=2)
+    try:
+        obs_a, _ = local.reset(seeds=[4, 5])
+        obs_b, _ = remote.reset(seeds=[4, 5])
+        assert obs_a.shape == (2,) + SpearheadEnv().observation_shape
+        assert np.array_equal(obs_a, obs_b)
+        for _ in range(4):
+            step_a = local.step([Action("pass")] * 2)
+            step_b = remote.step([Action("pass")] * 2)
+            assert np.array_equal(step_a[0], step_b[0])
+            assert np.array_equal(step_a[1], step_b[1])
+        assert step_a[2].all()
+        assert "final_observation" in step_a[4][0]
+    finally:
+        local.close()
+        remote.close()
@@ -0,0 +1,58 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+
+from game_logic.board import Board
+from game_logic.units import Model, Unit
+
+
+def _old_bases_touching(a, b):
+    for ax, ay in a.get_occupied_squares():
+        for bx, by in b.get_occupied_squares():
+            if max(abs(ax - bx), abs(ay - by)) == 1 and (ax != bx or ay != by):
+                return True
+    return False
+
+
+def test_free_anchor_masks_match_area_checks():
+    board = Board()
+    board.place_terrain_piece(20, 20, [(0, 0), (1, 0), (2, 0), (2, 1)])
+    board.place_objective(30, 10)
+    unit = Unit("Rats", "skaven", team=1, num_models=1, x=40, y=30,
+                unit_data={"num_models": 1, "base_width": 1.0, "base_height": 1.0})
+    board.place_unit(unit)
+
+    for w, h in [(1, 1), (2, 2), (3, 3), (4, 6)]:
+        mask = board.anchors.mask(w, h)
+        own = board.anchors.mask(w, h, ignore_unit=unit)
+        for y in range(board.height):
+            for x in range(board.width):
+                assert mask[y, x] == board.is_area_free(x, y, w, h)
+                assert own[y, x] == board.is_area_free(x, y, w, h, ignore_unit=unit)
+    assert board.anchors.mask(4, 6) is board.anchors.mask(4, 6)
+
+    board.place_terrain_piece(5, 5, [(0, 0)])
+    assert not board.anchors.fits(4, 4, 2, 2)
+
+
+def test_bases_touching_matches_square_comparison():
+    board = Board()
+    rng = random.Random(3)
+    sizes = [0.5, 1.0, 1.5, 2.0, 3.0]
+    for _ in range(2000):
+        a = Model(rng.randint(0, 12), rng.randint(0, 12),
+                  base_width=rng.choice(sizes), base_height=rng.choice(sizes))
+        b = Model(rng.randint(0, 12), rng.randint(0, 12),
+                  base_width=rng.choice(sizes), base_height=rng.choice(sizes))
+        assert board.bases_touching(a, b) == _old_bases_touching(a, b)
+
+
+def test_models_overlap():
+    board = Board()
+    unit = Unit("Rats", "skaven", team=1, num_models=2, x=10, y=10,
+                unit_data={"num_models": 2, "base_width": 0.5, "base_height": 0.5})
+    board.place_unit(unit)
+    assert not board.models_overlap()
+    unit.models[1].x, unit.models[1].y = unit.models[0].x, unit.models[0].y
+    assert board.models_overlap()
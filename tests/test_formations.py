@@ -0,0 +1,77 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import math
+
+from game_logic.board import Board
+from game_logic.formations import COHERENCY, fit_formation, formation_offsets
+from game_logic.units import Unit
+from game_logic.utils import arrange_formation
+from game_phases import deployment
+from game_phases.movement_phase import adjust_unit_formation
+
+
+def _unit(models, base=1.0, team=1):
+    data = {"base_width": base, "base_height": base}
+    return Unit("Troops", "stormcast", team=team, num_models=models, unit_data=data)
+
+
+def _gap(a, b):
+    """Distance between the nearest squares of the 2x2 bases anchored at
+    ``a`` and ``b``."""
+    gx = max(b[0] - (a[0] + 1), a[0] - (b[0] + 1), 0)
+    gy = max(b[1] - (a[1] + 1), a[1] - (b[1] + 1), 0)
+    return math.hypot(gx, gy)
+
+
+def test_templates_are_cached():
+    box = formation_offsets("box", 5, 1, 1.0, 1.0)
+    assert box == ((0, 0), (-2, -2), (0, -2), (2, -2), (-2, -4))
+    assert formation_offsets("rectangle", 5, 1, 1, 1) is box
+    assert deployment.formation_offsets is formation_offsets
+    assert len(formation_offsets("circle", 8, -1, 2.0, 2.0)) == 8
+
+
+def test_fit_formation_matches_template_on_open_ground():
+    board = Board()
+    unit = _unit(5)
+    layout = fit_formation(board, unit, 20, 20, "box", 1)
+    arrange_formation(unit, formation_offsets("box", 5, 1, 1.0, 1.0), 20, 20)
+    assert layout == [(m.x, m.y) for m in unit.models]
+
+
+def test_fit_formation_bends_around_obstacles():
+    board = Board()
+    unit = _unit(5)
+    # wall across the row the rest of the box would stand on
+    board.place_terrain_piece(14, 17, [(dx, 0) for dx in range(4)] + [(dx, 1) for dx in range(4, 12)])
+    layout = fit_formation(board, unit, 20, 20, "box", 1)
+
+    assert layout[0] == (20, 20)
+    assert layout != [(20, 20), (18, 18), (20, 18), (22, 18), (18, 16)]
+    taken = set()
+    for x, y in layout:
+        tiles = {(x + dx, y + dy) for dx in range(2) for dy in range(2)}
+        assert not tiles & taken
+        assert not any(board.terrain_plane[ty, tx] for tx, ty in tiles)
+        taken |= tiles
+    for i, anchor in enumerate(layout[1:], start=1):
+        assert min(_gap(anchor, other) for other in layout[:i]) <= COHERENCY
+
+    board.place_terrain_piece(21, 21, [(0, 0)])
+    assert fit_formation(board, unit, 20, 20, "box", 1) is None
+
+
+def test_adjust_formation_auto_refits_around_leader():
+    board = Board()
+    unit = _unit(3)
+    unit.models[1].x, unit.models[1].y = 30, 30
+    unit.models[2].x, unit.models[2].y = 26, 24
+    unit.x, unit.y = unit.models[0].x, unit.models[0].y
+    assert board.place_unit(unit)
+    answers = iter(["auto", "box"])
+    adjust_unit_formation(unit, board, lambda prompt: next(answers), lambda *a, **k: None)
+
+    layout = fit_formation(Board(), unit, *unit.models[0].get_central_square(), "box", -1)
+    assert [(m.x, m.y) for m in unit.models] == layout
+    assert (board.unit_plane == board.unit_id(unit)).sum() == 3 * 4
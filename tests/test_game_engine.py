@@ -25,17 +25,16 @@ def _collect_log():
 
 
 def setup_deployment(monkeypatch):
-    engine = GameEngine()
+    engine = GameEngine(seed=0)
     logs, log = _collect_log()
     get_input = _fake_input_generator(["first"])
 
     monkeypatch.setattr("game_logic.game_engine.choose_faction", lambda gi, lg: "stormcast")
-    monkeypatch.setattr("game_logic.game_engine.roll_off", lambda gi, lg: ("player", "ai"))
+    monkeypatch.setattr("game_logic.game_engine.roll_off", lambda gi, lg, rng: ("player", "ai"))
     monkeypatch.setattr("game_logic.game_engine.choose_battlefield", lambda gi, lg: "aqshy")
     monkeypatch.setattr("game_logic.game_engine.choose_deployment_map", lambda gi, lg: "straight")
     monkeypatch.setattr("game_logic.game_engine.deploy_terrain", lambda *a, **k: None)
     monkeypatch.setattr("game_logic.game_engine.deploy_units", _simple_deploy_units)
-    monkeypatch.setattr("game_logic.game_engine.random.choice", lambda seq: seq[0])
 
     run_deployment_phase(engine.game_state, engine.board, get_input, log)
     return engine, logs
@@ -68,3 +67,69 @@ def test_sample_turn_move(monkeypatch):
     delta = (1, 0)
     for (sx, sy), model in zip(start, unit.models):
         assert (model.x, model.y) == (sx + delta[0], sy + delta[1])
+
+
+def test_headless_simulation_is_reproducible():
+    from game_logic.simulation import simulate_game, simulate_many
+
+    first = simulate_game(7, ("skaven", "stormcast"), rounds=2)
+    second = simulate_game(7, ("skaven", "stormcast"), rounds=2)
+    assert first["vp"] == second["vp"]
+    assert first["winner"] == second["winner"]
+    assert "combat" in first["phase_times"]
+
+    unseeded = simulate_game(None, ("skaven", "stormcast"), rounds=1)
+    assert isinstance(unseeded["seed"], int)
+    assert simulate_game(unseeded["seed"], ("skaven", "stormcast"), rounds=1)["vp"] == unseeded["vp"]
+
+    summary = simulate_many(3, ("skaven", "stormcast"), rounds=1)
+    assert summary["games"] == 3
+    assert sum(summary["wins"].values()) == 3
+    assert sum(summary["vp_distribution"]["player"].values()) == 3
+
+
+def test_step_shoot_resolves_ranged_attacks():
+    from game_logic.units import Unit
+
+    gun = {"name": "Gun", "range": 20, "attacks": 2, "to_hit": 1, "to_wound": 1, "damage": 1}
+    engine = GameEngine(headless=True, seed=1)
+    shooter = Unit("Test", "stormcast", team=1, num_models=1, x=10, y=10,
+                   unit_data={"base_width": 0.5, "base_height": 0.5, "range": [gun]})
+    target = Unit("Test", "stormcast", team=2, num_models=1, x=20, y=10,
+                  unit_data={"base_width": 0.5, "base_height": 0.5, "health": 5})
+    assert engine.board.place_unit(shooter) and engine.board.place_unit(target)
+    engine.game_state.units = {"player": [shooter], "ai": [target]}
+    engine.begin_turn("player")
+    assert engine.step({"type": "pass"})
+
+    assert not engine.step({"type": "shoot", "unit": 0, "target": None})
+    assert not engine.step({"type": "shoot", "unit": None})
+    assert not engine.step({"type": "shoot", "unit": 0, "target": 1})
+    assert engine.step({"type": "shoot", "unit": 0, "target": 0})
+    assert target.models[0].current_health == 3
+    assert not engine.step({"type": "shoot", "unit": 0, "target": 0})
+
+
+def test_run_turn_scores_for_the_team_the_player_deployed_as(monkeypatch):
+    from game_logic.units import Unit
+
+    class Idle:
+        def movement_phase(self, *args):
+            pass
+
+        shooting_phase = charge_phase = movement_phase
+
+    engine = GameEngine(headless=True, seed=2, policies={"player": Idle(), "ai": Idle()})
+    engine.board.place_objective(30, 20)
+    player = Unit("Test", "stormcast", team=2, num_models=1, x=32, y=20,
+                  unit_data={"base_width": 1.0, "base_height": 1.0, "control_score": 1})
+    assert engine.board.place_unit(player)
+    engine.game_state.units = {"player": [player], "ai": []}
+    sides = []
+    monkeypatch.setattr("game_phases.combat_phase.combat_phase",
+                        lambda board, current_team, **kwargs: sides.append(current_team))
+
+    engine.run_turn("player", lambda prompt: "")
+    # VP go to the player's board team; combat still starts with the player side
+    assert engine.game_state.total_vp[2] > 0 and engine.game_state.total_vp[1] == 0
+    assert sides == [1]
@@ -0,0 +1,65 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from game_logic.board import Board
+from game_logic.game_state import GameState, CHANNEL_KEYS
+from game_logic.units import Unit
+
+
+def _unit(team=1, num_models=1, x=3, y=3, base=1.5):
+    return Unit("Test", "stormcast", team=team, num_models=num_models, x=x, y=y,
+                unit_data={"num_models": num_models, "move_range": 6, "control_score": 2,
+                           "base_width": base, "base_height": base})
+
+
+def _tensor_from_grid_dict(state):
+    grid = state.to_grid_dict()
+    tensor = np.zeros((len(CHANNEL_KEYS), state.height, state.width), dtype=np.float32)
+    for (x, y), cell in grid.items():
+        for c, key in enumerate(CHANNEL_KEYS):
+            tensor[c, y, x] = cell[key]
+    return tensor
+
+
+def _state():
+    board = Board()
+    board.place_objective(30, 20)
+    board.place_terrain_piece(20, 10, [(0, 0), (1, 0), (0, 1)])
+    return GameState(board), board
+
+
+def test_to_tensor_matches_grid_dict():
+    state, board = _state()
+    board.place_unit(_unit(num_models=3, x=5, y=5))
+    board.place_unit(_unit(team=2, num_models=2, x=40, y=30, base=1.0))
+    assert np.array_equal(state.to_tensor(), _tensor_from_grid_dict(state))
+
+
+def test_to_tensor_tracks_changes_incrementally():
+    state, board = _state()
+    unit = _unit(num_models=2, x=5, y=5)
+    enemy = _unit(team=2, num_models=1, x=26, y=20, base=1.0)
+    board.place_unit(unit)
+    board.place_unit(enemy)
+    first = state.to_tensor()
+
+    assert board.move_unit(unit, 9, 5)
+    board.remove_model(enemy, enemy.models[0])
+    board.objectives[0].control_team = 1
+    board.place_terrain_piece(50, 40, [(0, 0)])
+    tensor = state.to_tensor()
+
+    assert not np.array_equal(first, tensor)
+    assert np.array_equal(tensor, _tensor_from_grid_dict(state))
+
+
+def test_to_tensor_redraws_new_leader_after_leader_dies():
+    state, board = _state()
+    unit = _unit(num_models=3, x=5, y=5)
+    board.place_unit(unit)
+    state.to_tensor()
+
+    board.remove_model(unit, unit.models[0])
+    assert np.array_equal(state.to_tensor(), GameState(board).to_tensor())
@@ -0,0 +1,76 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_logic.board import Board
+from game_logic.game_engine import GameEngine
+from game_logic.gamelog import DEBUG, INFO, WARNING, GameLog, LogRecord, as_log
+from game_logic.units import Unit
+
+
+class _Loud:
+    """Field that records whether it was ever formatted."""
+
+    def __init__(self):
+        self.formatted = False
+
+    def __format__(self, spec):
+        self.formatted = True
+        return "loud"
+
+
+def test_records_are_formatted_only_for_text_sinks():
+    log = GameLog()
+    field = _Loud()
+    log.emit("test", "{value}", value=field)
+    assert not field.formatted
+
+    records, lines = [], []
+    log.subscribe(records.append, level=DEBUG, text=False)
+    log.emit("test", "{value}", DEBUG, value=field)
+    assert not field.formatted
+    assert isinstance(records[0], LogRecord) and records[0].kind == "test"
+
+    log.subscribe(lines.append, level=WARNING)
+    log.emit("test", "{value}", INFO, value=field)
+    log.emit("test", "{value}!", WARNING, value=field)
+    assert lines == ["loud!"]
+    assert [r.level for r in records] == [DEBUG, INFO, WARNING]
+
+
+def test_plain_callables_and_board_messages():
+    lines = []
+    log = as_log(lines.append)
+    log("Braces {stay} as typed")
+    assert lines == ["Braces {stay} as typed"]
+    assert as_log(log) is log
+
+    board = Board()
+    board.log = log
+    unit = Unit("Liberators", "stormcast", team=1, num_models=1, x=4, y=4,
+                unit_data={"num_models": 1, "move_range": 10, "base_width": 0.5, "base_height": 0.5})
+    board.place_unit(unit)
+    unit.apply_damage(1)
+    assert lines[1:] == [
+        "Liberators placed successfully.",
+        "Liberators: Model took 1 damage (HP: 0/1)",
+        "Liberators: A model has been slain!",
+        "Liberators: 0 model(s) remaining.",
+    ]
+
+
+def test_engine_messages_subscribe_to_the_log():
+    engine = GameEngine()
+    engine.log.emit("test", "Round {round}", round=1)
+    assert engine.game_state.messages == ["Round 1"]
+    assert not GameEngine(headless=True).log.enabled(INFO)
+
+
+def test_engine_log_argument_is_subscribed_only_for_the_call():
+    engine = GameEngine(headless=True)
+    first, second = [], []
+    sink = first.append
+    engine.roll_priority(lambda prompt: "first", log=sink)
+    seen = len(first)
+    engine.roll_priority(lambda prompt: "first", log=second.append)
+    assert seen and second and len(first) == seen
+    assert not engine.log.subscribed(sink) and not engine.log.enabled(INFO)
@@ -0,0 +1,67 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import itertools
+from types import SimpleNamespace
+
+from game_logic import mcts
+from game_logic.board import Board
+from game_logic.mcts import MCTSPlanner
+from game_logic.units import Unit
+
+
+def _unit(team, x, y, num_models=1):
+    return Unit("Test", "stormcast", team=team, num_models=num_models, x=x, y=y,
+                unit_data={"num_models": num_models, "move_range": 12, "control_score": 2,
+                           "base_width": 1.0, "base_height": 1.0,
+                           "melee_weapons": [{"name": "Blade", "attacks": 3, "to_hit": 3,
+                                              "to_wound": 3, "damage": 1}]})
+
+
+def _board():
+    board = Board()
+    board.place_objective(30, 20)
+    ai = _unit(2, 30, 38)
+    enemy = _unit(1, 5, 5)
+    board.place_unit(ai)
+    board.place_unit(enemy)
+    return board, ai, enemy
+
+
+def test_planner_moves_towards_objective():
+    board, ai, _ = _board()
+    planner = MCTSPlanner(time_budget=None, max_iterations=60, seed=0)
+    [(unit, dest)] = list(planner.plan_movement(board, [ai]))
+    assert unit is ai and dest is not None
+    assert board.move_unit(ai, *dest)
+    board.update_objective_control()
+    assert board.objectives[0].control_team == 2
+
+
+def test_planner_is_deterministic_and_leaves_board_untouched():
+    board, ai, _ = _board()
+    before = [p.copy() for p in board.planes()]
+    first = list(MCTSPlanner(time_budget=None, max_iterations=40, seed=3).plan_movement(board, [ai]))
+    second = list(MCTSPlanner(time_budget=None, max_iterations=40, seed=3).plan_movement(board, [ai]))
+    assert first == second
+    assert all((a == b).all() for a, b in zip(before, board.planes()))
+    assert (ai.x, ai.y) == (30, 38)
+
+
+def test_planner_respects_time_budget_and_charges(monkeypatch):
+    board = Board()
+    ai = _unit(2, 20, 20, num_models=2)
+    enemy = _unit(1, 26, 20)
+    board.place_unit(ai)
+    board.place_unit(enemy)
+    # a clock that advances one second per reading: the deadline is set at
+    # 1 + 5, so the checks at 2..5 pass and the one at 6 stops the search
+    clock = itertools.count(1)
+    monkeypatch.setattr(mcts, "time", SimpleNamespace(perf_counter=lambda: next(clock)))
+    planner = MCTSPlanner(time_budget=5)
+
+    moves = list(planner.plan_movement(board, [ai]))
+    assert planner.last_iterations == 4
+    [(unit, dest)] = list(planner.plan_charges(board, [ai]))
+    assert unit is ai and dest is not None
+    assert moves[0][1] is None or moves[0][1] != dest
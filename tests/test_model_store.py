@@ -0,0 +1,66 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import math
+import pickle
+
+from game_logic.board import Board
+from game_logic.model_store import ModelStore
+from game_logic.units import Model
+from game_phases.combat_phase import _distance_between_units
+from game_phases.deployment import load_faction_force
+
+
+def test_models_are_views_onto_the_army_store():
+    force = load_faction_force("stormcast", team_number=1)
+    store = force[0].store
+    assert all(unit.store is store for unit in force)
+    assert len(store) == sum(len(unit.models) for unit in force)
+
+    model = force[1].models[2]
+    model.x, model.y = 7, 9
+    assert (store.x[model.row], store.y[model.row]) == (7, 9)
+    assert type(model.x) is int and type(model.base_width) is float
+    assert not hasattr(model, "__dict__") and not hasattr(force[1], "__dict__")
+
+    model.take_damage(model.max_health)
+    assert not model.is_alive() and not store.alive[model.row]
+
+    lone = Model(3, 4, max_health=2)
+    assert len(lone.store) == 1 and lone.current_health == 2
+
+
+def test_store_grows_without_invalidating_views():
+    store = ModelStore(1)
+    models = [Model(i, 2 * i, store=store) for i in range(20)]
+    assert [(m.x, m.y) for m in models] == [(i, 2 * i) for i in range(20)]
+    models[0].take_damage(1)
+    assert store.alive[:3].tolist() == [False, True, True]
+
+
+def test_snapshot_restores_store_state():
+    board = Board()
+    unit = load_faction_force("skaven", team_number=1)[0]
+    unit.x, unit.y = 10, 10
+    for i, model in enumerate(unit.models):
+        model.x, model.y = 10 + 2 * (i % 5), 10 + 2 * (i // 5)
+    assert board.place_unit(unit)
+    snap = board.snapshot()
+    before = [(m.x, m.y, m.current_health) for m in unit.models]
+
+    board.move_unit(unit, unit.x + 2, unit.y + 2)
+    unit.apply_damage(unit.models[0].max_health)
+    board.restore(snap)
+    assert [(m.x, m.y, m.current_health) for m in unit.models] == before
+    assert unit.store.alive[[m.row for m in unit.models]].all()
+
+    copy = pickle.loads(pickle.dumps(board))
+    assert [(m.x, m.y) for m in copy.units[0].models] == [(m.x, m.y) for m in unit.models]
+
+
+def test_unit_distance_is_vectorized_brute_force():
+    a, b = load_faction_force("skaven", 1)[:2]
+    for i, model in enumerate(b.models):
+        model.x, model.y = 30 + i, 5 + 3 * i
+    brute = min(math.hypot(m.x - e.x, m.y - e.y) for m in a.models for e in b.models)
+    assert _distance_between_units(a, b) == brute
@@ -24,17 +24,16 @@ def _collect_log():
 
 
 def setup_deployment(monkeypatch):
-    engine = GameEngine()
+    engine = GameEngine(seed=0)
     logs, log = _collect_log()
     get_input = _fake_input_generator(["first"])
 
     monkeypatch.setattr("game_logic.game_engine.choose_faction", lambda gi, lg: "stormcast")
-    monkeypatch.setattr("game_logic.game_engine.roll_off", lambda gi, lg: ("player", "ai"))
+    monkeypatch.setattr("game_logic.game_engine.roll_off", lambda gi, lg, rng: ("player", "ai"))
     monkeypatch.setattr("game_logic.game_engine.choose_battlefield", lambda gi, lg: "aqshy")
     monkeypatch.setattr("game_logic.game_engine.choose_deployment_map", lambda gi, lg: "straight")
     monkeypatch.setattr("game_logic.game_engine.deploy_terrain", lambda *a, **k: None)
     monkeypatch.setattr("game_logic.game_engine.deploy_units", _simple_deploy_units)
-    monkeypatch.setattr("game_logic.game_engine.random.choice", lambda seq: seq[0])
 
     run_deployment_phase(engine.game_state, engine.board, get_input, log)
     return engine, logs
@@ -128,7 +127,7 @@ def test_charge_phase_calls_move_model(monkeypatch):
         return original_move_model(unit, idx, x, y, enforce_coherency)
 
     monkeypatch.setattr(board, "move_model", mock_move_model)
-    monkeypatch.setattr(charge_phase.random, "randint", lambda a, b: 6)
+    monkeypatch.setattr(board.rng.dice("charge"), "roll", lambda sides=6: 6)
 
     responses = iter(["1", "6 3"])
 
@@ -162,7 +161,7 @@ def test_charge_finishes_base_to_base(monkeypatch):
         m.y = 3
     board.place_unit(enemy_unit)
 
-    monkeypatch.setattr(charge_phase.random, "randint", lambda a, b: 6)
+    monkeypatch.setattr(board.rng.dice("charge"), "roll", lambda sides=6: 6)
 
     responses = iter(["1", "6 3"])
 
@@ -173,3 +172,80 @@ def test_charge_finishes_base_to_base(monkeypatch):
     assert board.units_base_to_base(player_unit, enemy_unit)
     assert not board.models_overlap()
 
+
+
+def test_pile_in_stops_short_of_enemy_bases():
+    from game_logic.board import Board
+    from game_logic.units import Unit
+
+    def _unit(team, x, y):
+        data = {"base_width": 0.5, "base_height": 0.5}
+        return Unit("Test", "stormcast", team=team, num_models=1, x=x, y=y, unit_data=data)
+
+    board = Board()
+    attacker, enemy = _unit(1, 10, 10), _unit(2, 14, 10)
+    assert board.place_unit(attacker) and board.place_unit(enemy)
+
+    combat_phase.pile_in(board, attacker, [enemy])
+    assert attacker.models[0].position() == (13, 10)
+    assert board.team_plane[10, 14] == 2
+
+    board.relocate_model(attacker, attacker.models[0], 5, 5)
+    assert not board.is_area_free(14, 10)
+
+
+def test_melee_attacks_default_to_the_board_attack_dice():
+    from game_logic.board import Board
+    from game_logic.rng import RandomStreams
+    from game_logic.units import Unit
+
+    def _melee(seed):
+        board = Board()
+        board.rng = RandomStreams(seed)
+        data = {"base_width": 0.5, "base_height": 0.5, "health": 3,
+                "melee_weapons": [{"name": "Blade", "attacks": 6, "to_hit": 3, "to_wound": 3, "damage": 1}]}
+        attacker = Unit("Test", "stormcast", team=1, num_models=1, x=10, y=10, unit_data=data)
+        enemy = Unit("Test", "stormcast", team=2, num_models=1, x=11, y=10, unit_data=data)
+        assert board.place_unit(attacker) and board.place_unit(enemy)
+        combat_phase.resolve_melee_attacks(attacker, [enemy], None, target=enemy)
+        return [m.current_health for m in enemy.models]
+
+    assert _melee(4) == _melee(4)
+    assert shooting_phase.roll_damage(2) == 2
+    assert 1 <= shooting_phase.roll_damage("D3") <= 3
+
+
+def test_pile_in_does_not_stack_models_of_one_unit():
+    from game_logic.board import Board
+    from game_logic.units import Unit
+
+    data = {"base_width": 0.5, "base_height": 0.5}
+    board = Board()
+    attacker = Unit("Test", "stormcast", team=1, num_models=2, x=10, y=10, unit_data=data)
+    attacker.models[1].x, attacker.models[1].y = 12, 10
+    enemy = Unit("Test", "stormcast", team=2, num_models=1, x=16, y=10, unit_data=data)
+    assert board.place_unit(attacker) and board.place_unit(enemy)
+
+    combat_phase.pile_in(board, attacker, [enemy])
+    assert [m.position() for m in attacker.models] == [(11, 10), (15, 10)]
+    assert not board.models_overlap()
+    assert (board.unit_plane == board.unit_id(attacker)).sum() == 2
+
+
+def test_ranged_attacks_deal_damage():
+    from game_logic.board import Board
+    from game_logic.units import Unit
+
+    gun = {"name": "Gun", "range": 20, "attacks": 3, "to_hit": 1, "to_wound": 1, "damage": 1}
+    pistol = dict(gun, name="Pistol", model_index=0)
+    board = Board()
+    shooter = Unit("Test", "stormcast", team=1, num_models=2, x=10, y=10,
+                   unit_data={"base_width": 0.5, "base_height": 0.5, "range": [gun, pistol]})
+    target = Unit("Test", "stormcast", team=2, num_models=1, x=20, y=10,
+                  unit_data={"base_width": 0.5, "base_height": 0.5, "health": 20})
+    assert board.place_unit(shooter) and board.place_unit(target)
+    assert shooting_phase.get_player_units_that_can_shoot([shooter], [target], board) == [shooter]
+
+    shooting_phase.resolve_ranged_attacks(shooter, target, board, None)
+    # both models fire the gun, only the leader carries the pistol
+    assert target.models[0].current_health == 20 - 2 * 3 - 3
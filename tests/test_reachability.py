@@ -0,0 +1,63 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import math
+
+from game_logic.board import Board
+from game_logic.units import Unit
+
+
+def _unit(team=1, num_models=1, x=10, y=10, base=0.5, move_range=8):
+    return Unit("Test", "stormcast", team=team, num_models=num_models, x=x, y=y,
+                unit_data={"num_models": num_models, "move_range": move_range,
+                           "base_width": base, "base_height": base})
+
+
+def test_open_board_reach_stays_within_range():
+    board = Board()
+    unit = _unit()
+    board.place_unit(unit)
+    reach = board.reachable_tiles(unit)
+
+    for x, y in reach.tiles():
+        assert math.hypot(x - 10, y - 10) <= 8 + 1e-9
+    for tile in [(18, 10), (10, 2), (15, 15), (16, 13)]:
+        assert tile in reach
+    assert (19, 10) not in reach
+    assert board.reachable_tiles(unit) is reach
+
+
+def test_reach_goes_around_walls():
+    board = Board()
+    board.place_terrain_piece(12, 9, [(0, dy) for dy in range(3)])
+    unit = _unit()
+    board.place_unit(unit)
+    reach = board.reachable_tiles(unit)
+
+    assert not board.is_path_clear(10, 10, 14, 10)
+    assert (14, 10) in reach
+    path = reach.path_to(14, 10)
+    assert path[0] == (10, 10) and path[-1] == (14, 10)
+    assert all(not board.terrain_plane[y, x] for x, y in path)
+    assert all(max(abs(x1 - x0), abs(y1 - y0)) <= 2 for (x0, y0), (x1, y1) in zip(path, path[1:]))
+
+    assert board.move_unit_within_reach(unit, 14, 10)
+    assert (unit.x, unit.y) == (14, 10)
+    assert board.reachable_tiles(unit).origin == (14, 10)
+
+
+def test_reach_respects_footprint_and_enemies():
+    board = Board()
+    unit = _unit(num_models=2, base=1.0)
+    board.place_unit(unit)
+    enemy = _unit(team=2, x=10, y=22)
+    board.place_unit(enemy)
+    board.place_terrain_piece(4, 10, [(0, 0)])
+    reach = board.reachable_tiles(unit)
+
+    assert (10, 16) in reach
+    assert (10, 17) not in reach  # within 3" of the enemy
+    offsets = [(m.x - unit.x, m.y - unit.y) for m in unit.models]
+    for x, y in reach.tiles():
+        for ox, oy in offsets:
+            assert not board.terrain_plane[y + oy:y + oy + 2, x + ox:x + ox + 2].any()
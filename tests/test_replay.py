@@ -0,0 +1,68 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from game_logic.mcts import MCTSPlanner
+from game_logic.replay import _deploy, _play, load_replay, resimulate, verify_replay
+from game_logic.simulation import AIPolicy, simulate_game
+
+
+def _positions(engine):
+    return [(m.x, m.y, m.current_health) for u in engine.board.units for m in u.models]
+
+
+def _record(path):
+    policies = {
+        f"{side}_policy": AIPolicy(MCTSPlanner(time_budget=None, max_iterations=8))
+        for side in ("player", "ai")
+    }
+    return simulate_game(5, ("stormcast", "skaven"), rounds=3, replay=str(path), **policies)
+
+
+def test_replay_reexecutes_the_recorded_game(tmp_path):
+    path = tmp_path / "game.rep"
+    result = _record(path)
+    assert path.stat().st_size < 4096
+
+    replay = load_replay(path)
+    assert replay.header["seed"] == 5
+    assert [(t.round, t.turn) for t in replay.turns] == [(r, t) for r in (1, 2, 3) for t in (1, 2)]
+    assert replay.result["vp"] == result["vp"]
+    assert verify_replay(replay) == []
+
+
+def test_seeking_matches_playing_from_the_start(tmp_path):
+    path = tmp_path / "game.rep"
+    _record(path)
+    replay = load_replay(path)
+
+    target = replay.find_turn(3, 1)
+    engine, _ = _deploy(replay, 0)
+    _play(engine, replay, 0, target, resumed=False)
+
+    seeked = resimulate(replay, 3, 1)
+    assert _positions(seeked) == _positions(engine)
+    assert seeked.game_state.total_vp == engine.game_state.total_vp
+
+
+def test_recording_leaves_policies_as_they_were(tmp_path):
+    player, ai = (AIPolicy(MCTSPlanner(time_budget=None, max_iterations=4)) for _ in range(2))
+    answer = player.get_input = lambda prompt: ""
+    simulate_game(2, ("stormcast", "skaven"), rounds=1, replay=str(tmp_path / "game.rep"),
+                  player_policy=player, ai_policy=ai)
+    assert player.get_input is answer
+    assert ai.get_input == AIPolicy.get_input.__get__(ai)
+
+
+def test_unreplayable_policies_are_rejected_before_writing(tmp_path):
+    path = tmp_path / "game.rep"
+    timed = AIPolicy(MCTSPlanner(time_budget=0.1))
+    with pytest.raises(ValueError, match="iteration-bounded"):
+        simulate_game(1, ("stormcast", "skaven"), rounds=1, replay=str(path), player_policy=timed)
+    shared = AIPolicy(MCTSPlanner(time_budget=None, max_iterations=4))
+    with pytest.raises(ValueError, match="its own policy"):
+        simulate_game(1, ("stormcast", "skaven"), rounds=1, replay=str(path),
+                      player_policy=shared, ai_policy=shared)
+    assert not path.exists()
+    assert "get_input" not in vars(shared)
@@ -0,0 +1,48 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pickle
+
+from game_logic.game_engine import GameEngine
+from game_logic.rng import DiceBuffer, RandomStreams
+from game_logic.simulation import run_headless_deployment, simulate_many
+
+
+def test_streams_depend_only_on_seed_and_name():
+    a, b = RandomStreams(7), RandomStreams(7)
+    a.stream("deployment")
+    assert a.stream("charge").integers(1000, size=5).tolist() == b.stream("charge").integers(1000, size=5).tolist()
+    assert RandomStreams((7, 1)).stream("charge").integers(1 << 30) != RandomStreams((7, 2)).stream("charge").integers(1 << 30)
+
+    copy = pickle.loads(pickle.dumps(a))
+    assert [copy.dice("movement").d6() for _ in range(20)] == [a.dice("movement").d6() for _ in range(20)]
+
+
+def test_dice_buffer_ranges():
+    dice = DiceBuffer(RandomStreams(3).stream("test"), block=16)
+    rolls = [dice.randint(2, 4) for _ in range(100)]
+    assert set(rolls) == {2, 3, 4}
+    assert {dice.choice("ab") for _ in range(50)} == {"a", "b"}
+    assert 2 <= dice.roll_2d6() <= 12
+    assert 0 <= dice.randint(0, 999) <= 999
+
+
+def test_games_replay_identically_across_processes():
+    serial = simulate_many(2, ("stormcast", "skaven"), rounds=1)
+    parallel = simulate_many(2, ("stormcast", "skaven"), rounds=1, workers=2)
+    assert ([(r["vp"], r["realm"], r["map_layout"]) for r in serial["results"]]
+            == [(r["vp"], r["realm"], r["map_layout"]) for r in parallel["results"]])
+
+
+def test_seeded_engines_without_policies_play_identically():
+    def _play():
+        engine = GameEngine(headless=True, seed=11)
+        run_headless_deployment(engine, ("stormcast", "skaven"))
+        engine.run_turn("ai", lambda prompt: "")
+        return engine, [(m.x, m.y) for u in engine.board.units for m in u.models]
+
+    (first, positions), (second, again) = _play(), _play()
+    assert positions == again
+    assert first.board.planner is not second.board.planner
+    assert first.board.planner.time_budget is None
+    assert GameEngine().board.planner.time_budget is not None
@@ -0,0 +1,78 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import math
+import random
+
+from game_logic.board import Board
+from game_logic.spatial_index import ModelIndex
+from game_logic.units import Unit, is_in_combat
+
+
+class _Stub:
+    def __init__(self, team, x, y):
+        self.team = team
+        self.x = x
+        self.y = y
+
+
+def _random_index(seed=3, count=80):
+    rng = random.Random(seed)
+    index = ModelIndex()
+    entries = []
+    for _ in range(count):
+        unit = _Stub(rng.choice([1, 2]), 0, 0)
+        model = _Stub(unit.team, rng.randrange(60), rng.randrange(44))
+        index.add(unit, model)
+        entries.append((model, unit))
+    return rng, index, entries
+
+
+def test_radius_queries_match_brute_force():
+    rng, index, entries = _random_index()
+    for _ in range(50):
+        x, y = rng.randrange(60), rng.randrange(44)
+        for radius in (3, 6, 12, 24, 30):
+            expected = {id(m) for m, u in entries
+                        if u.team != 1 and math.hypot(m.x - x, m.y - y) <= radius}
+            found = {id(m) for m, _, _ in index.within(x, y, radius, exclude_team=1)}
+            assert found == expected
+
+
+def test_enemy_pairs_match_brute_force():
+    _, index, entries = _random_index()
+    for radius in (3, 6, 12, 30):
+        expected = {frozenset((id(ua), id(ub)))
+                    for ma, ua in entries for mb, ub in entries
+                    if ua.team != ub.team and math.hypot(ma.x - mb.x, ma.y - mb.y) < radius}
+        pairs = index.enemy_pairs(radius, inclusive=False)
+        assert len(pairs) == len(expected)
+        assert {frozenset((id(a), id(b))) for a, b in pairs} == expected
+
+
+def test_nearest_and_k_nearest_match_brute_force():
+    rng, index, entries = _random_index()
+    for _ in range(50):
+        x, y = rng.randrange(60), rng.randrange(44)
+        dists = sorted(math.hypot(m.x - x, m.y - y) for m, u in entries if u.team == 2)
+        _, _, nearest = index.nearest_enemy(x, y, team=1)
+        assert nearest == dists[0]
+        assert [d for _, _, d in index.k_nearest(x, y, 5, team=2)] == dists[:5]
+
+
+def test_index_tracks_board_moves_and_deaths():
+    board = Board()
+    data = {"num_models": 1, "move_range": 6, "base_width": 0.5, "base_height": 0.5}
+    friend = Unit("A", "stormcast", team=1, num_models=1, x=3, y=3, unit_data=data)
+    enemy = Unit("B", "stormcast", team=2, num_models=1, x=12, y=3, unit_data=data)
+    board.place_unit(friend)
+    board.place_unit(enemy)
+    assert not is_in_combat(3, 3, board, 1)
+
+    assert board.move_unit(enemy, 8, 3)
+    assert is_in_combat(3, 3, board, 1)
+
+    enemy.apply_damage(1)
+    assert not enemy.models
+    assert not is_in_combat(3, 3, board, 1)
+    assert board.unit_plane[3, 8] == 0
@@ -0,0 +1,66 @@
+import os, sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import math
+
+import numpy as np
+
+from game_logic.board import Board
+from game_logic.distance_fields import squared_distance_field
+from game_logic.terrain import L_SHAPE_WALL, RECTANGLE_WALL, rotate_shape
+from game_phases.deployment import (
+    deploy_terrain, get_deployment_zones, is_valid_terrain_placement, legal_terrain_anchors,
+)
+
+
+def _old_is_valid_terrain_placement(x, y, rotated_shape, board, zone, enemy_zone):
+    zone_set = set(zone)
+    for dx, dy in rotated_shape:
+        px, py = x + dx, y + dy
+        if (px, py) not in zone_set:
+            return False
+        if any(math.hypot(px - ex, py - ey) < 6 for ex, ey in enemy_zone):
+            return False
+        if board.objective_plane[py, px]:
+            return False
+        if any(math.hypot(px - tx, py - ty) < 12 for tx, ty in board.terrain):
+            return False
+    return True
+
+
+def test_distance_field_is_exact():
+    rng = np.random.default_rng(5)
+    sources = rng.random((20, 30)) < 0.02
+    ys, xs = np.mgrid[0:20, 0:30]
+    points = np.argwhere(sources)
+    brute = ((ys[..., None] - points[:, 0]) ** 2 + (xs[..., None] - points[:, 1]) ** 2).min(axis=2)
+    assert (squared_distance_field(sources) == brute).all()
+
+
+def test_anchor_masks_match_pairwise_checks():
+    board = Board()
+    board.place_objective(10, 8)
+    defender, attacker = get_deployment_zones(board, "diagonal")
+    board.place_terrain_piece(30, 5, rotate_shape(RECTANGLE_WALL, "E"))
+    field = board.terrain_distance.terrain()
+    board.place_terrain_piece(5, 12, rotate_shape(RECTANGLE_WALL, "S"))
+    assert board.terrain_distance.terrain() is field  # extended in place
+    assert (field == squared_distance_field(board.terrain_plane)).all()
+
+    # only enemy tiles near the zone can be within 6 of a piece inside it
+    enemy_tiles = [(x, y) for x, y in attacker.tiles if defender.distance_sq[y, x] < 7 * 7]
+    for direction in ("N", "E", "SW"):
+        rotated = rotate_shape(L_SHAPE_WALL, direction)
+        anchors = legal_terrain_anchors(board, rotated, defender, attacker)
+        for x in range(0, board.width, 3):
+            for y in range(0, 20):
+                expected = _old_is_valid_terrain_placement(x, y, rotated, board, defender.tiles, enemy_tiles)
+                assert anchors[y, x] == expected
+                assert is_valid_terrain_placement(x, y, rotated, board, defender, attacker)[0] == expected
+
+
+def test_ai_terrain_deployment_places_both_pieces():
+    board = Board()
+    defender, attacker = get_deployment_zones(board, "straight")
+    deploy_terrain(board, 2, defender, attacker, None, lambda *_: None)
+    assert len(board.terrain) == len(RECTANGLE_WALL) + len(L_SHAPE_WALL)